@@ -0,0 +1,265 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module garde sur disque les analyses du solveur (solveur.py), pour que
+# le solveur et le simulateur n'analysent pas deux fois le même jeu. Une
+# analyse contient le verdict du solveur (gagnable, False ou None si la
+# limite de noeuds a été atteinte), la suite de coups gagnante et le nombre
+# de noeuds explorés.
+#
+# La clé d'une analyse est un hachage canonique du format du jeu (voir
+# choisirFormat), du jeu et du nombre de brassages restants: les analyses de
+# formats différents ne se confondent jamais. Les couleurs ne changent rien aux règles et les as ne
+# sont que des cases vides: avant de hacher le jeu, on renumérote donc les
+# couleurs dans l'ordre où elles apparaissent dans la grille et on remplace
+# tous les as par la même valeur. Deux jeux qui ne diffèrent que par les
+# couleurs ou par la place des as ont la même analyse: la suite de coups,
+# donnée en cases, gagne dans les deux jeux. Seul un verdict None (limite de
+# noeuds atteinte) dépend de l'ordre dans lequel le solveur essaie les coups,
+# qui lui dépend des couleurs.
+#
+# Le fichier commence par les 4 octets "ASA1", suivis des analyses, que l'on
+# ne fait qu'ajouter à la fin du fichier:
+#   clé (16 octets), verdict (1 octet: 0 pour False, 1 pour True, 2 pour
+#   None), noeuds (8 octets), longueur de la suite de coups (2 octets) et
+#   les coups (1 octet chacun).
+# Chaque analyse est ajoutée en une seule écriture (mode ajout), ce qui
+# permet à plusieurs processus de partager le même fichier: chacun garde un
+# index (clé -> position dans le fichier) qu'il complète en lisant les
+# analyses ajoutées par les autres, ainsi que les analyses récemment
+# utilisées en mémoire (les moins récentes sont oubliées).
+#
+# Utilisation: python analyses.py [fichier] [nombreDonnes] [limiteNoeuds]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import array
+import collections
+import hashlib
+import os
+import sys
+
+from main import brasserPartie, formatJeu, nouvellePartie
+from solveur import resoudre
+
+
+###############################################################################
+
+# Signature au début d'un fichier d'analyses, taille de la partie fixe d'une
+# analyse et codes des verdicts.
+entete = b"ASA1"
+tailleFixe = 16 + 1 + 8 + 2
+codesVerdicts = {False: 0, True: 1, None: 2}
+verdicts = [False, True, None]
+
+# Nombre d'analyses gardées en mémoire par défaut.
+capaciteMemoire = 100000
+
+
+###############################################################################
+
+# La fonction cleAnalyse renvoie la clé canonique (16 octets) d'un jeu et du
+# nombre de brassages restants, dans le format choisi. Les as valent tous 0
+# dans le jeu canonique (les autres cartes valent au moins le nombre de
+# couleurs), et chaque carte tient sur un octet, ou sur deux si le jeu a plus
+# de 255 cartes.
+def cleAnalyse(jeu, compteurBrasser):
+    nombreCouleurs, nombreValeurs = formatJeu()
+    nombreCartes = nombreCouleurs * nombreValeurs
+    couleurs = [-1] * nombreCouleurs
+    suivante = 0
+    if nombreCartes < 256:
+        canonique = bytearray(nombreCartes)
+    else:
+        canonique = array.array("H", bytes(2 * nombreCartes))
+    for i in range(nombreCartes):
+        carte = jeu[i]
+        if carte < nombreCouleurs:
+            continue
+        couleur = carte % nombreCouleurs
+        if couleurs[couleur] < 0:
+            couleurs[couleur] = suivante
+            suivante += 1
+        canonique[i] = carte - couleur + couleurs[couleur]
+    hachage = hashlib.blake2b(bytes([nombreCouleurs, nombreValeurs,
+                                     compteurBrasser]), digest_size=16)
+    hachage.update(canonique)
+    return hachage.digest()
+
+
+###############################################################################
+
+# La fonction ouvrirCache ouvre (ou crée) un fichier d'analyses et renvoie le
+# cache correspondant, dont l'index contient toutes les analyses du fichier.
+def ouvrirCache(chemin, capacite=capaciteMemoire):
+    descripteur = os.open(chemin, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+    if os.fstat(descripteur).st_size == 0:
+        os.write(descripteur, entete)
+    elif os.pread(descripteur, len(entete), 0) != entete:
+        os.close(descripteur)
+        raise ValueError(chemin + " n'est pas un fichier d'analyses")
+
+    cache = {"descripteur": descripteur, "index": {},
+             "memoire": collections.OrderedDict(), "capacite": capacite,
+             "lu": len(entete), "consultations": 0, "succesMemoire": 0,
+             "succesDisque": 0, "noeudsEconomises": 0}
+    rafraichirCache(cache)
+    return cache
+
+
+def fermerCache(cache):
+    os.close(cache["descripteur"])
+
+
+# La procédure rafraichirCache ajoute à l'index les analyses écrites à la fin
+# du fichier depuis la dernière lecture (par ce processus ou un autre). Une
+# analyse incomplète (en cours d'écriture) sera lue la prochaine fois.
+def rafraichirCache(cache):
+    descripteur = cache["descripteur"]
+    taille = os.fstat(descripteur).st_size
+    if taille <= cache["lu"]:
+        return
+    donnees = os.pread(descripteur, taille - cache["lu"], cache["lu"])
+    position = 0
+    while position + tailleFixe <= len(donnees):
+        longueur = int.from_bytes(donnees[position + 25:position + 27],
+                                  "little")
+        fin = position + tailleFixe + longueur
+        if fin > len(donnees):
+            break
+        cache["index"][donnees[position:position + 16]] = cache["lu"] + \
+        position
+        position = fin
+    cache["lu"] += position
+
+
+###############################################################################
+
+# La fonction lireAnalyse lit l'analyse qui commence à une position du
+# fichier et la renvoie sous forme de dictionnaire ("gagnable", "coups",
+# "noeuds").
+def lireAnalyse(cache, position):
+    descripteur = cache["descripteur"]
+    fixe = os.pread(descripteur, tailleFixe, position)
+    longueur = int.from_bytes(fixe[25:27], "little")
+    coups = list(os.pread(descripteur, longueur, position + tailleFixe))
+    gagnable = verdicts[fixe[16]]
+    return {"gagnable": gagnable, "coups": coups if gagnable else None,
+            "noeuds": int.from_bytes(fixe[17:25], "little")}
+
+
+# La procédure garderEnMemoire ajoute une analyse aux analyses récemment
+# utilisées et oublie la moins récente si la capacité est dépassée.
+def garderEnMemoire(cache, cle, analyse):
+    memoire = cache["memoire"]
+    memoire[cle] = analyse
+    memoire.move_to_end(cle)
+    if len(memoire) > cache["capacite"]:
+        memoire.popitem(last=False)
+
+
+# La fonction chercherAnalyse renvoie l'analyse d'un jeu avec un nombre de
+# brassages restants, ou None si elle n'est pas dans le cache. Une analyse
+# non concluante (limite de noeuds atteinte) n'est utile que si elle a
+# exploré au moins limiteNoeuds noeuds.
+def chercherAnalyse(cache, jeu, compteurBrasser, limiteNoeuds=None):
+    cache["consultations"] += 1
+    cle = cleAnalyse(jeu, compteurBrasser)
+
+    analyse = cache["memoire"].get(cle)
+    if analyse != None:
+        cache["memoire"].move_to_end(cle)
+        source = "succesMemoire"
+    else:
+        if cle not in cache["index"]:
+            rafraichirCache(cache)
+        if cle not in cache["index"]:
+            return None
+        analyse = lireAnalyse(cache, cache["index"][cle])
+        garderEnMemoire(cache, cle, analyse)
+        source = "succesDisque"
+
+    if analyse["gagnable"] == None and (limiteNoeuds == None or \
+    analyse["noeuds"] < limiteNoeuds):
+        return None
+    cache[source] += 1
+    cache["noeudsEconomises"] += analyse["noeuds"]
+    return analyse
+
+
+# La procédure enregistrerAnalyse ajoute le résultat du solveur (voir
+# resoudre) pour un jeu et un nombre de brassages restants au cache et à la
+# fin du fichier.
+def enregistrerAnalyse(cache, jeu, compteurBrasser, resultat):
+    cle = cleAnalyse(jeu, compteurBrasser)
+    coups = resultat["coups"] if resultat["gagnable"] else []
+    os.write(cache["descripteur"], cle +
+             bytes([codesVerdicts[resultat["gagnable"]]]) +
+             resultat["noeuds"].to_bytes(8, "little") +
+             len(coups).to_bytes(2, "little") + bytes(coups))
+    analyse = {"gagnable": resultat["gagnable"],
+               "coups": list(coups) if resultat["gagnable"] else None,
+               "noeuds": resultat["noeuds"]}
+    garderEnMemoire(cache, cle, analyse)
+    rafraichirCache(cache)
+
+
+###############################################################################
+
+# La fonction resoudreAvecCache renvoie l'analyse d'une partie: celle du
+# cache si elle y est, sinon celle du solveur, qui est ajoutée au cache. Le
+# résultat contient aussi "enCache" (True si l'analyse vient du cache).
+def resoudreAvecCache(cache, partie, limiteNoeuds=None, table=None):
+    analyse = chercherAnalyse(cache, partie["jeu"], partie["compteurBrasser"],
+                              limiteNoeuds)
+    if analyse != None:
+        resultat = dict(analyse)
+        resultat["enCache"] = True
+        return resultat
+
+    resultat = resoudre(partie, limiteNoeuds, table)
+    enregistrerAnalyse(cache, partie["jeu"], partie["compteurBrasser"],
+                       resultat)
+    resultat["enCache"] = False
+    return resultat
+
+
+# La fonction statistiquesCache renvoie le nombre de consultations, de succès
+# (en mémoire et sur disque) et de noeuds que le solveur n'a pas eu à
+# explorer grâce au cache, ainsi que le taux de succès.
+def statistiquesCache(cache):
+    succes = cache["succesMemoire"] + cache["succesDisque"]
+    return {"consultations": cache["consultations"],
+            "succesMemoire": cache["succesMemoire"],
+            "succesDisque": cache["succesDisque"],
+            "noeudsEconomises": cache["noeudsEconomises"],
+            "analyses": len(cache["index"]),
+            "tauxSucces": succes / cache["consultations"] \
+            if cache["consultations"] > 0 else 0.0}
+
+
+###############################################################################
+
+# La procédure principale analyse les donnes tirées de graines fixes (avant
+# et après un brassage) en passant par le cache, puis affiche les
+# statistiques du cache. Exécutée une deuxième fois avec le même fichier,
+# elle retrouve toutes les analyses sur le disque.
+def principal(chemin="analyses.asa", nombreDonnes=10, limiteNoeuds=100000):
+    cache = ouvrirCache(chemin)
+    for graine in range(nombreDonnes):
+        partie = nouvellePartie(graine)
+        for brassage in range(2):
+            resultat = resoudreAvecCache(cache, partie, limiteNoeuds)
+            print("donne %3d, %d brassages: gagnable=%-5s noeuds=%8d %s" % (
+                  graine, partie["compteurBrasser"], resultat["gagnable"],
+                  resultat["noeuds"], "(cache)" if resultat["enCache"] \
+                  else ""))
+            brasserPartie(partie)
+    print(statistiquesCache(cache))
+    fermerCache(cache)
+
+
+if __name__ == "__main__":
+    principal(*[int(x) if x.isdigit() else x for x in sys.argv[1:]])
@@ -0,0 +1,370 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme compare ponctuellement deux façons de faire les mêmes calculs
+# que main.py; contrairement à la suite de bancs (bancs.py), dont il reprend
+# les jeux et le chronométrage, ses résultats ne sont pas suivis d'une
+# version à l'autre. Il s'exécute avec un interpréteur Python standard (et
+# non dans codeBoot) et mesure la vitesse de génération des coups (la
+# fonction elemVert) avant et après l'ajout de l'index des positions des
+# cartes, ainsi que la vitesse du moteur NumPy par lots (lots.py) par
+# rapport aux fonctions de main.py, la représentation compacte des jeux
+# (plateau.py) par rapport aux tableaux, la croissance du coût d'un coup et
+# du solveur avec la taille du jeu (voir choisirFormat) et la construction du
+# texte HTML des images de la première grille.
+#
+# Utilisation: python banc_essai.py
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import sys
+import time
+
+from bancs import appelsParSeconde, bancElemVert, genererJeux
+from main import brasserPartie, calculerPrefixes, choisirFormat, \
+convertirHTML, copierPartie, couleurTab, creerPartie, elemVert, etatPartie, \
+fluxAleatoire, indexerPositions, jouerCoup, nouvellePartie, shuffleRangee, \
+tirerIndice, trouverIndex, valeurTab
+from plateau import casesMasque, cleJeu, coupsPlateau, creerPlateau, \
+jouerPlateau, masquesPlateau, prefixesPlateau
+from solveur import creerTable, resoudre
+
+
+###############################################################################
+
+# La fonction elemVertLineaire reprend l'ancienne version de elemVert, qui
+# cherche chaque carte dans le jeu avec trouverIndex. Elle sert de point de
+# comparaison pour mesurer le gain de l'index des positions.
+def elemVertLineaire(jeu):
+    aColorer = []
+    for x in range(4):
+        i = trouverIndex(jeu, x)
+        if i // 13 != (i - 1) // 13:
+            continue
+        gaucheVide = jeu[i - 1]
+        if gaucheVide // 4 == 0:
+            continue
+        carteVerte = gaucheVide + 4
+        aColorer.append(trouverIndex(jeu, carteVerte) if carteVerte < 52 \
+        else None)
+
+    for i in range(0, 40, 13):
+        if jeu[i] // 4 == 0:
+            for j in range(4, 8):
+                aColorer.append(trouverIndex(jeu, j))
+            break
+
+    return list(filter(lambda x: x != None, aColorer))
+
+
+# La fonction convertirCarteConcatenee reprend l'ancienne version de
+# convertirCarteHTML, qui construisait l'URL et le texte de l'image (une
+# image par carte) à chaque appel.
+def convertirCarteConcatenee(x):
+    valeur = valeurTab[x // 4]
+    couleur = couleurTab[x % 4]
+    if valeur == "absent":
+        source = "cards/absent.svg"
+    else:
+        source = "cards/" + valeur + couleur + ".svg"
+    return '<img src="' + source + '">'
+
+
+###############################################################################
+
+# La procédure bancGenerationCoups compare la vitesse de génération des coups
+# avec les trois façons de trouver les cartes: le parcours linéaire de
+# l'ancienne version, l'index construit à chaque appel et l'index maintenu
+# par le jeu (comme le font move, shuffle et init). La dernière est le banc
+# elemVert de la suite (bancs.py).
+def bancGenerationCoups(nombreJeux=20000, graine=2023):
+    f, indexes, operations = bancElemVert(nombreJeux, graine)
+    jeux = [jeu for jeu, positions in indexes]
+
+    # On vérifie d'abord que les trois versions donnent le même résultat.
+    for jeu, positions in indexes:
+        assert elemVertLineaire(jeu) == elemVert(jeu) == \
+        elemVert(jeu, positions)
+
+    avant = appelsParSeconde(elemVertLineaire, [(jeu,) for jeu in jeux])
+    sansIndex = appelsParSeconde(elemVert, [(jeu,) for jeu in jeux])
+    apres = appelsParSeconde(f, indexes)
+
+    print("Génération des coups (" + str(nombreJeux) + " jeux)")
+    print("  avant (trouverIndex)   : %10.0f appels/s" % avant)
+    print("  index recalculé        : %10.0f appels/s" % sansIndex)
+    print("  index maintenu (après) : %10.0f appels/s" % apres)
+    print("  accélération           : %10.1fx" % (apres / avant))
+
+
+###############################################################################
+
+# La fonction analyserJeu applique à un seul jeu les fonctions de main.py
+# que le moteur par lots calcule: les cartes vertes, les cartes à brasser et
+# la condition pour gagner.
+def analyserJeu(jeu):
+    enVert = elemVert(jeu)
+    cartesABrasser = []
+    for i in range(1, 5):
+        shuffleRangee(jeu, i, cartesABrasser)
+    return enVert, cartesABrasser, cartesABrasser == [12, 25, 38, 51]
+
+
+# La procédure bancLots compare le nombre de jeux analysés par seconde par
+# les fonctions de main.py (un jeu à la fois) et par le moteur NumPy (tous
+# les jeux d'un coup). NumPy n'est nécessaire que pour ce banc d'essai.
+def bancLots(nombreJeux=100000, graine=2023):
+    import numpy as np
+    from lots import cartesABrasserLot, coupsLegauxLot, creerLot, \
+    gagnesLot, longueursPrefixes
+
+    jeux = genererJeux(nombreJeux, graine)
+    lot = creerLot(jeux)
+
+    # On vérifie d'abord que les deux versions donnent le même résultat.
+    prefixes = longueursPrefixes(lot)
+    masques = coupsLegauxLot(lot)
+    aBrasser = cartesABrasserLot(lot, prefixes)
+    gagnes = gagnesLot(lot, prefixes)
+    for k in range(nombreJeux):
+        enVert, cartesABrasser, gagne = analyserJeu(jeux[k])
+        assert sorted(enVert) == list(np.flatnonzero(masques[k]))
+        assert cartesABrasser == list(np.flatnonzero(aBrasser[k]))
+        assert gagne == gagnes[k]
+
+    debut = time.perf_counter()
+    for jeu in jeux:
+        analyserJeu(jeu)
+    scalaire = nombreJeux / (time.perf_counter() - debut)
+
+    debut = time.perf_counter()
+    prefixes = longueursPrefixes(lot)
+    coupsLegauxLot(lot)
+    cartesABrasserLot(lot, prefixes)
+    gagnesLot(lot, prefixes)
+    vectoriel = nombreJeux / (time.perf_counter() - debut)
+
+    print("Analyse des jeux par lots (" + str(nombreJeux) + " jeux)")
+    print("  main.py (un jeu à la fois): %10.0f jeux/s" % scalaire)
+    print("  lots.py (NumPy)           : %10.0f jeux/s" % vectoriel)
+    print("  accélération              : %10.1fx" % (vectoriel / scalaire))
+
+
+###############################################################################
+
+# La procédure bancPlateau compare les jeux de main.py (un tableau de 52
+# cartes et l'index des positions) aux plateaux et à leurs masques: la
+# mémoire occupée par un jeu et par sa clé dans un ensemble de jeux déjà vus,
+# ainsi que la vitesse de copie, d'ajout dans un ensemble, de génération des
+# coups, d'un coup joué suivi de la génération des coups (comme dans le
+# solveur) et du calcul des cartes ordonnées. Les cartes ordonnées sont
+# mesurées sur des jeux mélangés, où peu de rangées commencent par un 2, et
+# sur des parties au hasard juste après leur dernier brassage, où les
+# rangées commencent déjà par plusieurs cartes ordonnées.
+def bancPlateau(nombreJeux=20000, graine=2023, nombreParties=200):
+    jeux = genererJeux(nombreJeux, graine)
+    indexes = [(jeu, indexerPositions(jeu)) for jeu in jeux]
+    plateaux = [creerPlateau(jeu) for jeu in jeux]
+    masques = [masquesPlateau(plateau) for plateau in plateaux]
+
+    avances = []
+    for k in range(nombreParties):
+        partie = jouerAuHasard(graine + k)[3]
+        if partie != None:
+            avances.append(partie["jeu"])
+    plateauxAvances = [creerPlateau(jeu) for jeu in avances]
+    avecMasquesAvances = [(plateau, masquesPlateau(plateau)) for plateau in
+                          plateauxAvances]
+
+    # On vérifie d'abord que les deux représentations donnent le même
+    # résultat.
+    for k in range(nombreJeux):
+        assert casesMasque(coupsPlateau(plateaux[k], masques[k])) == \
+        sorted(elemVert(*indexes[k]))
+        assert prefixesPlateau(plateaux[k], masques[k]) == \
+        calculerPrefixes(jeux[k])
+    for k in range(len(avances)):
+        assert prefixesPlateau(*avecMasquesAvances[k]) == \
+        calculerPrefixes(avances[k])
+
+    memoireJeu = sys.getsizeof(jeux[0]) + sys.getsizeof(indexes[0][1])
+    memoirePlateau = sys.getsizeof(plateaux[0])
+    memoireMasques = sys.getsizeof(masques[0]) + \
+    sum(sys.getsizeof(masque) for masque in masques[0])
+    memoireCleAvant = sys.getsizeof(tuple(jeux[0]))
+    memoireCleApres = sys.getsizeof(cleJeu(plateaux[0]))
+
+    def copierJeu(jeu, positions):
+        return list(jeu), list(positions)
+
+    def copierPlateau(plateau, masques):
+        return bytearray(plateau), list(masques)
+
+    def ajouterTuples():
+        vus = set()
+        for jeu in jeux:
+            vus.add(tuple(jeu))
+
+    def ajouterCles():
+        vus = set()
+        for plateau in plateaux:
+            vus.add(cleJeu(plateau))
+
+    # Un coup joué sur une copie, avec les coups de la position obtenue.
+    parties = [creerPartie(jeu) for jeu in jeux]
+    coups = [sorted(partie["enVert"])[:1] for partie in parties]
+
+    def jouerPartie(partie, coup):
+        copie = copierPartie(partie)
+        for i in coup:
+            jouerCoup(copie, i)
+        return copie["enVert"]
+
+    def jouerSurPlateau(plateau, masques, coup):
+        plateau = bytearray(plateau)
+        masques = list(masques)
+        for i in coup:
+            jouerPlateau(plateau, masques, i)
+        return coupsPlateau(plateau, masques)
+
+    parPlateau = [(plateau,) for plateau in plateaux]
+    avecMasques = list(zip(plateaux, masques))
+    print("Plateaux (" + str(nombreJeux) + " jeux, " + str(len(avances)) +
+          " parties avancées)")
+    print("                             tableaux      plateaux")
+    print("  mémoire d'un jeu      : %8d o    %8d o" % (memoireJeu,
+                                                         memoirePlateau))
+    print("  mémoire des masques   :               %8d o" % memoireMasques)
+    print("  mémoire d'une clé     : %8d o    %8d o" % (memoireCleAvant,
+                                                         memoireCleApres))
+    print("  copie                 : %10.0f/s  %10.0f/s" % (
+          appelsParSeconde(copierJeu, indexes),
+          appelsParSeconde(bytearray, parPlateau)))
+    print("  copie avec masques    :               %10.0f/s" %
+          appelsParSeconde(copierPlateau, avecMasques))
+    print("  ajout d'une clé       : %10.0f/s  %10.0f/s" % (
+          nombreJeux * appelsParSeconde(ajouterTuples, [()]),
+          nombreJeux * appelsParSeconde(ajouterCles, [()])))
+    print("  coups                 : %10.0f/s  %10.0f/s" % (
+          appelsParSeconde(elemVert, indexes),
+          appelsParSeconde(coupsPlateau, avecMasques)))
+    print("  copie, coup et coups  : %10.0f/s  %10.0f/s" % (
+          appelsParSeconde(jouerPartie, list(zip(parties, coups))),
+          appelsParSeconde(jouerSurPlateau, [(plateaux[k], masques[k],
+                                              coups[k])
+                                             for k in range(nombreJeux)])))
+    print("  ordonnées (mélangés)  : %10.0f/s  %10.0f/s" % (
+          appelsParSeconde(calculerPrefixes, [(jeu,) for jeu in jeux]),
+          appelsParSeconde(prefixesPlateau, avecMasques)))
+    print("  ordonnées (avancées)  : %10.0f/s  %10.0f/s" % (
+          appelsParSeconde(calculerPrefixes, [(jeu,) for jeu in avances]),
+          appelsParSeconde(prefixesPlateau, avecMasquesAvances)))
+
+
+###############################################################################
+
+# La fonction jouerAuHasard joue une partie au hasard (avec les brassages)
+# et renvoie la partie finie, le nombre de coups joués, leur durée totale et
+# une copie de la partie juste après son dernier brassage (ou None si la
+# partie s'est terminée avant).
+def jouerAuHasard(graine):
+    partie = nouvellePartie(graine)
+    flux = fluxAleatoire(~graine)
+    coups = 0
+    duree = 0.0
+    dernierBrassage = None
+    while etatPartie(partie) == "enCours" or etatPartie(partie) == "brasser":
+        if etatPartie(partie) == "brasser":
+            brasserPartie(partie)
+            if partie["compteurBrasser"] == 0:
+                dernierBrassage = copierPartie(partie)
+            continue
+        enVert = partie["enVert"]
+        i = enVert[tirerIndice(flux, len(enVert))]
+        debut = time.perf_counter()
+        jouerCoup(partie, i)
+        duree += time.perf_counter() - debut
+        coups += 1
+    return partie, coups, duree, dernierBrassage
+
+
+# La procédure bancFormats mesure, pour des jeux de plus en plus grands, le
+# coût d'un coup (jouerCoup, qui ne met à jour que ce qui a changé), celui de
+# la génération complète des coups (elemVert) et le travail du solveur. Le
+# solveur part des parties au hasard juste après leur dernier brassage (les
+# premières cartes sont déjà ordonnées), avec une limite de noeuds: une
+# partie est résolue si le solveur sait si elle est gagnable avant la limite.
+def bancFormats(formats=[(4, 13), (4, 26), (8, 13), (8, 26), (16, 26), \
+(16, 52)], nombreParties=20, nombreSolveur=5, limiteNoeuds=50000):
+    print("Taille du jeu (" + str(nombreParties) + " parties au hasard, " +
+          "solveur sur " + str(nombreSolveur) + " parties, " +
+          str(limiteNoeuds) + " noeuds au plus)")
+    print("  format   cartes  coup (µs)  elemVert (µs)  noeuds/s  "
+          "solveur (ms)  résolues")
+    for couleurs, valeurs in formats:
+        choisirFormat(couleurs, valeurs)
+
+        coups = 0
+        duree = 0.0
+        jeux = []
+        aResoudre = []
+        for graine in range(nombreParties):
+            partie, coupsPartie, dureePartie, dernierBrassage = \
+            jouerAuHasard(graine)
+            coups += coupsPartie
+            duree += dureePartie
+            jeux.append((partie["jeu"], partie["positions"]))
+            if dernierBrassage != None and len(aResoudre) < nombreSolveur:
+                aResoudre.append(dernierBrassage)
+
+        noeuds = 0
+        dureeSolveur = 0.0
+        resolues = 0
+        for partie in aResoudre:
+            resultat = resoudre(partie, limiteNoeuds, creerTable())
+            noeuds += resultat["noeuds"]
+            dureeSolveur += resultat["duree"]
+            resolues += resultat["gagnable"] != None
+
+        print("  %3dx%-3d %7d %10.2f %14.2f %9.0f %13.1f %6d/%d" % (
+              couleurs, valeurs, couleurs * valeurs,
+              1e6 * duree / max(coups, 1),
+              1e6 / appelsParSeconde(elemVert, jeux),
+              noeuds / max(dureeSolveur, 1e-9),
+              1000 * dureeSolveur / max(len(aResoudre), 1), resolues,
+              len(aResoudre)))
+    choisirFormat()
+
+
+###############################################################################
+
+# La procédure bancCartesHTML compare le nombre de premières grilles dont le
+# texte HTML des 52 images est construit par seconde, avant (concaténation à
+# chaque appel) et après la table imagesCartes. Ce n'est que la part du
+# programme dans l'affichage de la première grille, qui dépend surtout du
+# chargement des images (voir empaqueter.py et rapportDemarrage).
+def bancCartesHTML(nombreJeux=20000, graine=2023):
+    jeux = [(jeu,) for jeu in genererJeux(nombreJeux, graine)]
+
+    def convertirConcatenee(jeu):
+        return [convertirCarteConcatenee(x) for x in jeu]
+
+    avant = appelsParSeconde(convertirConcatenee, jeux)
+    apres = appelsParSeconde(convertirHTML, jeux)
+
+    print("Texte HTML de la première grille (" + str(nombreJeux) + " jeux)")
+    print("  avant (concaténation) : %10.0f grilles/s" % avant)
+    print("  après (table)         : %10.0f grilles/s" % apres)
+    print("  accélération          : %10.1fx" % (apres / avant))
+
+
+###############################################################################
+
+if __name__ == "__main__":
+    bancGenerationCoups()
+    bancLots()
+    bancPlateau()
+    bancFormats()
+    bancCartesHTML()
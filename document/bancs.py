@@ -0,0 +1,424 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme est la suite de bancs d'essai des fonctions de main.py, dont
+# les résultats sont suivis d'une version à l'autre pour détecter les
+# régressions (les comparaisons ponctuelles entre deux façons de faire sont
+# dans banc_essai.py, qui utilise les jeux et le chronométrage d'ici). Chaque
+# banc mesure, sur des données tirées de graines fixes, le nombre
+# d'opérations par seconde (médiane de plusieurs répétitions) et la mémoire
+# par opération, en octets, mesurée avec tracemalloc: le pic de mémoire
+# pendant l'opération et la mémoire encore occupée après (ce qui permet de
+# voir une fuite). Ce sont des octets et non un nombre d'allocations, que
+# tracemalloc ne compte pas.
+#
+# Les résultats sont écrits en JSON. Avec une référence (les résultats d'une
+# version précédente, enregistrés avec --enregistrer, qui garde la médiane de
+# plusieurs exécutions), chaque banc est comparé à la référence: si un banc
+# est plus lent ou occupe plus de mémoire que la tolérance le permet, il est
+# mesuré de nouveau pour écarter le bruit de la machine, et s'il l'est
+# toujours, le programme l'indique et se termine avec le code 1.
+#
+# La référence bancs.json de ce répertoire a été mesurée sur la machine
+# décrite dans le fichier (version de Python, processeur). Les vitesses
+# dépendent de la machine: avant de comparer une modification, régénérer la
+# référence sur sa propre machine à partir de la version d'avant, avec
+# python bancs.py --enregistrer.
+#
+# Utilisation: python bancs.py [--reference bancs.json] [--enregistrer]
+#                              [--json resultats.json] [--tolerance 0.30]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import main
+from main import cartesABrasserPartie, convertirHTML, copierPartie, \
+creerPartie, elemVert, fluxAleatoire, indexerPositions, jeuAleatoire, \
+jouerCoup, rangee, shuffleRangee, table, tirerIndice
+from simulateur import jouerPartie
+
+
+###############################################################################
+
+# Graine par défaut des données des bancs, nombre de répétitions de chaque
+# mesure (on garde la médiane), nombre de nouvelles mesures d'un banc qui
+# semble en régression, nombre d'exécutions des bancs dont la médiane devient
+# la référence et nombre d'appels observés avec tracemalloc, qui ralentit
+# beaucoup le programme.
+graineBancs = 2023
+repetitions = 7
+remesures = 2
+executionsReference = 3
+appelsMemoire = 200
+
+# Écart relatif permis par rapport à la référence, et mémoire (en octets par
+# opération) en dessous de laquelle un écart n'est pas une régression.
+toleranceDefaut = 0.30
+margeOctets = 64
+
+referenceDefaut = "bancs.json"
+
+
+###############################################################################
+
+# La fonction genererJeux renvoie un tableau de nombreJeux jeux de cartes
+# mélangés à partir d'une graine fixe, afin que les mesures soient
+# reproductibles.
+def genererJeux(nombreJeux, graine):
+    generateur = random.Random(graine)
+    jeux = []
+    for _ in range(nombreJeux):
+        jeu = list(range(52))
+        generateur.shuffle(jeu)
+        jeux.append(jeu)
+    return jeux
+
+
+###############################################################################
+
+# Chaque fonction suivante prépare un banc: elle renvoie la fonction mesurée,
+# la liste de ses arguments (un appel par élément) et le nombre d'opérations
+# que fait chaque appel.
+
+# Donne complète: mélange des 52 cartes, comme nouvellePartie.
+def bancDonne(nombre, graine):
+    flux = fluxAleatoire(graine)
+    return jeuAleatoire, [(None, 51, None, flux)] * nombre, 1
+
+
+# Brassage partiel: mélange des cases mal placées d'une partie (celles de
+# cartesABrasserPartie), en gardant les positions à jour, comme
+# brasserPartie.
+def bancBrassage(nombre, graine):
+    flux = fluxAleatoire(graine)
+    arguments = []
+    for jeu in genererJeux(nombre, graine):
+        partie = creerPartie(jeu)
+        cases = cartesABrasserPartie(partie)
+        arguments.append((cases, len(cases) - 1, jeu, flux,
+                          partie["positions"]))
+    return jeuAleatoire, arguments, 1
+
+
+# Génération des coups avec l'index des positions.
+def bancElemVert(nombre, graine):
+    return elemVert, [(jeu, indexerPositions(jeu)) for jeu in \
+    genererJeux(nombre, graine)], 1
+
+
+# Cartes à brasser des 4 rangées d'un jeu.
+def bancShuffleRangee(nombre, graine):
+    def cartesABrasser(jeu):
+        cartes = []
+        for i in range(1, 5):
+            shuffleRangee(jeu, i, cartes)
+        return cartes
+
+    return cartesABrasser, [(jeu,) for jeu in genererJeux(nombre, graine)], 1
+
+
+# Coups joués (ce que fait move sans la page): on rejoue sur une copie de la
+# partie de départ une suite de coups tirée au hasard. Une opération est un
+# coup; la copie de la partie est comptée dans le coût des coups.
+def bancCoups(nombre, graine, coupsParPartie=50):
+    flux = fluxAleatoire(graine)
+    arguments = []
+    operations = 0
+    for jeu in genererJeux(nombre // coupsParPartie, graine):
+        depart = creerPartie(jeu)
+        partie = copierPartie(depart)
+        coups = []
+        while len(coups) < coupsParPartie and len(partie["enVert"]) > 0:
+            i = partie["enVert"][tirerIndice(flux, len(partie["enVert"]))]
+            jouerCoup(partie, i)
+            coups.append(i)
+        arguments.append((depart, coups))
+        operations += len(coups)
+
+    def rejouerCoups(depart, coups):
+        partie = copierPartie(depart)
+        for i in coups:
+            jouerCoup(partie, i)
+
+    # Toutes les parties n'ont pas le même nombre de coups: on compte les
+    # coups par appel en moyenne.
+    return rejouerCoups, arguments, operations / len(arguments)
+
+
+# Texte HTML des images des 52 cartes d'un jeu.
+def bancConvertirHTML(nombre, graine):
+    return convertirHTML, [(jeu,) for jeu in genererJeux(nombre, graine)], 1
+
+
+# La procédure preparerPage donne à main.py le jeu et les cases vertes à
+# afficher, que rangee lit dans ses variables globales.
+def preparerPage(jeu):
+    main.jeuHTML = convertirHTML(jeu)
+    main.casesVertes = [False] * 52
+    for i in elemVert(jeu):
+        main.casesVertes[i] = True
+
+
+# Texte HTML d'une rangée de la grille.
+def bancRangee(nombre, graine):
+    preparerPage(genererJeux(1, graine)[0])
+    return rangee, [(k % 4,) for k in range(nombre)], 1
+
+
+# Texte HTML de la grille entière, à partir du jeu (comme construireGrille).
+def bancTable(nombre, graine):
+    def grille(jeu):
+        preparerPage(jeu)
+        return table([rangee(n) for n in range(4)])
+
+    return grille, [(jeu,) for jeu in genererJeux(nombre, graine)], 1
+
+
+# Parties entières jouées par le simulateur, au hasard ou avec le glouton.
+def bancPartiesAleatoires(nombre, graine):
+    return jouerPartie, [(graine, k, "aleatoire") for k in range(nombre)], 1
+
+
+def bancPartiesGloutonnes(nombre, graine):
+    return jouerPartie, [(graine, k, "glouton") for k in range(nombre)], 1
+
+
+# Liste des bancs: nom, fonction qui prépare le banc et nombre d'appels.
+bancs = [("jeuAleatoire.donne", bancDonne, 20000),
+         ("jeuAleatoire.brassage", bancBrassage, 20000),
+         ("elemVert", bancElemVert, 50000),
+         ("shuffleRangee", bancShuffleRangee, 20000),
+         ("coups", bancCoups, 100000),
+         ("convertirHTML", bancConvertirHTML, 20000),
+         ("rangee", bancRangee, 50000),
+         ("table", bancTable, 5000),
+         ("partie.aleatoire", bancPartiesAleatoires, 300),
+         ("partie.glouton", bancPartiesGloutonnes, 30)]
+
+
+###############################################################################
+
+# La fonction chronometrer appelle f sur chaque élément de arguments, autant
+# de fois qu'il y a de répétitions, et renvoie la durée médiane des
+# répétitions, moins sensible que la plus rapide ou la moyenne à une
+# répétition interrompue par un autre programme.
+def chronometrer(f, arguments):
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        for x in arguments:
+            f(*x)
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees)
+
+
+# La fonction appelsParSeconde renvoie le nombre d'appels de f par seconde
+# sur les éléments de arguments, mesuré par chronometrer.
+def appelsParSeconde(f, arguments):
+    return len(arguments) / chronometrer(f, arguments)
+
+
+# La fonction memoireAppels renvoie le pic de mémoire occupée pendant un appel
+# et la mémoire encore occupée après l'appel, en octets (tracemalloc ne
+# compte pas les allocations) et en moyenne sur les premiers appels.
+def memoireAppels(f, arguments):
+    echantillon = arguments[:appelsMemoire]
+    pic = 0
+    retenus = 0
+    tracemalloc.start()
+    try:
+        for x in echantillon:
+            tracemalloc.reset_peak()
+            avant = tracemalloc.get_traced_memory()[0]
+            f(*x)
+            apres, picAppel = tracemalloc.get_traced_memory()
+            pic += picAppel - avant
+            retenus += apres - avant
+    finally:
+        tracemalloc.stop()
+    return pic / len(echantillon), retenus / len(echantillon)
+
+
+# La fonction executerBanc prépare et mesure un banc, et renvoie ses
+# résultats: opérations par seconde, octets au pic et octets retenus par
+# opération.
+def executerBanc(preparer, nombre, graine):
+    f, arguments, operations = preparer(nombre, graine)
+    duree = chronometrer(f, arguments)
+    pic, retenus = memoireAppels(f, arguments)
+    return {"operations": round(len(arguments) * operations),
+            "operationsParSeconde": len(arguments) * operations / duree,
+            "octetsPicParOperation": pic / operations,
+            "octetsRetenusParOperation": retenus / operations}
+
+
+# La fonction executerBancs exécute les bancs dont le nom est dans noms (tous
+# si noms est None) et renvoie les résultats, avec la description de la
+# machine qui les a mesurés.
+def executerBancs(graine=graineBancs, noms=None):
+    resultats = {"graine": graine, "python": platform.python_version(),
+                 "implementation": platform.python_implementation(),
+                 "machine": platform.machine(), "bancs": {}}
+    for nom, preparer, nombre in bancs:
+        if noms == None or nom in noms:
+            resultats["bancs"][nom] = executerBanc(preparer, nombre, graine)
+    return resultats
+
+
+# La fonction resultatsReference exécute les bancs executionsReference fois
+# et renvoie, pour chaque banc, la médiane de chaque mesure: une exécution
+# plus rapide ou plus lente que les autres ne fixe pas la référence.
+def resultatsReference(graine=graineBancs, noms=None):
+    executions = [executerBancs(graine, noms)
+                  for _ in range(executionsReference)]
+    resultats = executions[0]
+    for nom, mesure in resultats["bancs"].items():
+        for cle in mesure:
+            mesure[cle] = statistics.median([execution["bancs"][nom][cle]
+                                             for execution in executions])
+    return resultats
+
+
+###############################################################################
+
+# La fonction comparer renvoie la liste des régressions des résultats par
+# rapport à la référence: les bancs plus lents que la référence, ou qui
+# occupent plus de mémoire, au-delà de la tolérance (un écart relatif).
+def comparer(resultats, reference, tolerance=toleranceDefaut):
+    regressions = []
+    for nom, mesure in resultats["bancs"].items():
+        if nom not in reference["bancs"]:
+            continue
+        avant = reference["bancs"][nom]
+
+        vitesse = mesure["operationsParSeconde"] / \
+        avant["operationsParSeconde"]
+        if vitesse < 1 - tolerance:
+            regressions.append("%s: %.0f op/s au lieu de %.0f (%.0f%% plus "
+                               "lent)" % (nom, mesure["operationsParSeconde"],
+                               avant["operationsParSeconde"],
+                               100 * (1 - vitesse)))
+
+        for cle, texte in [("octetsPicParOperation", "au pic"),
+                           ("octetsRetenusParOperation", "retenus")]:
+            if cle in avant and \
+               mesure[cle] > avant[cle] * (1 + tolerance) + margeOctets:
+                regressions.append("%s: %.0f octets %s par opération au "
+                                   "lieu de %.0f" % (nom, mesure[cle], texte,
+                                   avant[cle]))
+    return regressions
+
+
+# La fonction confirmerRegressions mesure de nouveau, jusqu'à remesures fois,
+# les bancs en régression par rapport à la référence et garde la meilleure
+# mesure de chacun, pour qu'un banc ne soit signalé que s'il est plus lent à
+# chaque mesure. Elle renvoie les régressions qui restent.
+def confirmerRegressions(resultats, reference, tolerance=toleranceDefaut):
+    regressions = comparer(resultats, reference, tolerance)
+    for _ in range(remesures):
+        noms = [nom for nom, _, _ in bancs
+                if any(r.startswith(nom + ":") for r in regressions)]
+        if len(noms) == 0:
+            break
+        nouveaux = executerBancs(resultats["graine"], noms)
+        for nom in noms:
+            mesure = resultats["bancs"][nom]
+            nouvelle = nouveaux["bancs"][nom]
+            for cle in mesure:
+                if cle == "operationsParSeconde":
+                    mesure[cle] = max(mesure[cle], nouvelle[cle])
+                elif cle != "operations":
+                    mesure[cle] = min(mesure[cle], nouvelle[cle])
+        regressions = comparer(resultats, reference, tolerance)
+    return regressions
+
+
+# La fonction formaterResultats renvoie le tableau des résultats, avec le
+# rapport à la référence s'il y en a une.
+def formaterResultats(resultats, reference=None):
+    lignes = ["%-24s %14s %10s %10s %9s" % ("banc", "op/s", "pic/op",
+                                            "retenus/op", "référence")]
+    for nom, mesure in resultats["bancs"].items():
+        rapport = ""
+        if reference != None and nom in reference["bancs"]:
+            rapport = "%8.2fx" % (mesure["operationsParSeconde"] /
+                                  reference["bancs"][nom] \
+                                  ["operationsParSeconde"])
+        lignes.append("%-24s %14.0f %10.0f %10.0f %9s" % (
+                      nom, mesure["operationsParSeconde"],
+                      mesure["octetsPicParOperation"],
+                      mesure["octetsRetenusParOperation"], rapport))
+    return "\n".join(lignes)
+
+
+###############################################################################
+
+def principal():
+    analyseur = argparse.ArgumentParser(description="Bancs d'essai des "
+                                        "fonctions d'Addiction Solitaire.")
+    analyseur.add_argument("--reference", default=referenceDefaut,
+                           help="résultats de référence (JSON)")
+    analyseur.add_argument("--enregistrer", action="store_true",
+                           help="remplacer la référence par les résultats")
+    analyseur.add_argument("--json", default=None,
+                           help="fichier où écrire les résultats")
+    analyseur.add_argument("--tolerance", type=float,
+                           default=toleranceDefaut)
+    analyseur.add_argument("--graine", type=int, default=graineBancs)
+    analyseur.add_argument("--bancs", nargs="*", default=None,
+                           choices=[nom for nom, _, _ in bancs])
+    arguments = analyseur.parse_args()
+
+    reference = None
+    if not arguments.enregistrer:
+        try:
+            with open(arguments.reference) as fichier:
+                reference = json.load(fichier)
+        except FileNotFoundError:
+            print("Pas de référence (" + arguments.reference + "): utiliser "
+                  "--enregistrer pour en créer une.", file=sys.stderr)
+
+    if arguments.enregistrer:
+        resultats = resultatsReference(arguments.graine, arguments.bancs)
+    else:
+        resultats = executerBancs(arguments.graine, arguments.bancs)
+    regressions = []
+    if reference != None:
+        for cle in ["graine", "python", "implementation", "machine"]:
+            if reference.get(cle) != resultats[cle]:
+                print("Attention: la référence a été mesurée avec " + cle +
+                      " = " + str(reference.get(cle)), file=sys.stderr)
+        regressions = confirmerRegressions(resultats, reference,
+                                           arguments.tolerance)
+    print(formaterResultats(resultats, reference))
+
+    if arguments.json != None:
+        with open(arguments.json, "w") as fichier:
+            json.dump(resultats, fichier, indent=2)
+    if arguments.enregistrer:
+        with open(arguments.reference, "w") as fichier:
+            json.dump(resultats, fichier, indent=2)
+        print("Référence enregistrée dans " + arguments.reference)
+
+    if reference != None:
+        if len(regressions) > 0:
+            print("RÉGRESSIONS (tolérance %.0f%%):" % (100 *
+                  arguments.tolerance), file=sys.stderr)
+            for regression in regressions:
+                print("  " + regression, file=sys.stderr)
+            sys.exit(1)
+        print("Aucune régression par rapport à " + arguments.reference)
+
+
+if __name__ == "__main__":
+    principal()
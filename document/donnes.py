@@ -0,0 +1,46 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module génère des donnes (des jeux de cartes mélangés) reproductibles
+# pour les programmes qui s'exécutent avec un interpréteur Python standard
+# (simulation, solveur, bancs d'essai). Les donnes sont produites une à la
+# fois par un générateur, ce qui permet d'en parcourir des millions sans les
+# garder en mémoire.
+
+
+###############################################################################
+
+# Importation des fonctions du moteur de jeu.
+from main import fluxAleatoire, formatJeu, jeuAleatoire
+
+
+###############################################################################
+
+# La fonction genererDonnes prend une graine et un nombre de donnes (None pour
+# un nombre illimité) et produit les donnes une à une. Toutes les donnes sont
+# tirées du même flux aléatoire, donc la même graine donne toujours la même
+# suite de donnes. Les donnes ont le nombre de cartes du format choisi au
+# premier tirage (voir choisirFormat).
+def genererDonnes(graine, nombre=None):
+    flux = fluxAleatoire(graine)
+    couleurs, valeurs = formatJeu()
+    derniere = couleurs * valeurs - 1
+    k = 0
+    while nombre == None or k < nombre:
+        yield jeuAleatoire(None, derniere, None, flux)
+        k += 1
+
+
+###############################################################################
+
+# La fonction genererBrassages prend un jeu de carte, les index des cases à
+# brasser et une graine, et produit les brassages partiels successifs de ces
+# cases (comme le fait shuffle), chacun à partir du jeu de départ. Le jeu
+# passé en paramètre n'est pas modifié.
+def genererBrassages(jeu, cartesABrasser, graine, nombre=None):
+    flux = fluxAleatoire(graine)
+    k = 0
+    while nombre == None or k < nombre:
+        yield jeuAleatoire(cartesABrasser, len(cartesABrasser) - 1, \
+        list(jeu), flux)
+        k += 1
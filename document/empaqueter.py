@@ -0,0 +1,182 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme regroupe les images des cartes (cards/*.svg) affichées par la
+# page Web dans une seule image, cards/sprite.svg, que la page charge en une
+# seule requête. On enlève des images les données propres à Inkscape qui ne
+# servent pas à l'affichage (métadonnées, réglages de l'éditeur, commentaires,
+# id qui ne sont pas référencés), on arrondit les coordonnées à 3 décimales et
+# on place chaque carte dans une grille. Pour chaque carte, l'image contient
+# une vue (<view>) dont le viewBox est la position de la carte dans la grille:
+# l'URL cards/sprite.svg#carte-6D affiche donc seulement le 6 de carreau.
+#
+# Il faut exécuter ce programme de nouveau quand on modifie une image.
+#
+# Utilisation: python empaqueter.py
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import gzip
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from main import couleurTab, valeurTab
+
+
+###############################################################################
+
+# Espaces de noms des fichiers SVG. Les éléments et les attributs des espaces
+# de noms d'Inkscape et des métadonnées ne sont pas conservés.
+svgNs = "http://www.w3.org/2000/svg"
+xlinkNs = "http://www.w3.org/1999/xlink"
+espacesRetires = ["http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+                  "http://www.inkscape.org/namespaces/inkscape",
+                  "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+                  "http://creativecommons.org/ns#",
+                  "http://purl.org/dc/elements/1.1/"]
+
+ET.register_namespace("", svgNs)
+ET.register_namespace("xlink", xlinkNs)
+
+# Dossier des images et nom de l'image qui les regroupe.
+dossierCartes = os.path.join(os.path.dirname(os.path.abspath(__file__)), \
+"cards")
+nomSprite = "sprite.svg"
+
+# Nombre de cartes par rangée de la grille.
+colonnesGrille = 14
+
+
+###############################################################################
+
+# La fonction espaceDeNom renvoie l'espace de noms d'une balise ou d'un
+# attribut ElementTree ("{espace}nom"), ou une chaîne vide.
+def espaceDeNom(nom):
+    if nom.startswith("{"):
+        return nom[1:nom.index("}")]
+    return ""
+
+
+# La fonction arrondir arrondit à 3 décimales tous les nombres d'un texte.
+def arrondir(texte):
+    return re.sub(r"-?\d+\.\d{4,}", lambda m: ("%.3f" % float(m.group()))
+                  .rstrip("0").rstrip("."), texte)
+
+
+###############################################################################
+
+# La procédure nettoyer enlève d'un élément (et de ses descendants) ce qui ne
+# sert pas à l'affichage. On ne garde que les id qui sont référencés dans
+# l'image; ils reçoivent le préfixe donné, ainsi que les références à ces id,
+# pour que les id de deux cartes ne se confondent pas.
+def nettoyer(element, prefixe, references):
+    for enfant in list(element):
+        if espaceDeNom(enfant.tag) in espacesRetires or \
+        enfant.tag == "{%s}metadata" % svgNs or \
+        (enfant.tag == "{%s}defs" % svgNs and len(enfant) == 0):
+            element.remove(enfant)
+        else:
+            nettoyer(enfant, prefixe, references)
+
+    for attribut in list(element.attrib):
+        valeur = element.attrib[attribut]
+        if espaceDeNom(attribut) in espacesRetires:
+            del element.attrib[attribut]
+        elif attribut == "id":
+            if valeur in references:
+                element.attrib[attribut] = prefixe + valeur
+            else:
+                del element.attrib[attribut]
+        elif attribut == "{%s}href" % xlinkNs and valeur.startswith("#"):
+            element.attrib[attribut] = "#" + prefixe + valeur[1:]
+        else:
+            element.attrib[attribut] = arrondir(valeur.replace("url(#", \
+            "url(#" + prefixe))
+
+    if element.text != None:
+        element.text = element.text.strip() or None
+    element.tail = None
+
+
+###############################################################################
+
+# La fonction nomsImages renvoie le nom des images affichées par la page Web
+# (voir sourceCarte): la case vide et les cartes de 2 à K de chaque couleur.
+def nomsImages():
+    noms = []
+    for valeur in valeurTab:
+        if valeur == "absent":
+            noms.append(valeur)
+        else:
+            for couleur in couleurTab:
+                noms.append(valeur + couleur)
+    return noms
+
+
+# La fonction empaqueter lit les images affichées par la page Web et renvoie
+# le texte de l'image qui les regroupe, ainsi que les noms des images dans
+# l'ordre où elles ont été placées.
+def empaqueter(dossier=dossierCartes):
+    noms = nomsImages()
+    fichiers = [os.path.join(dossier, nom + ".svg") for nom in noms]
+
+    lignes = (len(fichiers) + colonnesGrille - 1) // colonnesGrille
+    racine = ET.Element("{%s}svg" % svgNs, {
+        "width": str(224 * colonnesGrille), "height": str(312 * lignes),
+        "viewBox": "0 0 %d %d" % (224 * colonnesGrille, 312 * lignes)})
+
+    for k in range(len(fichiers)):
+        x = 224 * (k % colonnesGrille)
+        y = 312 * (k // colonnesGrille)
+        with open(fichiers[k], encoding="utf-8") as fichier:
+            contenu = fichier.read()
+        references = set(re.findall(r"url\(#([^)]+)\)", contenu) + \
+        re.findall(r'href="#([^"]+)"', contenu))
+        carte = ET.fromstring(contenu.encode("utf-8"))
+        nettoyer(carte, noms[k] + "-", references)
+
+        # Chaque carte devient une image imbriquée, placée dans sa case de la
+        # grille, avec le même viewBox que le fichier d'origine.
+        imbriquee = ET.SubElement(racine, "{%s}svg" % svgNs, {
+            "x": str(x), "y": str(y), "width": "224", "height": "312",
+            "viewBox": carte.get("viewBox")})
+        imbriquee.extend(list(carte))
+        ET.SubElement(racine, "{%s}view" % svgNs, {
+            "id": "carte-" + noms[k],
+            "viewBox": "%d %d 224 312" % (x, y)})
+
+    return ET.tostring(racine, encoding="unicode"), noms
+
+
+###############################################################################
+
+# La procédure principale écrit cards/sprite.svg et affiche le nombre de
+# requêtes et d'octets avant et après le regroupement.
+def principal():
+    texte, noms = empaqueter()
+    with open(os.path.join(dossierCartes, nomSprite), "w", \
+    encoding="utf-8") as fichier:
+        fichier.write(texte)
+
+    avant = 0
+    avantGzip = 0
+    for nom in noms:
+        with open(os.path.join(dossierCartes, nom + ".svg"), "rb") as f:
+            contenu = f.read()
+        avant += len(contenu)
+        avantGzip += len(gzip.compress(contenu))
+    apres = len(texte.encode("utf-8"))
+    apresGzip = len(gzip.compress(texte.encode("utf-8")))
+
+    print("%d images regroupées dans %s" % (len(noms), nomSprite))
+    print("  avant: %2d requêtes, %8d octets (%7d avec gzip)" %
+          (len(noms), avant, avantGzip))
+    print("  après: %2d requête,  %8d octets (%7d avec gzip)" %
+          (1, apres, apresGzip))
+
+
+if __name__ == "__main__":
+    principal()
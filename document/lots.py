@@ -0,0 +1,104 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module applique les règles du jeu à plusieurs jeux de cartes à la fois
+# avec NumPy. Un lot de K jeux est un tableau d'entiers de forme (K, 52) où
+# la ligne k contient le jeu k (même numérotation des cartes que main.py).
+# Chaque fonction donne le même résultat que la fonction correspondante de
+# main.py appliquée à chaque jeu, mais sans boucle Python sur les jeux ni sur
+# les cases. Ce module demande NumPy et n'est pas utilisé par la page Web.
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import numpy as np
+
+
+###############################################################################
+
+# Index des cases de la première colonne et de la case à gauche de chaque
+# case (la case de gauche des cases de la première colonne n'est pas
+# utilisée).
+premiereColonne = np.array([0, 13, 26, 39])
+caseGauche = np.arange(52) - 1
+
+
+###############################################################################
+
+# La fonction creerLot prend un tableau de jeux de cartes et renvoie le lot
+# correspondant.
+def creerLot(jeux):
+    return np.array(jeux, dtype=np.int16).reshape(-1, 52)
+
+
+# La fonction positionsLot renvoie la position de chaque carte de chaque jeu
+# du lot (voir indexerPositions).
+def positionsLot(jeux):
+    positions = np.empty_like(jeux)
+    lignes = np.arange(jeux.shape[0])[:, None]
+    positions[lignes, jeux] = np.arange(52, dtype=jeux.dtype)
+    return positions
+
+
+###############################################################################
+
+# La fonction coupsLegauxLot renvoie un tableau de booléens de forme (K, 52)
+# qui indique les cases des cartes que l'on peut déplacer dans chaque jeu
+# (voir elemVert). On peut lui passer les positions si elles sont connues.
+def coupsLegauxLot(jeux, positions=None):
+    if positions is None:
+        positions = positionsLot(jeux)
+    nombreJeux = jeux.shape[0]
+    lignes = np.arange(nombreJeux)[:, None]
+    masque = np.zeros((nombreJeux, 52), dtype=bool)
+
+    # Pour chaque case vide qui n'est pas dans la première colonne et dont la
+    # carte de gauche n'est ni un as ni un roi, la carte suivante de la même
+    # couleur peut être déplacée.
+    trous = positions[:, 0:4]
+    gauche = jeux[lignes, caseGauche[trous]]
+    valides = (trous % 13 != 0) & (gauche >= 4) & (gauche < 48)
+    cartesVertes = np.where(valides, gauche + 4, 0)
+    casesVertes = positions[lignes, cartesVertes]
+    masque[lignes, casesVertes] |= valides
+
+    # Les 2 peuvent être déplacés si une rangée commence par une case vide.
+    videPremiereColonne = (jeux[:, premiereColonne] < 4).any(axis=1)
+    masque[lignes, positions[:, 4:8]] |= videPremiereColonne[:, None]
+
+    return masque
+
+
+###############################################################################
+
+# La fonction longueursPrefixes renvoie un tableau de forme (K, 4) qui
+# contient le nombre de cartes bien ordonnées au début de chaque rangée de
+# chaque jeu, soit les cartes qui ne seraient pas brassées (voir
+# shuffleRangee). Une carte suit la précédente si elle est de la même couleur
+# et de la valeur suivante, soit si son numéro est celui de la précédente
+# plus 4.
+def longueursPrefixes(jeux):
+    rangees = jeux.reshape(-1, 4, 13)
+    ordonnees = np.empty(rangees.shape, dtype=bool)
+    ordonnees[:, :, 0] = rangees[:, :, 0] // 4 == 1
+    ordonnees[:, :, 1:] = rangees[:, :, 1:] == rangees[:, :, :-1] + 4
+    return np.logical_and.accumulate(ordonnees, axis=2).sum(axis=2)
+
+
+# La fonction cartesABrasserLot renvoie un tableau de booléens de forme
+# (K, 52) qui indique les cases à brasser de chaque jeu (voir shuffleRangee).
+def cartesABrasserLot(jeux, prefixes=None):
+    if prefixes is None:
+        prefixes = longueursPrefixes(jeux)
+    colonnes = np.arange(13)
+    return (colonnes[None, None, :] >= prefixes[:, :, None]).reshape(-1, 52)
+
+
+# La fonction gagnesLot renvoie un tableau de booléens qui indique les jeux
+# gagnants, soit ceux dont les 4 rangées sont ordonnées de 2 à K (voir
+# testerProgression).
+def gagnesLot(jeux, prefixes=None):
+    if prefixes is None:
+        prefixes = longueursPrefixes(jeux)
+    return (prefixes == 12).all(axis=1)
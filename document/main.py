@@ -18,6 +18,15 @@ import math
 import random
 
 
+# Heure (en millisecondes depuis le début du chargement de la page Web) à
+# laquelle codeBoot commence à exécuter le programme, soit une fois le
+# programme lu et compilé. Elle vaut None hors du navigateur.
+try:
+    debutScript = document.timeline.currentTime
+except NameError:
+    debutScript = None
+
+
 ###############################################################################
 
 # Définition du style de la page web. On définit les paramètres de style reliés
@@ -27,6 +36,13 @@ css = """
     #jeu table { float:none; }
     #jeu table td { border:0; padding:1px 2px; height:auto; width:auto; }
     #jeu table td img { height:140px; }
+    #jeu table td.vert { background-color:lime; cursor:pointer; }
+    #jeu table td.indice { outline:3px solid orange; }
+    #mesures { position:fixed; top:0; right:0; padding:4px;
+               background-color:white; border:1px solid gray;
+               font:12px monospace; }
+    #mesures:empty { display:none; }
+    #mesures td { padding:0 4px; text-align:right; }
     </style>"""
 
 # Définition de tableaux contenant les valeurs et les couleurs possibles pour
@@ -52,162 +68,320 @@ def trouverIndex(tab, element):
 
 ###############################################################################
 
-# La procédure modifierHTML prend un message en argument et modifie le contenu
-# du message1 (Message relié au brassage des cartes et autres évènements) qui
-# est affiché sur le site Web. Elle initialise également le reste de la page,
-# soit la grille de cartes et le message2 (Le bouton nouvelle partie).
-def modifierHTML(msg1):
-    # Définition du bouton Nouvelle partie.
-    msg2 = "<button onclick=init()>Nouvelle partie</button>"
+# La fonction indexerPositions prend en paramètre un jeu de carte et renvoie
+# la permutation inverse du jeu, soit un tableau qui associe à chaque carte
+# l'index de la case où elle se trouve. Ce tableau permet de trouver une carte
+# en temps constant plutôt qu'en parcourant tout le jeu avec trouverIndex. Il
+# doit être mis à jour chaque fois que des cartes sont déplacées.
+def indexerPositions(jeu):
+    positions = [0] * len(jeu)
+    for i in range(len(jeu)):
+        positions[jeu[i]] = i
+    return positions
 
-    # Modification du fichier HTML.
-    racine = document.querySelector("#cb-body")
-    racine.innerHTML = (css + divId("jeu", table(list(map\
-    (rangee, [0, 1, 2, 3])))) + "<br>" + msg1 + "<br>" + "<br>" + msg2)
+
+###############################################################################
+
+# Moteur de jeu.
+#
+# Les fonctions suivantes contiennent toutes les règles du jeu et ne font
+# jamais appel à l'objet document. Une partie est représentée par un
+# dictionnaire qui contient le jeu de carte ("jeu"), la position de chaque
+# carte ("positions", voir indexerPositions), les index des cartes que l'on
+# peut déplacer ("enVert"), le nombre de brassages restants
+# ("compteurBrasser") et la condition pour gagner ("gagnerCondition"). La page
+# Web ne fait qu'afficher cette partie, ce qui permet aussi de jouer des
+# milliers de parties sans navigateur (simulation, solveur, bancs d'essai).
 
 
 ###############################################################################
 
-# La procédure move prend en paramètre l'index correspondant au numéro d'une
-# case, et déplace la carte se trouvant à cette position à l'endroit approprié.
-# Elle modifie également le code HTML de la page Web afin d'afficher les
-# messages appropriés quand l'utilisateur gagne, perd ou il ne peut plus
-# brasser les cartes en faisant appel aux procédures testerProgression et
-# bonsMessages.
-def move(i):
-    # On fait appel aux variables globales qui seront utilisées par move.
-    global enVert
-    global compteurBrasser
-    global jeuHTML
-    global jeu
+# Format du jeu de cartes: le nombre de couleurs (une rangée par couleur) et
+# le nombre de valeurs de chaque couleur, de l'as au roi (une case par valeur
+# dans chaque rangée). La carte de valeur v et de couleur c porte le numéro
+# v * nombreCouleurs + c: les as (les cases vides) sont les cartes 0 à
+# nombreCouleurs - 1 et la carte qui suit une carte dans sa couleur porte le
+# numéro suivant plus nombreCouleurs. La page Web n'affiche que le jeu
+# standard de 4 couleurs de 13 valeurs; le moteur accepte aussi de plus
+# grands jeux (par exemple 8 couleurs de 26 valeurs) pour les bancs d'essai.
+nombreCouleurs = 4
+nombreValeurs = 13
+nombreCartes = 52
+
+# Longueur de la partie ordonnée de chaque rangée d'un jeu gagnant (voir
+# testerProgression).
+prefixesGagnants = [12, 12, 12, 12]
+
+
+# La procédure choisirFormat change le format du jeu de cartes des parties
+# créées par la suite. La fonction formatJeu renvoie le format actuel, soit
+# le nombre de couleurs et le nombre de valeurs.
+def choisirFormat(couleurs=4, valeurs=13):
+    global nombreCouleurs
+    global nombreValeurs
+    global nombreCartes
+    global prefixesGagnants
+
+    nombreCouleurs = couleurs
+    nombreValeurs = valeurs
+    nombreCartes = couleurs * valeurs
+    prefixesGagnants = [valeurs - 1] * couleurs
+
+
+def formatJeu():
+    return nombreCouleurs, nombreValeurs
+
+
+###############################################################################
+
+# La fonction creerPartie prend en paramètre un jeu de carte, le nombre de
+# brassages permis et le flux aléatoire utilisé pour les brassages (None pour
+# utiliser le module random), et renvoie la partie correspondante.
+def creerPartie(jeu, compteurBrasser=3, flux=None):
+    partie = {"jeu": jeu, "positions": indexerPositions(jeu),
+              "compteurBrasser": compteurBrasser, "gagnerCondition": False,
+              "flux": flux, "prefixes": calculerPrefixes(jeu)}
+    calculerVerts(partie)
+    testerProgression(partie)
+    return partie
+
+
+# La fonction nouvellePartie renvoie une partie avec un jeu de carte aléatoire
+# et 3 brassages permis. Si on lui donne une graine, la donne et tous les
+# brassages de la partie sont tirés du même flux et sont reproductibles.
+def nouvellePartie(graine=None):
+    flux = None
+    if graine != None:
+        flux = fluxAleatoire(graine)
+    return creerPartie(jeuAleatoire(None, nombreCartes - 1, None, flux), 3, \
+    flux)
+
+
+# La fonction copierPartie renvoie une copie indépendante d'une partie, que
+# l'on peut modifier (par exemple pour essayer un coup) sans toucher à
+# l'originale. Le flux aléatoire est partagé.
+def copierPartie(partie):
+    copie = dict(partie)
+    for cle in ["jeu", "positions", "enVert", "vertsTrous", "prefixes"]:
+        copie[cle] = list(partie[cle])
+    return copie
+
+
+###############################################################################
+
+# La procédure calculerVerts recalcule entièrement les cartes que l'on peut
+# déplacer dans une partie (voir elemVert). En plus de "enVert", la partie
+# garde la carte qui peut aller dans chaque case vide ("vertsTrous") et le
+# nombre de rangées qui commencent par une case vide ("trousColonne1"), ce
+# qui permet à jouerCoup de ne mettre à jour que ce qu'un coup a changé.
+def calculerVerts(partie):
+    if mesuresActives:
+        debut = horlogeMesures()
+
+    jeu = partie["jeu"]
+    positions = partie["positions"]
+    partie["vertsTrous"] = []
+    for x in range(nombreCouleurs):
+        partie["vertsTrous"].append(carteVerteTrou(jeu, positions, x))
+    partie["trousColonne1"] = 0
+    for i in range(0, nombreCartes, nombreValeurs):
+        if jeu[i] // nombreCouleurs == 0:
+            partie["trousColonne1"] += 1
+    partie["enVert"] = listerVerts(positions, partie["vertsTrous"], \
+    partie["trousColonne1"])
+
+    if mesuresActives:
+        noterMesure("calculerVerts", debut)
+
+
+###############################################################################
+
+# La fonction coupsLegaux prend une partie en paramètre et renvoie les index
+# des cartes que l'on peut déplacer. La fonction estCoupLegal indique si la
+# carte à l'index i peut être déplacée.
+def coupsLegaux(partie):
+    return partie["enVert"]
+
+
+def estCoupLegal(partie, i):
+    return i in partie["enVert"]
+
 
-    # On commence par enlever la couleur et l'attribut onclick de tous le jeu.
-    decolorier(enVert)
+###############################################################################
 
-    # Ensuite on trouve l'indice j de la case à laquelle on doit envoyer
-    # la carte qui a été choisie.
-    carte = jeu[i]  # Numéro de 0 à 51 correspondant à la carte à échanger.
-    if carte // 4 == 1:  # Cas lorsqu'on clique sur un 2.
+# La fonction destinationCoup prend en paramètre un jeu de carte, la position
+# de chaque carte et l'index i d'une carte que l'on peut déplacer. Elle
+# renvoie l'index j de la case vide où la carte doit être envoyée.
+def destinationCoup(jeu, positions, i):
+    couleurs = nombreCouleurs
+    carte = jeu[i]  # Numéro de la carte à échanger.
+    if carte // couleurs == 1:  # Cas lorsqu'on clique sur un 2.
         indexCol1 = []
-        for j in range(0, 40, 13):
+        for j in range(0, nombreCartes, nombreValeurs):
             # On ajoute les indices des cases vides dans la colonne 1.
             # On ajoute également l'indice de la case qui contient la carte
             # d'intéret, si elle se trouve sur la première colonne.
-            if jeu[j] // 4 == 0 or jeu[j] == carte:
+            if jeu[j] < couleurs or jeu[j] == carte:
                 indexCol1.append(j)
 
         # Si le 2 n'est pas déjà dans la colonne 1, on trouve l'index de la
         # première case vide dans la colonne 1.
-        if i not in list(range(0, 40, 13)):
-            j = indexCol1[0]
+        if i % nombreValeurs != 0:
+            return indexCol1[0]
         # Si le 2 est déjà dans la colonne 1, on trouve l'index de la première
         # case vide où il peut se déplacer.
         else:
             k = trouverIndex(indexCol1, i)
-            j = indexCol1[(k + 1) % len(indexCol1)]
+            return indexCol1[(k + 1) % len(indexCol1)]
 
     # On trouve l'index où il faut déplacer la carte si ce n'est pas un 2.
     else:
-        j = trouverIndex(jeu, carte - 4) + 1
+        return positions[carte - couleurs] + 1
 
-    # On doit échanger la carte à la position i avec celle à la position j. On
-    # modifie le code HTML du site Web afin que les cartes s'affichent au bon
-    # endroit.
-    carteVide = jeu[j]
 
-    nouv = document.querySelector("#case" + str(j))
-    nouv.innerHTML = convertirCarteHTML(carte)
+###############################################################################
+
+# La fonction jouerCoup prend en paramètre une partie et l'index i d'une carte
+# que l'on peut déplacer. Elle échange la carte avec la case vide où elle doit
+# aller, met à jour les cartes que l'on peut déplacer et la condition pour
+# gagner, puis renvoie l'index j de la case où la carte a été envoyée.
+def jouerCoup(partie, i):
+    if mesuresActives:
+        debut = horlogeMesures()
+
+    jeu = partie["jeu"]
+    positions = partie["positions"]
 
-    old = document.querySelector("#case" + str(i))
-    old.innerHTML = '<img src="cards/absent.svg">'
+    j = destinationCoup(jeu, positions, i)
 
-    # On échange les cartes dans le tableau correspondant au jeu.
+    # On échange les cartes dans le tableau correspondant au jeu et on met à
+    # jour la position des deux cartes échangées.
+    carte = jeu[i]
+    carteVide = jeu[j]
     jeu[j] = carte
     jeu[i] = carteVide
+    positions[carte] = j
+    positions[carteVide] = i
 
-    # On retrouve les cartes à mettre en vert et on redéfinit la variable
-    # jeuHTML avec la position des cartes à jour.
-    enVert = elemVert(jeu)
-    jeuHTML = convertirHTML(jeu)
-
-    # On teste si le joueur a gagné et on affiche le bon message pour le bouton
-    # Brasser les cartes.
-    testerProgression()
-    bonsMessages()
+    # On met à jour les cartes que l'on peut déplacer à partir des deux cases
+    # qui ont changé et on teste si le joueur a gagné.
+    partie["trousColonne1"] += majTrous(jeu, positions, partie["vertsTrous"], \
+    i, j)
+    partie["enVert"] = listerVerts(positions, partie["vertsTrous"], \
+    partie["trousColonne1"])
+    majPrefixes(jeu, partie["prefixes"], i, j)
+    testerProgression(partie)
 
-    # On colorie les cartes qui peuvent être déplacées.
-    colorier(enVert)
+    if mesuresActives:
+        noterMesure("jouerCoup", debut)
+    return j
 
 
 ###############################################################################
 
-# La procédure testerProgression vérifie si le joueur a gagné ou non. Elle ne 
-# prend pas de paramètres. On initialise une variable booléenne qui est associé 
-# à la condition pour gagner le jeu. Quand il n'y a plus de cartes que l'on 
-# peut bouger (len(enVert)=0), on test la condition en brassant les cartes qui 
-# ne sont pas en ordre. S'il y a seulement 4 cartes à brasser et que ces cartes
-# correspondent aux 4 as, cela veut dire que les cartes sont bien ordonnées
-# et que le joueur a gagné. Les 4 as sont toujours à la fin de chaque
-# rangée quand le jeu est bien ordonné, ce qui implique qu'ils doivent être
-# brassés selon notre définition de la procédure shuffleRangee.
-def testerProgression():
-    # Appel aux variables globales.
-    global gagnerCondition
-    global enVert 
+# La fonction brasserPartie prend une partie en paramètre et brasse les cartes
+# qui ne sont pas bien placées dans la grille. Elle décrémente le compteur de
+# brassage et renvoie les index des cases qui ont été brassées. Pour rejouer
+# une partie enregistrée, on peut lui donner le résultat du brassage, soit les
+# cartes à placer dans les cases brassées (dans l'ordre des cases).
+def brasserPartie(partie, cartes=None):
+    if mesuresActives:
+        debut = horlogeMesures()
+
+    # On identifie les index des cartes à brasser.
+    cartesABrasser = cartesABrasserPartie(partie)
+
+    # On brasse le jeu sur place et on met à jour la position des cartes, les
+    # cartes que l'on peut déplacer et la partie ordonnée de chaque rangée
+    # (elle ne peut que s'allonger, puisque son début n'a pas été brassé).
+    jeu = partie["jeu"]
+    if cartes == None:
+        jeuAleatoire(cartesABrasser, len(cartesABrasser) - 1, jeu, \
+        partie["flux"], partie["positions"])
+    else:
+        positions = partie["positions"]
+        for k in range(len(cartesABrasser)):
+            jeu[cartesABrasser[k]] = cartes[k]
+            positions[cartes[k]] = cartesABrasser[k]
+    calculerVerts(partie)
+    for r in range(nombreCouleurs):
+        partie["prefixes"][r] = longueurPrefixe(jeu, r * nombreValeurs, \
+        partie["prefixes"][r])
 
-    gagnerCondition = False
-    if len(enVert) == 0:
-        cartesABrasserPourGagner=[]
-        for i in range(1, 5):  # On itère sur chaque colonne.
-            shuffleRangee(jeu, i, cartesABrasserPourGagner)
+    # On met à jour la valeur du compteur pour brasser les cartes.
+    partie["compteurBrasser"] -= 1
 
-        if len(cartesABrasserPourGagner) == 4:
-            for _ in cartesABrasserPourGagner:
-                # Les valeurs 12,25,38,51 correspondent à la position des as
-                # quand l'utilisateur a gagné, soit chaque fin de ligne.
-                if _ in [12, 25, 38, 51]:
-                    gagnerCondition = True
+    testerProgression(partie)
 
-                else:
-                    gagnerCondition = False
-                    break
+    if mesuresActives:
+        noterMesure("brasserPartie", debut)
+    return cartesABrasser
 
 
 ###############################################################################
 
-# La procédure bonsMessages affiche les messages secondaires à l'endroit du 
-# bouton Brasser les cartes. Elle ne prend pas de paramètre. On affiche le 
-# message approprié quand l'utilisateur a perdu, soit quand la condition pour 
-# gagner n'est pas remplie, le joueur ne peut plus déplacer de cartes et il ne 
-# peut plus brasser les cartes.
-def bonsMessages():
-    # Appel aux variables globales.
-    global enVert
-    global compteurBrasser
-    global gagnerCondition
+# La fonction testerProgression vérifie si le joueur a gagné ou non. Elle prend
+# une partie en paramètre, met à jour sa condition pour gagner et la renvoie.
+# Le joueur a gagné quand les cartes de chaque rangée sont ordonnées du 2 au
+# roi, soit quand les seules cartes à brasser sont les as à la fin de chaque
+# rangée (voir shuffleRangee). Comme la partie garde la longueur de la partie
+# ordonnée de chaque rangée, le test se fait en temps constant.
+def testerProgression(partie):
+    if mesuresActives:
+        debut = horlogeMesures()
 
-    if len(enVert) == 0 and compteurBrasser == 0 and gagnerCondition == \
-    False:
-        msg1 = "Vous n'avez pas réussi à placer toutes les cartes... \
-        Essayez à nouveau!"
+    prefixes = partie["prefixes"]
+    gagnerCondition = prefixes == prefixesGagnants
 
-        modifierHTML(msg1)
+    partie["gagnerCondition"] = gagnerCondition
 
-    # On affiche le message approprié quand l'utilisateur n'a pas gagné, qu'il
-    # ne peut plus déplacer de cartes mais qu'il peut encore brasser les
-    # cartes.
-    elif len(enVert) == 0 and compteurBrasser != 0 and gagnerCondition == \
-    False:
-        msg1 = "Vous devez <button onclick=shuffle()>Brasser les cartes\
-        </button>"
+    if mesuresActives:
+        noterMesure("testerProgression", debut)
+    return gagnerCondition
 
-        modifierHTML(msg1)
 
-    # On affiche le message approprié quand l'utilisateur a gagné.
-    elif gagnerCondition == True:
-        msg1 = "Vous avez gagné! Bravo!"
+###############################################################################
+
+# La fonction etatPartie prend une partie en paramètre et renvoie son état:
+# "gagne" si le joueur a gagné, "enCours" s'il peut encore déplacer des
+# cartes, "brasser" s'il doit brasser les cartes pour continuer et "perdu"
+# s'il ne peut plus ni déplacer ni brasser les cartes.
+def etatPartie(partie):
+    if partie["gagnerCondition"]:
+        return "gagne"
+    elif len(partie["enVert"]) != 0:
+        return "enCours"
+    elif partie["compteurBrasser"] != 0:
+        return "brasser"
+    else:
+        return "perdu"
+
 
-        modifierHTML(msg1)
+###############################################################################
+
+# La fonction fluxAleatoire prend une graine (un entier) en paramètre et
+# renvoie un flux de nombres aléatoires reproductible, soit un tableau qui
+# contient l'état du générateur. La même graine donne toujours les mêmes
+# jeux de cartes, autant dans codeBoot qu'avec un interpréteur Python
+# standard. On mélange d'abord la graine (méthode SplitMix64) pour que des
+# graines voisines donnent des flux indépendants.
+def fluxAleatoire(graine):
+    z = (graine + 0x9E3779B97F4A7C15) % 18446744073709551616
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) % 18446744073709551616
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) % 18446744073709551616
+    return [z ^ (z >> 31)]
+
+
+# La fonction tirerIndice prend un flux (ou None pour utiliser le module
+# random) et un entier n, et renvoie un entier au hasard entre 0 et n - 1.
+# Le flux avance d'un pas de générateur congruentiel linéaire sur 64 bits et
+# on garde ses 31 bits les plus significatifs.
+def tirerIndice(flux, n):
+    if flux == None:
+        return math.floor(random.random() * n)
+    flux[0] = (flux[0] * 6364136223846793005 + 1442695040888963407) % \
+    18446744073709551616
+    return ((flux[0] >> 33) * n) >> 31
 
 
 ###############################################################################
@@ -218,41 +392,40 @@ def bonsMessages():
 # des cartes. Si le tableauIndice correspond à la valeur None, on veut mélanger 
 # un paquet de carte complet, ce qui correspond à ce qui se produit quand on 
 # crée une nouvelle partie. Elle retourne un jeu de carte aléatoire. On mélange 
-# le jeu de carte en utilisant la logique suivante:On choisit un élément au 
-# hasard, et on l'échange avec le dernier élément.On recommence avec l'avant 
-# dernier (sauf qu'on ne touche pas au dernier élément). On recommence avec 
-# l'avant avant dernier (sans toucher aux 2 derniers), et ainsi de suite.
-def jeuAleatoire(tableauIndice, valeurInitialeRange, jeuCartes):
-    if tableauIndice != None:
-        for i in range(valeurInitialeRange, -1, -1):
-            indice = math.floor(random.random() * i)
-            # Cas si on échange l'élément avec lui même.
-            if indice == i:
-                continue
-            # Sélectionner un élément au hasard et le retirer.
-            elemAleatoire = jeuCartes.pop(tableauIndice[indice])
-            # Retirer le 'dernier' élément.
-            elemFin = jeuCartes.pop(tableauIndice[i] - 1)
-            # Mettre le dernier élément à l'indice aléatoire.
-            jeuCartes.insert(tableauIndice[indice], elemFin)
-            # Mettre l'élement aléatoire à la fin.
-            jeuCartes.insert(tableauIndice[i], elemAleatoire)
-
-        return jeuCartes
-
-    else:
-        # On initialise la variable jeuMelange à un jeu de cartes en ordre.
-        jeuMelange = list(range(52))
-        for i in range(valeurInitialeRange, -1, -1):
-            indice = math.floor(random.random() * i)
-            if indice == i:
-                continue
-            elemAleatoire = jeuMelange.pop(indice)
-            elemFin = jeuMelange.pop(i - 1)
-            jeuMelange.insert(indice, elemFin)
-            jeuMelange.insert(i, elemAleatoire)
+# le jeu de carte en utilisant la logique suivante (Fisher-Yates): On choisit
+# un élément au hasard, en incluant le dernier, et on l'échange avec le
+# dernier élément. On recommence avec l'avant dernier (sauf qu'on ne touche pas
+# au dernier élément), et ainsi de suite. Les cartes sont échangées sur place,
+# donc les cartes qui ne sont pas dans tableauIndice ne bougent pas.
+#
+# Le paramètre optionnel flux (voir fluxAleatoire) rend le mélange
+# reproductible. Si on passe aussi la position de chaque carte (voir
+# indexerPositions), elle est mise à jour à chaque échange.
+def jeuAleatoire(tableauIndice, valeurInitialeRange, jeuCartes, flux=None, \
+positions=None):
+    if tableauIndice == None:
+        # On initialise le jeu à un jeu de cartes en ordre et on mélange
+        # toutes ses cases.
+        jeuCartes = list(range(nombreCartes))
+        tableauIndice = list(range(nombreCartes))
+
+    for i in range(valeurInitialeRange, 0, -1):
+        indice = tirerIndice(flux, i + 1)
+        # Cas si on échange l'élément avec lui même.
+        if indice == i:
+            continue
+        # On échange l'élément au hasard avec le 'dernier' élément.
+        caseHasard = tableauIndice[indice]
+        caseFin = tableauIndice[i]
+        elemAleatoire = jeuCartes[caseHasard]
+        elemFin = jeuCartes[caseFin]
+        jeuCartes[caseHasard] = elemFin
+        jeuCartes[caseFin] = elemAleatoire
+        if positions != None:
+            positions[elemFin] = caseHasard
+            positions[elemAleatoire] = caseFin
 
-        return jeuMelange
+    return jeuCartes
 
 
 ###############################################################################
@@ -263,12 +436,13 @@ def jeuAleatoire(tableauIndice, valeurInitialeRange, jeuCartes):
 def shuffleRangee(jeu, numRangee, cartesABrasserRangee):
 
     # On itère sur toutes les cartes dans la rangée correspondante.
-    for i in range(13 * (numRangee - 1), numRangee * 13):
+    finRangee = numRangee * nombreValeurs
+    for i in range(finRangee - nombreValeurs, finRangee):
 
         # Si la première carte de la rangée n'est pas un 2, on ajoute toutes 
         # les cartes de la rangée au tableau des cartes à brasser.
-        if i % 13 == 0 and jeu[i] // 4 != 1:
-            for _ in range(i, numRangee * 13):
+        if i % nombreValeurs == 0 and jeu[i] // nombreCouleurs != 1:
+            for _ in range(i, finRangee):
                 cartesABrasserRangee.append(_)
             break
 
@@ -277,9 +451,10 @@ def shuffleRangee(jeu, numRangee, cartesABrasserRangee):
         # qu'elle n'a pas une valeur correspondant à la valeur de (la carte à 
         # l'index i) -1, on ajoute toutes les cartes de la rangée à partir de 
         # l'index i au tableau des cartes à brasser.
-        elif (i % 13 != 0) and (jeu[i] % 4 != jeu[i - 1] % 4 or \
-        jeu[i] // 4 != (jeu[i - 1] // 4) + 1):
-            for _ in range(i, numRangee * 13):
+        elif (i % nombreValeurs != 0) and (jeu[i] % nombreCouleurs != \
+        jeu[i - 1] % nombreCouleurs or jeu[i] // nombreCouleurs != \
+        (jeu[i - 1] // nombreCouleurs) + 1):
+            for _ in range(i, finRangee):
                 cartesABrasserRangee.append(_)
             break
         # Si les conditions précédentes ne sont pas remplies, la carte ne doit 
@@ -290,37 +465,846 @@ def shuffleRangee(jeu, numRangee, cartesABrasserRangee):
 
 ###############################################################################
 
-# Procédure qui ne prend pas de paramètre et qui brasse les cartes qui ne sont
-# pas bien placées dans la grille. Cette procédure met à jour l'affichage des
-# cartes une fois qu'elles sont brassées.
-def shuffle():
-    # On fait appel aux variables globales qui seront utilisées par shuffle.
-    global jeu
-    global enVert
+# La fonction longueurPrefixe prend un jeu de carte, l'index de la première
+# case d'une rangée et une longueur déjà connue comme ordonnée. Elle renvoie
+# la longueur de la partie ordonnée de la rangée: une rangée ordonnée
+# commence par un 2 et chaque carte suivante est de la même couleur et de la
+# valeur suivante, soit le numéro de la carte précédente plus le nombre de
+# couleurs (4 dans le jeu standard). Les cartes qui suivent cette partie sont
+# celles que shuffleRangee ajoute au tableau des cartes à brasser.
+def longueurPrefixe(jeu, debut, longueur=0):
+    if longueur == 0:
+        if jeu[debut] // nombreCouleurs != 1:
+            return 0
+        longueur = 1
+    while longueur < nombreValeurs and jeu[debut + longueur] == \
+    jeu[debut + longueur - 1] + nombreCouleurs:
+        longueur += 1
+    return longueur
+
+
+# La fonction calculerPrefixes renvoie la longueur de la partie ordonnée de
+# chacune des rangées du jeu.
+def calculerPrefixes(jeu):
+    prefixes = []
+    for r in range(nombreCouleurs):
+        prefixes.append(longueurPrefixe(jeu, r * nombreValeurs))
+    return prefixes
+
+
+# La procédure majPrefixes met à jour la partie ordonnée des rangées après que
+# la carte de la case i a été échangée avec l'as de la case j. Si la carte
+# faisait partie de la partie ordonnée de sa rangée (seul un 2 de la première
+# colonne peut être déplacé ainsi), la rangée est coupée à la case i. Si la
+# carte est placée juste après la partie ordonnée de sa nouvelle rangée, on
+# allonge cette partie.
+def majPrefixes(jeu, prefixes, i, j):
+    valeurs = nombreValeurs
+    if i % valeurs < prefixes[i // valeurs]:
+        prefixes[i // valeurs] = i % valeurs
+    if j % valeurs == prefixes[j // valeurs]:
+        prefixes[j // valeurs] = longueurPrefixe(jeu, j - j % valeurs, \
+        j % valeurs)
+
+
+# La fonction cartesABrasserPartie renvoie les index des cartes à brasser
+# d'une partie, soit les cases qui suivent la partie ordonnée de chaque
+# rangée (le même tableau que shuffleRangee appelée sur toutes les rangées).
+def cartesABrasserPartie(partie):
+    cartesABrasser = []
+    for r in range(nombreCouleurs):
+        debut = r * nombreValeurs
+        cartesABrasser += list(range(debut + partie["prefixes"][r], \
+        debut + nombreValeurs))
+    return cartesABrasser
+
+
+###############################################################################
+
+# La fonction elemVert prend en paramètre un tableau qui correspond à un jeu de
+# carte et renvoies un tableau des index des éléments qui vont être affiché en 
+# vert, et donc qui peuvent être déplacés. On peut aussi lui passer la
+# position de chaque carte (voir indexerPositions) si elle est déjà connue,
+# ce qui évite de la recalculer. Elle recalcule tout à partir du jeu; après
+# un coup, la fonction majTrous permet de ne recalculer que ce qui a changé.
+def elemVert(jeu, positions=None):
+    if mesuresActives:
+        debut = horlogeMesures()
+
+    if positions == None:
+        positions = indexerPositions(jeu)
+
+    # Pour chaque case vide dans le jeu, on trouve la carte qui peut y aller.
+    vertsTrous = []
+    for x in range(nombreCouleurs):
+        vertsTrous.append(carteVerteTrou(jeu, positions, x))
+
+    # On compte les rangées qui commencent par un espace vide.
+    trousColonne1 = 0
+    for i in range(0, nombreCartes, nombreValeurs):
+        if jeu[i] // nombreCouleurs == 0:
+            trousColonne1 += 1
+
+    enVert = listerVerts(positions, vertsTrous, trousColonne1)
+
+    if mesuresActives:
+        noterMesure("elemVert", debut)
+    return enVert
+
+
+###############################################################################
+
+# La fonction carteVerteTrou prend en paramètre un jeu de carte, la position
+# de chaque carte et un as x (de 0 à nombreCouleurs - 1). Elle renvoie le
+# numéro de la carte qui peut aller dans la case vide de cet as, ou None si
+# aucune carte ne peut y aller.
+def carteVerteTrou(jeu, positions, x):
+    i = positions[x]
+
+    # Si l'indice d'avant est sur une autre rangée.
+    if i % nombreValeurs == 0:
+        return None
+
+    gaucheVide = jeu[i - 1]     # Numéro de la carte à gauche.
+
+    # Si c'est un trou à la gauche.
+    if gaucheVide // nombreCouleurs == 0:
+        return None
+
+    # Numéro de la carte qui peut aller dans le vide (aucune après un roi).
+    carteVerte = gaucheVide + nombreCouleurs
+    if carteVerte < nombreCartes:
+        return carteVerte
+    return None
+
+
+# La fonction listerVerts prend la position de chaque carte, la carte qui peut
+# aller dans chaque case vide (voir carteVerteTrou) et le nombre de rangées
+# qui commencent par une case vide. Elle renvoie les index des cartes vertes
+# dans le même ordre que elemVert: les cartes des cases vides, puis les 2 si
+# une rangée commence par une case vide.
+def listerVerts(positions, vertsTrous, trousColonne1):
+    aColorer = []
+    for carte in vertsTrous:
+        if carte != None:
+            aColorer.append(positions[carte])
+
+    if trousColonne1 > 0:
+        for j in range(nombreCouleurs, 2 * nombreCouleurs):
+            aColorer.append(positions[j])
+
+    return aColorer
+
+
+# La fonction majTrous met à jour vertsTrous après que la carte de la case i
+# a été échangée avec l'as de la case j. Seules les cases vides dont la carte
+# de gauche a changé sont touchées: l'as déplacé (maintenant en i) et les as
+# qui sont juste à droite de i ou de j. Elle renvoie la variation du nombre
+# de rangées qui commencent par une case vide. Pour annuler le coup, on
+# échange les deux cartes à nouveau et on appelle majTrous avec j et i.
+def majTrous(jeu, positions, vertsTrous, i, j):
+    couleurs = nombreCouleurs
+    valeurs = nombreValeurs
+    for case in [i, i + 1, j + 1]:
+        if case < nombreCartes:
+            x = jeu[case]
+            if x < couleurs:
+                # Même règle que carteVerteTrou, sans chercher la case de l'as.
+                gaucheVide = jeu[case - 1]
+                if case % valeurs == 0 or gaucheVide < couleurs or \
+                gaucheVide >= nombreCartes - couleurs:
+                    vertsTrous[x] = None
+                else:
+                    vertsTrous[x] = gaucheVide + couleurs
+
+    variation = 0
+    if i % valeurs == 0:
+        variation += 1
+    if j % valeurs == 0:
+        variation -= 1
+    return variation
+
+
+###############################################################################
+
+# Indices.
+#
+# Les fonctions suivantes cherchent le meilleur coup à jouer dans une partie,
+# sans brasser les cartes, en un temps limité (même dans codeBoot, qui est
+# lent). La recherche est itérative: on explore tous les coups jusqu'à une
+# profondeur de 1, puis de 2, et ainsi de suite, tant qu'il reste du temps.
+# Le coup renvoyé est le meilleur de la dernière profondeur terminée. Si tout
+# l'arbre des coups a été exploré, on sait aussi si la partie peut encore être
+# gagnée sans brasser.
+
+
+###############################################################################
+
+# Budget de temps (en millisecondes) d'une recherche d'indice, nombre maximal
+# de noeuds explorés par milliseconde de budget (au cas où l'horloge
+# n'avancerait pas pendant la recherche; c'est à peu près la vitesse d'un
+# interpréteur Python standard), nombre de noeuds explorés entre deux
+# lectures de l'horloge et note d'une partie gagnée.
+budgetIndice = 50
+noeudsParMilliseconde = 100
+noeudsParLecture = 8
+noteGagnee = 1000
+
+
+# La fonction evaluerPartie renvoie une note heuristique d'une partie: plus
+# elle est élevée, plus la partie est avancée. Chaque carte bien ordonnée
+# vaut 10 points. Une case vide qui suit la partie ordonnée de sa rangée
+# vaut 4 points, puisque la rangée pourra s'y allonger; une case vide qui
+# suit un roi en perd 2, puisqu'aucune carte ne peut y aller. Chaque carte
+# verte vaut 1 point.
+def evaluerPartie(partie):
+    if partie["gagnerCondition"]:
+        return noteGagnee
+    jeu = partie["jeu"]
+    prefixes = partie["prefixes"]
+    note = 10 * sum(prefixes) + len(partie["enVert"])
+    for x in range(nombreCouleurs):
+        i = partie["positions"][x]
+        colonne = i % nombreValeurs
+        if colonne == prefixes[i // nombreValeurs]:
+            note += 4
+        elif colonne != 0 and jeu[i - 1] // nombreCouleurs == \
+        nombreValeurs - 1:
+            note -= 2
+    return note
+
+
+# La fonction tempsEcoule compte un noeud de la recherche et renvoie True si
+# le budget de temps (ou de noeuds) de la recherche est épuisé.
+def tempsEcoule(recherche):
+    if recherche["fini"]:
+        return True
+    recherche["noeuds"] += 1
+    limiteNoeuds = recherche["limiteNoeuds"]
+    if limiteNoeuds != None and recherche["noeuds"] > limiteNoeuds:
+        recherche["fini"] = True
+    elif recherche["horloge"] != None and \
+    recherche["noeuds"] % noeudsParLecture == 0 and \
+    recherche["horloge"]() - recherche["debut"] >= recherche["budget"]:
+        recherche["fini"] = True
+    return recherche["fini"]
+
+
+# La fonction explorerIndice renvoie la meilleure note que l'on peut
+# atteindre à partir d'une partie en au plus profondeur coups. Les jeux déjà
+# vus (recherche["vus"]) à une profondeur au moins aussi grande ne sont pas
+# explorés de nouveau, ce qui évite aussi de tourner en rond. Si un jeu n'est
+# pas exploré faute de profondeur, recherche["coupe"] devient True.
+def explorerIndice(partie, profondeur, recherche):
+    meilleure = evaluerPartie(partie)
+    if meilleure == noteGagnee or len(partie["enVert"]) == 0:
+        return meilleure
+    if profondeur == 0:
+        recherche["coupe"] = True
+        return meilleure
+
+    vus = recherche["vus"]
+    for i in partie["enVert"]:
+        if tempsEcoule(recherche):
+            break
+        essai = copierPartie(partie)
+        jouerCoup(essai, i)
+        cle = tuple(essai["jeu"])
+        if cle in vus and vus[cle][0] >= profondeur - 1:
+            note = vus[cle][1]
+        else:
+            vus[cle] = [profondeur - 1, evaluerPartie(essai)]
+            note = explorerIndice(essai, profondeur - 1, recherche)
+            vus[cle][1] = note
+        if note > meilleure:
+            meilleure = note
+            if meilleure == noteGagnee:
+                break
+    return meilleure
+
+
+# La fonction chercherIndice cherche le meilleur coup d'une partie en au plus
+# budget millisecondes, mesurées avec la fonction horloge (l'horloge précise
+# du navigateur par défaut, voir horlogePrecise; sans horloge, seule la
+# limite de noeuds s'applique). Dans tous les cas, au plus limiteNoeuds
+# noeuds sont explorés, soit par défaut noeudsParMilliseconde par
+# milliseconde de budget.
+# Elle renvoie un dictionnaire qui contient:
+#   "coup": l'index de la carte à déplacer (comme pour move), ou None;
+#   "profondeur": la dernière profondeur explorée au complet;
+#   "noeuds": le nombre de jeux explorés;
+#   "gagnable": True si une suite de coups gagnante a été trouvée, False si
+#               tout l'arbre a été exploré sans en trouver, None sinon;
+#   "perdue": True si la partie ne peut plus être gagnée (aucune suite
+#             gagnante et plus de brassage).
+def chercherIndice(partie, budget=budgetIndice, horloge=None, \
+limiteNoeuds=None):
+    if horloge == None and dansNavigateur():
+        horloge = horlogePrecise
+    if limiteNoeuds == None:
+        limiteNoeuds = budget * noeudsParMilliseconde
+    recherche = {"noeuds": 0, "limiteNoeuds": limiteNoeuds,
+                 "horloge": horloge, "budget": budget, "fini": False,
+                 "debut": horloge() if horloge != None else 0}
+
+    enVert = partie["enVert"]
+    coup = None
+    profondeurAtteinte = 0
+    gagnable = None
+    if partie["gagnerCondition"]:
+        gagnable = True
+    elif len(enVert) == 0:
+        gagnable = False
+    else:
+        coup = enVert[0]
+
+    profondeur = 1
+    while gagnable == None:
+        recherche["vus"] = {tuple(partie["jeu"]): [profondeur, 0]}
+        recherche["coupe"] = False
+        note = explorerIndice(partie, profondeur, recherche)
+        if recherche["fini"]:
+            break
+
+        # La profondeur est terminée: on garde le coup qui mène à la
+        # meilleure note (la note de chaque coup est dans vus).
+        meilleure = -1
+        for i in enVert:
+            essai = copierPartie(partie)
+            jouerCoup(essai, i)
+            noteCoup = recherche["vus"].get(tuple(essai["jeu"]), [0, -1])[1]
+            if noteCoup > meilleure:
+                meilleure = noteCoup
+                coup = i
+        profondeurAtteinte = profondeur
+
+        if note == noteGagnee:
+            gagnable = True
+        elif not recherche["coupe"]:
+            gagnable = False
+        profondeur += 1
+
+    return {"coup": coup, "profondeur": profondeurAtteinte,
+            "noeuds": recherche["noeuds"], "gagnable": gagnable,
+            "perdue": gagnable == False and partie["compteurBrasser"] == 0}
+
+
+###############################################################################
+
+# Mesures.
+#
+# Les fonctions les plus utilisées par une action du joueur (les règles du
+# jeu, la construction du texte HTML, les écritures dans la page et les
+# actions move, shuffle, indice et init) peuvent compter leurs appels et
+# mesurer leur durée. Les mesures sont désactivées par défaut: chaque
+# fonction mesurée ne fait alors que tester la variable mesuresActives. Les
+# durées d'une fonction comprennent celles des fonctions mesurées qu'elle
+# appelle.
+
+
+###############################################################################
+
+# Si les mesures sont actives, et pour chaque fonction mesurée le nombre
+# d'appels, la durée totale et la durée du plus long appel (en
+# millisecondes). L'horloge est une fonction qui renvoie l'heure en
+# millisecondes.
+mesuresActives = False
+mesures = {"horloge": None, "fonctions": {}}
+
+
+# La procédure activerMesures active les mesures avec une horloge, soit par
+# défaut l'horloge précise de la page Web (voir horlogePrecise); hors du
+# navigateur, il faut lui donner une horloge. La procédure desactiverMesures
+# les désactive et la procédure reinitialiserMesures les remet à zéro, ainsi
+# que les compteurs de la page Web.
+def activerMesures(horloge=None):
+    global mesuresActives
+
+    if horloge == None:
+        horloge = horlogePrecise
+    mesures["horloge"] = horloge
+    mesuresActives = True
+
+
+def desactiverMesures():
+    global mesuresActives
+
+    mesuresActives = False
+
+
+def reinitialiserMesures():
+    mesures["fonctions"] = {}
+    for cle in compteursDOM:
+        compteursDOM[cle] = 0
+    afficherMesures()
+
+
+# La fonction horlogeMesures renvoie l'heure de l'horloge des mesures. La
+# procédure noterMesure compte un appel de la fonction nom, commencé à
+# l'heure debut.
+def horlogeMesures():
+    return mesures["horloge"]()
+
+
+def noterMesure(nom, debut):
+    duree = mesures["horloge"]() - debut
+    fonctions = mesures["fonctions"]
+    if nom in fonctions:
+        mesure = fonctions[nom]
+        mesure[0] += 1
+        mesure[1] += duree
+        if duree > mesure[2]:
+            mesure[2] = duree
+    else:
+        fonctions[nom] = [1, duree, duree]
+
+
+# La fonction rapportMesures renvoie les mesures sous forme de dictionnaire:
+#   "fonctions": pour chaque fonction mesurée, "appels", "ms" (durée
+#                totale) et "msMax" (durée du plus long appel);
+#   "dom": les écritures et les requêtes dans la page Web, au total et pour
+#          la dernière action (voir compteursDOM).
+# La fonction mesuresEnJSON renvoie le même rapport en texte JSON.
+def rapportMesures():
+    fonctions = {}
+    for nom in mesures["fonctions"]:
+        mesure = mesures["fonctions"][nom]
+        fonctions[nom] = {"appels": mesure[0], "ms": mesure[1],
+                          "msMax": mesure[2]}
+    return {"fonctions": fonctions,
+            "dom": {"ecritures": compteursDOM["ecritures"],
+                    "requetes": compteursDOM["requetes"],
+                    "ecrituresParAction": compteursDOM["parAction"],
+                    "requetesParAction": compteursDOM["requetesParAction"]}}
+
+
+def mesuresEnJSON():
+    rapport = rapportMesures()
+    fonctions = []
+    for nom in rapport["fonctions"]:
+        mesure = rapport["fonctions"][nom]
+        fonctions.append('"' + nom + '": {"appels": ' + \
+        str(mesure["appels"]) + ', "ms": ' + str(mesure["ms"]) + \
+        ', "msMax": ' + str(mesure["msMax"]) + '}')
+    dom = []
+    for cle in rapport["dom"]:
+        dom.append('"' + cle + '": ' + str(rapport["dom"][cle]))
+    return '{"fonctions": {' + ", ".join(fonctions) + '}, "dom": {' + \
+    ", ".join(dom) + '}}'
+
+
+###############################################################################
+
+# Page Web.
+#
+# Les procédures suivantes affichent la partie en cours (la variable globale
+# partie) dans la page Web de codeBoot et réagissent aux clics du joueur.
+
+
+###############################################################################
+
+# Éléments de la page Web. La grille de cartes n'est construite qu'une fois;
+# on garde ensuite une référence vers la case (td) et l'image (img) de chaque
+# carte, l'image affichée dans chaque case, les cases coloriées en vert et
+# l'élément qui contient les messages. Chaque changement d'affichage ne
+# modifie que ce qui est différent de ce qui est déjà à l'écran.
+cellules = []
+images = []
+sourcesAffichees = []
+casesVertes = []
+noeudMessage = None
+messageAffiche = None
+
+# Élément qui contient le texte de l'indice, texte affiché, case entourée par
+# l'indice (ou None), si la partie en cours est déjà perdue et s'il faut
+# encore le vérifier après le prochain coup (voir bonsMessages).
+noeudIndice = None
+texteIndice = ""
+caseIndice = None
+partiePerdue = False
+verifierPerte = True
+
+# Compteurs des écritures et des requêtes (recherches d'éléments) dans la
+# page Web: le total depuis le chargement de la page et le nombre fait par
+# la dernière action du joueur (coup, brassage ou nouvelle partie).
+compteursDOM = {"ecritures": 0, "parAction": 0, "debutAction": 0,
+                "requetes": 0, "requetesParAction": 0, "debutRequetes": 0}
+
+# Élément qui affiche les mesures par-dessus la page (voir afficherMesures).
+# Il reste vide, et donc caché, tant que les mesures ne sont pas actives.
+noeudMesures = None
+
+# Mesure du temps de démarrage de la page Web: l'heure à laquelle la grille
+# a été construite ("debut") et affichée ("grille"), le nombre d'images
+# chargées depuis et le temps (en millisecondes) qu'il a fallu pour charger
+# les 52 images. Toutes les heures sont comptées depuis le début du
+# chargement de la page.
+chargement = {"debut": 0, "grille": 0, "images": 0, "duree": None}
+
+
+# La fonction horlogePage renvoie le temps écoulé (en millisecondes) depuis
+# le début du chargement de la page Web.
+def horlogePage():
+    return document.timeline.currentTime
+
+
+# La fonction horlogePrecise renvoie l'heure (en millisecondes) de l'horloge
+# précise du navigateur (performance.now), qui avance aussi pendant le
+# traitement d'un clic, contrairement à horlogePage.
+def horlogePrecise():
+    return document.defaultView.performance.now()
+
+
+# La fonction chercherElement renvoie le premier élément sous racine qui
+# correspond au sélecteur CSS, et compte la requête.
+def chercherElement(racine, selecteur):
+    compteursDOM["requetes"] += 1
+    return racine.querySelector(selecteur)
+
+
+# La procédure imageChargee est appelée chaque fois qu'une image de la
+# première grille a fini de se charger. Quand les 52 images sont chargées, la
+# première grille est entièrement visible et on affiche le temps de
+# démarrage dans la console.
+def imageChargee(evenement):
+    chargement["images"] += 1
+    if chargement["images"] == 52:
+        chargement["duree"] = horlogePage() - chargement["debut"]
+        print(rapportDemarrage())
+
+
+# La fonction rapportDemarrage renvoie une ligne de texte qui résume le temps
+# de démarrage de la page Web, du début de son chargement à l'affichage des
+# 52 images de la première grille.
+def rapportDemarrage():
+    return "Démarrage: programme " + str(round(debutScript)) + \
+    " ms, grille " + str(round(chargement["grille"])) + \
+    " ms, première grille visible " + \
+    str(round(chargement["debut"] + chargement["duree"])) + " ms"
+
+
+###############################################################################
+
+# La procédure construireGrille construit la page Web: la grille de cartes de
+# la partie en cours, l'élément des messages (qui contient le message1) et le
+# message2 (Le bouton nouvelle partie). Les cartes vertes sont coloriées dans
+# le texte HTML, pour que la première grille soit affichée en une seule
+# écriture. Elle garde ensuite une référence vers chaque élément qui sera
+# modifié par la suite.
+def construireGrille(msg1):
     global jeuHTML
-    global compteurBrasser
+    global noeudMessage
+    global messageAffiche
+    global noeudIndice
+    global noeudMesures
+
+    # Définition des boutons Nouvelle partie et Indice.
+    msg2 = "<button onclick=init()>Nouvelle partie</button> " + \
+    "<button onclick=indice()>Indice</button>"
+
+    # Modification du fichier HTML.
+    chargement["debut"] = horlogePage()
+    jeuHTML = convertirHTML(partie["jeu"])
+    for i in range(52):
+        casesVertes.append(False)
+    for i in partie["enVert"]:
+        casesVertes[i] = True
+    racine = chercherElement(document, "#cb-body")
+    racine.innerHTML = (css + divId("jeu", table(list(map\
+    (rangee, [0, 1, 2, 3])))) + "<br>" + divId("message", msg1) + "<br>" + \
+    divId("indice", "") + "<br>" + msg2 + divId("mesures", ""))
+    compteursDOM["ecritures"] += 1
+
+    # On garde une référence vers les éléments de la grille.
+    for i in range(52):
+        case = chercherElement(document, "#case" + str(i))
+        cellules.append(case)
+        images.append(chercherElement(case, "img"))
+        images[i].addEventListener("load", imageChargee)
+        sourcesAffichees.append(sourceCarte(partie["jeu"][i]))
+    noeudMessage = chercherElement(document, "#message")
+    noeudIndice = chercherElement(document, "#indice")
+    noeudMesures = chercherElement(document, "#mesures")
+    messageAffiche = msg1
+
+    # Un seul traitement d'événement reçoit les clics sur toute la grille.
+    chercherElement(document, "#jeu table").addEventListener("click", \
+    clicGrille)
+    chargement["grille"] = horlogePage()
+
+
+###############################################################################
+
+# La procédure modifierHTML prend un message en argument et met à jour la page
+# Web pour qu'elle affiche la partie en cours et ce message (Message relié au
+# brassage des cartes et autres évènements). La grille est construite la
+# première fois; ensuite, seules les images des cases qui ont changé, les
+# couleurs et le message sont modifiés.
+def modifierHTML(msg1):
+    if mesuresActives:
+        debut = horlogeMesures()
+
+    if len(cellules) == 0:
+        construireGrille(msg1)
+    else:
+        for i in range(52):
+            afficherCase(i)
+        afficherMessage(msg1)
+    colorier(partie["enVert"])
+
+    if mesuresActives:
+        noterMesure("modifierHTML", debut)
+
+
+# La procédure afficherCase met à jour l'image de la case i si la carte qui
+# s'y trouve n'est pas celle qui est affichée.
+def afficherCase(i):
+    source = sourceCarte(partie["jeu"][i])
+    if sourcesAffichees[i] != source:
+        images[i].setAttribute("src", source)
+        sourcesAffichees[i] = source
+        compteursDOM["ecritures"] += 1
+
+
+# La procédure afficherMessage remplace le message1 s'il a changé.
+def afficherMessage(msg1):
+    global messageAffiche
+
+    if messageAffiche != msg1:
+        noeudMessage.innerHTML = msg1
+        messageAffiche = msg1
+        compteursDOM["ecritures"] += 1
+
+
+# Les procédures debutAction et finAction entourent chaque action du joueur
+# pour compter les écritures et les requêtes dans la page Web qu'elle a
+# demandées. À la fin de l'action, les mesures affichées sont mises à jour.
+def debutAction():
+    compteursDOM["debutAction"] = compteursDOM["ecritures"]
+    compteursDOM["debutRequetes"] = compteursDOM["requetes"]
+
+
+def finAction():
+    compteursDOM["parAction"] = compteursDOM["ecritures"] - \
+    compteursDOM["debutAction"]
+    compteursDOM["requetesParAction"] = compteursDOM["requetes"] - \
+    compteursDOM["debutRequetes"]
+    if mesuresActives:
+        afficherMesures()
+
+
+# La procédure afficherMesures affiche les mesures (voir rapportMesures)
+# dans un tableau par-dessus la page Web, avec un bouton qui les écrit en
+# JSON dans la console. Ces écritures ne sont pas comptées dans compteursDOM.
+def afficherMesures():
+    if noeudMesures == None:
+        return
+    if not mesuresActives:
+        noeudMesures.innerHTML = ""
+        return
+
+    rapport = rapportMesures()
+    texte = "<tr><td>fonction</td><td>appels</td><td>ms</td>" + \
+    "<td>ms/appel</td><td>ms max</td></tr>"
+    for nom in rapport["fonctions"]:
+        mesure = rapport["fonctions"][nom]
+        texte += "<tr><td>" + nom + "</td><td>" + str(mesure["appels"]) + \
+        "</td><td>" + str(round(mesure["ms"], 2)) + "</td><td>" + \
+        str(round(mesure["ms"] / mesure["appels"], 3)) + "</td><td>" + \
+        str(round(mesure["msMax"], 2)) + "</td></tr>"
+    dom = rapport["dom"]
+    texte += "<tr><td>écritures</td><td>" + str(dom["ecritures"]) + \
+    "</td><td colspan=3>" + str(dom["ecrituresParAction"]) + \
+    " (dernière action)</td></tr><tr><td>requêtes</td><td>" + \
+    str(dom["requetes"]) + "</td><td colspan=3>" + \
+    str(dom["requetesParAction"]) + " (dernière action)</td></tr>"
+    noeudMesures.innerHTML = "<table>" + texte + "</table>" + \
+    "<button onclick=exporterMesures()>JSON</button> " + \
+    "<button onclick=reinitialiserMesures()>Remettre à zéro</button>"
+
+
+# La procédure exporterMesures écrit les mesures en JSON dans la console.
+def exporterMesures():
+    print(mesuresEnJSON())
+
+
+###############################################################################
+
+# La procédure clicGrille reçoit tous les clics faits dans la grille de
+# cartes. Elle retrouve la case cliquée à partir de son id ("case" suivi de
+# son index) et déplace la carte si elle fait partie des cartes vertes.
+def clicGrille(evenement):
+    case = evenement.target.closest("td")
+    compteursDOM["requetes"] += 1
+    if case == None:
+        return
+    i = int(case.id[4:])
+    if casesVertes[i]:
+        move(i)
+
 
-    # On identifie les index des cartes à brasser et on les ajoute au tableau
-    # cartesABrasser
-    cartesABrasser=[]
-    for i in range(1, 5):
-        shuffleRangee(jeu, i,cartesABrasser)
+###############################################################################
+
+# La procédure move prend en paramètre l'index correspondant au numéro d'une
+# case, et déplace la carte se trouvant à cette position à l'endroit approprié
+# en faisant appel au moteur de jeu (jouerCoup). Elle modifie également le
+# code HTML de la page Web afin d'afficher les messages appropriés quand
+# l'utilisateur gagne, perd ou il ne peut plus brasser les cartes en faisant
+# appel à la procédure bonsMessages.
+def move(i):
+    if mesuresActives:
+        debut = horlogeMesures()
+    debutAction()
+    effacerIndice()
+
+    # Le moteur déplace la carte et renvoie l'indice j de la case où elle a
+    # été envoyée. Seules les cases i et j ont changé dans la grille.
+    j = jouerCoup(partie, i)
+    afficherCase(i)
+    afficherCase(j)
+
+    # On affiche le bon message pour le bouton Brasser les cartes.
+    bonsMessages()
 
-    # On modifie la variable jeu afin d'avoir un jeu de carte brassé.
-    jeu = jeuAleatoire(cartesABrasser, len(cartesABrasser) - 1, jeu)
+    # On colorie les cartes qui peuvent être déplacées (et on enlève la
+    # couleur de celles qui ne peuvent plus l'être).
+    colorier(partie["enVert"])
 
-    # Après le brassage, on colorie en vert les cartes que l'on peut déplacer
-    # et on met à jour le jeu de carte brassé (dans sa version HTML).
-    enVert = elemVert(jeu)
+    if mesuresActives:
+        noterMesure("move", debut)
+    finAction()
 
-    jeuHTML = convertirHTML(jeu)
 
-    # On met à jour la valeur du compteur pour brasser les cartes, ce compteur
-    # commence à 3.
-    compteurBrasser -= 1
+###############################################################################
+
+# La procédure bonsMessages affiche les messages secondaires à l'endroit du 
+# bouton Brasser les cartes. Elle ne prend pas de paramètre. On affiche le 
+# message approprié quand l'utilisateur a perdu, soit quand la condition pour 
+# gagner n'est pas remplie, le joueur ne peut plus déplacer de cartes et il ne 
+# peut plus brasser les cartes.
+def bonsMessages():
+    global partiePerdue
+    global verifierPerte
+
+    etat = etatPartie(partie)
+
+    if etat == "perdu":
+        msg1 = "Vous n'avez pas réussi à placer toutes les cartes... \
+        Essayez à nouveau!"
+
+        afficherMessage(msg1)
+
+    # On affiche le message approprié quand l'utilisateur n'a pas gagné, qu'il
+    # ne peut plus déplacer de cartes mais qu'il peut encore brasser les
+    # cartes.
+    elif etat == "brasser":
+        msg1 = "Vous devez <button onclick=shuffle()>Brasser les cartes\
+        </button>"
+
+        afficherMessage(msg1)
+
+    # On affiche le message approprié quand l'utilisateur a gagné.
+    elif etat == "gagne":
+        msg1 = "Vous avez gagné! Bravo!"
+
+        afficherMessage(msg1)
+
+    # Quand l'utilisateur ne peut plus brasser les cartes, on cherche (dans le
+    # budget de temps d'un indice) si la partie peut encore être gagnée. On
+    # ne cherche qu'une fois après le dernier brassage, sauf si la recherche
+    # a trouvé une suite gagnante: l'arbre des coups est alors assez petit
+    # pour être exploré de nouveau au prochain coup, qui peut perdre la
+    # partie. Une partie perdue le reste, et une recherche qui a épuisé son
+    # budget le ferait encore au prochain coup.
+    elif partie["compteurBrasser"] == 0:
+        if verifierPerte:
+            resultat = chercherIndice(partie)
+            partiePerdue = resultat["perdue"]
+            verifierPerte = resultat["gagnable"] == True
+        if partiePerdue:
+            msg1 = "Cette position est déjà perdue: aucune suite de coups \
+            ne permet de gagner. Essayez à nouveau!"
+
+            afficherMessage(msg1)
+
+
+###############################################################################
+
+# La procédure indice cherche le meilleur coup de la partie en cours (voir
+# chercherIndice), entoure la carte à déplacer et affiche jusqu'à combien de
+# coups d'avance la recherche a pu aller dans son budget de temps.
+def indice():
+    global caseIndice
+
+    if mesuresActives:
+        debut = horlogeMesures()
+    debutAction()
+    effacerIndice()
+
+    resultat = chercherIndice(partie)
+    if resultat["perdue"]:
+        texte = "Cette position est déjà perdue."
+    elif resultat["coup"] == None:
+        texte = "Aucune carte ne peut être déplacée."
+    else:
+        caseIndice = resultat["coup"]
+        cellules[caseIndice].classList.add("indice")
+        compteursDOM["ecritures"] += 1
+        texte = "Indice: déplacez la carte entourée (recherche de " + \
+        str(resultat["profondeur"]) + " coups d'avance"
+        if resultat["gagnable"]:
+            texte += ", la partie peut être gagnée sans brasser"
+        texte += ")."
+    afficherIndice(texte)
+
+    if mesuresActives:
+        noterMesure("indice", debut)
+    finAction()
+
+
+# La procédure effacerIndice enlève l'indice affiché, s'il y en a un.
+def effacerIndice():
+    global caseIndice
+
+    if caseIndice != None:
+        cellules[caseIndice].classList.remove("indice")
+        caseIndice = None
+        compteursDOM["ecritures"] += 1
+    afficherIndice("")
+
+
+# La procédure afficherIndice remplace le texte de l'indice s'il a changé.
+def afficherIndice(texte):
+    global texteIndice
+
+    if texteIndice != texte:
+        noeudIndice.innerHTML = texte
+        texteIndice = texte
+        compteursDOM["ecritures"] += 1
+
+
+###############################################################################
+
+# Procédure qui ne prend pas de paramètre et qui brasse les cartes qui ne sont
+# pas bien placées dans la grille en faisant appel au moteur de jeu
+# (brasserPartie). Cette procédure met à jour l'affichage des cartes une fois
+# qu'elles sont brassées.
+def shuffle():
+    global verifierPerte
+
+    if mesuresActives:
+        debut = horlogeMesures()
+    debutAction()
+    effacerIndice()
+    verifierPerte = True
+
+    # Le moteur brasse les cartes qui ne sont pas en ordre, recalcule les
+    # cartes que l'on peut déplacer et décrémente le compteur de brassage.
+    brasserPartie(partie)
 
     # On modifie le message1 selon le nombre de fois que l'on peut brasser les
     # cartes une fois le brassage terminé.
+    compteurBrasser = partie["compteurBrasser"]
     if compteurBrasser > 0:
         msg1 = ("Vous pouvez encore <button onclick=shuffle()>Brasser les \
         cartes</button> " + str(compteurBrasser) + " fois")
@@ -330,74 +1314,59 @@ def shuffle():
     # On met à jour l'affichage des cartes sur le site Web avec la couleur lime
     # pour les cartes qui peuvent être déplacées.
     modifierHTML(msg1)
-    colorier(enVert)
-
-
-###############################################################################
-
-# La fonction elemVert prend en paramètre un tableau qui correspond à un jeu de
-# carte et renvoies un tableau des index des éléments qui vont être affiché en 
-# vert, et donc qui peuvent être déplacés.
-def elemVert(jeu):
-    # On initialise un tableau qui va contenir les index des cartes à colorier 
-    # en vert.
-    aColorer = []
 
-    # Pour chaque case vide dans le jeu.
-    for x in range(4):
-        i = trouverIndex(jeu, x)
-
-        # Si l'indice d'avant est sur une autre rangée.
-        if i // 13 != (i - 1) // 13:
-            continue 
-
-        gaucheVide = jeu[i - 1]     # Numéro de la carte à gauche.
-
-        # Si c'est un trou à la gauche.
-        if gaucheVide // 4 == 0:
-            continue                
-        
-        # Numéro de la carte qui peut aller dans le vide.
-        carteVerte = gaucheVide + 4 
-        aColorer.append(trouverIndex(jeu, carteVerte) if carteVerte < 52 \
-        else None)
-
-    # Ajouter les 2 si une rangée commence par un espace vide.
-    for i in range(0, 40, 13):
-        if jeu[i] // 4 == 0:
-            for j in range(4, 8):
-                aColorer.append(trouverIndex(jeu, j))
-            break
-
-    aColorer = list(filter(lambda x: x != None, aColorer))
-
-    return aColorer
+    if mesuresActives:
+        noterMesure("shuffle", debut)
+    finAction()
 
 
 ###############################################################################
 
 # La fonction colorier prend en paramètre un tableau, et colorie les éléments 
-# aux index correspodants aux éléments du tableau. La fonction ajoute aussi le 
-# traitement d'événement 'onclick' avec la fonction move, ce qui permet de 
-# faire le bon traitement lorsque l'on clic sur une carte verte.
+# aux index correspodants aux éléments du tableau en leur ajoutant la classe
+# "vert". Ce sont les seules cases où un clic déplace la carte (voir
+# clicGrille). Les cases vertes qui ne sont pas dans le tableau sont
+# décoloriées; les cases qui sont déjà vertes ne sont pas modifiées.
 def colorier(tableau):
+    if mesuresActives:
+        debut = horlogeMesures()
+
+    nouvellesVertes = [False] * 52
+    for i in tableau:
+        nouvellesVertes[i] = True
+
+    anciennes = []
+    for i in range(52):
+        if casesVertes[i] and not nouvellesVertes[i]:
+            anciennes.append(i)
+    decolorier(anciennes)
+
     for i in tableau:
-        case = document.querySelector("#case" + str(i))
-        case.setAttribute("style", "background-color: lime")
-        case.setAttribute("onclick", "move(" + str(i) + ")")
+        if not casesVertes[i]:
+            cellules[i].classList.add("vert")
+            casesVertes[i] = True
+            compteursDOM["ecritures"] += 1
+
+    if mesuresActives:
+        noterMesure("colorier", debut)
 
 
 ###############################################################################
 
 # La fonction decolorier prend en paramètre un tableau, et enlève la couleur 
-# des cartes aux index correspodants aux éléments du tableau. La fonction 
-# enlève aussi le traitement d'événement, ce qui permet d'empêcher les cartes
-# qui ne peuvent plus bouger de se déplacer.
+# des cartes aux index correspodants aux éléments du tableau, ce qui empêche
+# aussi les cartes qui ne peuvent plus bouger de se déplacer.
 def decolorier(tableau):
+    if mesuresActives:
+        debut = horlogeMesures()
+
     for i in tableau:
-        case = document.querySelector("#case" + str(i))
-        case.removeAttribute("style")
-        case.removeAttribute("onclick")
+        cellules[i].classList.remove("vert")
+        casesVertes[i] = False
+        compteursDOM["ecritures"] += 1
+
+    if mesuresActives:
+        noterMesure("decolorier", debut)
 
 
 ###############################################################################
@@ -407,9 +1376,15 @@ def decolorier(tableau):
 # 0,1,2,3 la valeur As, à 4,5,6,7 la valeur 2, et ainsi de suite. La fonction
 # prend le jeu de cartes et retourne sa version en html.
 def convertirHTML(jeuCarte):
+    if mesuresActives:
+        debut = horlogeMesures()
+
     jeuCarteComplet = []
     for x in jeuCarte:
         jeuCarteComplet.append(convertirCarteHTML(x))
+
+    if mesuresActives:
+        noterMesure("convertirHTML", debut)
     return jeuCarteComplet
 
 
@@ -417,14 +1392,39 @@ def convertirHTML(jeuCarte):
 
 # La fonction convertirCarteHTML prend le numéro correspondant à une carte en 
 # paramètre et retourne le texte HTML correspondant à l'image de cette carte. 
-# L'image des as correspond à une case vide.
+# L'image des as correspond à une case vide. Le texte vient de la table
+# imagesCartes, construite une seule fois au chargement du programme.
 def convertirCarteHTML(x):
+    return imagesCartes[x]
+
+
+# La fonction sourceCarte prend le numéro correspondant à une carte en
+# paramètre et retourne l'URL de l'image de cette carte (voir sourcesCartes).
+def sourceCarte(x):
+    return sourcesCartes[x]
+
+
+# La fonction nomImageCarte prend le numéro correspondant à une carte en
+# paramètre et retourne le nom de son image, soit sa valeur suivie de sa
+# couleur, ou "absent" pour les as.
+def nomImageCarte(x):
     valeur = valeurTab[x // 4]
     couleur = couleurTab[x % 4]
     if valeur == "absent":
-        return '<img src="cards/absent.svg">'
+        return "absent"
     else:
-        return '<img src="cards/' + valeur + couleur + '.svg">'
+        return valeur + couleur
+
+
+# Tables de l'URL et du texte HTML de l'image de chaque carte. Toutes les
+# images sont regroupées dans cards/sprite.svg (voir empaqueter.py), que le
+# navigateur ne charge qu'une fois; la fin de l'URL choisit la vue qui
+# correspond à la carte.
+sourcesCartes = []
+imagesCartes = []
+for x in range(52):
+    sourcesCartes.append("cards/sprite.svg#carte-" + nomImageCarte(x))
+    imagesCartes.append('<img src="' + sourcesCartes[x] + '">')
 
 
 ###############################################################################
@@ -440,7 +1440,9 @@ def tr(contenu):
     return '<tr>' + contenu + '</tr>'
 
 
-def td(i, contenu):
+def td(i, contenu, vert=False):
+    if vert:
+        return '<td id="case' + str(i) + '" class="vert">' + contenu + '</td>'
     return '<td id="case' + str(i) + '">' + contenu + '</td>'
 
 
@@ -456,58 +1458,21 @@ def tabEnTexte(tab):
 
 # La fonction rangee prend en paramètre un nombre entre 0 et 3, et renvoie un 
 # texte entre les bornes <> correspondant au contenu de la rangée du tableau de 
-# carte ayant comme indice le numéro entré en paramètre.
+# carte ayant comme indice le numéro entré en paramètre. Les cases vertes
+# (casesVertes) reçoivent la classe "vert".
 def rangee(num):
+    if mesuresActives:
+        debut = horlogeMesures()
+
     debutRangee = num * 13
     texte = ""
     # On insère les images des cartes au bon endroit dans le tableau HTML.
     for i in range(debutRangee, debutRangee + 13):
-        texte += td(i, jeuHTML[i])
-    return tr(texte)
-
-
-###############################################################################
+        texte += td(i, jeuHTML[i], casesVertes[i])
 
-# Procédure de tests unitaires pour les différentes fonctions utilisées dans le
-# programme.
-def tests():
-    assert len(jeuAleatoire(None, 51, None)) == 52
-    assert len(jeuAleatoire([1,2,3],2,[1,2,3,4])) == 4
-    assert trouverIndex([0, 1, 2, 3], 2) == 2
-    assert trouverIndex([], 2) == -1
-    assert trouverIndex([2, 3, 4], 5) == -1
-    assert trouverIndex([7, "pomme", True], "pomme") == 1
-    assert tr('allo') == "<tr>allo</tr>"
-    assert tr('') == "<tr></tr>"
-    assert td(2, 'allo') == '<td id="case2">allo</td>'
-    assert td(0,'') == '<td id="case0"></td>'
-    assert divId('oui','non') == '<div id="oui">non</div>'
-    assert divId('','') == '<div id=""></div>'
-    assert tabEnTexte(['je','suis','gentil']) == 'jesuisgentil'
-    assert tabEnTexte(['je','','gentil']) == 'jegentil'
-    assert table(['je','suis','gentil']) == '<table>jesuisgentil</table>'
-    assert table(['je','','gentil']) == '<table>jegentil</table>'
-    assert convertirCarteHTML(21) == '<img src="cards/6D.svg">'
-    assert convertirCarteHTML(38) == '<img src="cards/10S.svg">'
-    assert convertirCarteHTML(0) == '<img src="cards/absent.svg">'
-    assert convertirHTML([21,38,0]) == ['<img src="cards/6D.svg">',\
-    '<img src="cards/10S.svg">', '<img src="cards/absent.svg">']
-    assert convertirHTML([]) == []
-    assert elemVert([51, 35, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
-    21, 39, 44, 33, 2, 7, 38, 32, 46, 18, 16, 45, 31, 50, 26, 48, 10, 15, 1,\
-    13, 43, 22, 6, 14, 49, 5, 30, 4, 36, 11, 0, 12, 42, 17, 29, 25, 3]) == \
-    [32, 8, 7, 49]
-    assert elemVert([0, 35, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
-    21, 39, 44, 33, 2, 7, 38, 32, 46, 18, 16, 45, 31, 50, 26, 48, 10, 15, 1,\
-    13, 43, 22, 6, 14, 49, 5, 30, 4, 36, 11, 51, 12, 42, 17, 29, 25, 3]) == \
-    [8, 7, 49, 42, 40, 37, 20]
-    assert elemVert([51, 0, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
-    21, 39, 44, 33, 5, 7, 38, 32, 46, 18, 16, 45, 31, 50, 1, 48, 3, 15, 26,\
-    13, 43, 22, 6, 14, 49, 2, 30, 4, 36, 11, 35, 12, 42, 17, 29, 25, 10]) == []
-    assert elemVert([0, 1, 2, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 3, 9,\
-    21, 39, 44, 33, 40, 7, 38, 32, 46, 18, 16, 45, 31, 50, 26, 48, 10, 15, 35,\
-    13, 43, 22, 6, 14, 49, 5, 30, 4, 36, 11, 51, 12, 42, 17, 29, 25, 27]) == \
-    [42,40,37,20]
+    if mesuresActives:
+        noterMesure("rangee", debut)
+    return tr(texte)
 
 
 ###############################################################################
@@ -516,37 +1481,77 @@ def tests():
 # on clique sur le bouton Nouvelle partie.
 def init():
     # On définit les variables globales reliées au jeu de carte.
-    global jeu
-    global enVert
-    global jeuHTML
-    global compteurBrasser
-
-    # On assigne un jeu de carte aléatoire à la variable jeu et on convertit le
-    # jeu de carte en images. On initialise la variable enVert afin d'afficher
-    # les cartes que l'on peut déplacer au début de la partie.
-    jeu = jeuAleatoire(None, 51,None)
-    jeuHTML = convertirHTML(jeu)
-    enVert = elemVert(jeu)
-
-    # On initialise le compteur de brassage à 3.
-    compteurBrasser = 3
+    global partie
+    global partiePerdue
+    global verifierPerte
+
+    if mesuresActives:
+        debut = horlogeMesures()
+    debutAction()
+    effacerIndice()
+    partiePerdue = False
+    verifierPerte = True
+
+    # On crée une nouvelle partie avec un jeu de carte aléatoire. Le moteur
+    # initialise le compteur de brassage à 3 et les cartes que l'on peut
+    # déplacer au début de la partie.
+    partie = nouvellePartie()
 
     # Message initial pour le bouton de brassage.
     msg1 = ("Vous pouvez encore <button onclick=shuffle()>Brasser les cartes\
-    </button> " + str(compteurBrasser) + " fois")
+    </button> " + str(partie["compteurBrasser"]) + " fois")
 
     # On modifie le code HTML pour que la page Web affiche le jeu de carte 
     # aléatoire et les boutons de brassage et de nouvelle partie. On colorie 
     # les cartes que l'on peut déplacer en vert.
     modifierHTML(msg1)
-    colorier(enVert)
+
+    if mesuresActives:
+        noterMesure("init", debut)
+    finAction()
 
 
 ###############################################################################
 
-# On fait appel à la fonction init pour charger la page Web quand l'utilisateur
-# se connecte au site Web.
-init()
+# La fonction dansNavigateur renvoie True si le programme s'exécute dans
+# codeBoot, où l'objet document est défini, et False s'il est importé par un
+# interpréteur Python standard (par exemple pour les bancs d'essai).
+def dansNavigateur():
+    try:
+        document
+        return True
+    except NameError:
+        return False
+
+
+# La fonction modeTests renvoie True si l'adresse de la page Web demande
+# d'exécuter les tests unitaires (par exemple main.html?tests). Les tests
+# sont dans tests.py, que seule la page tests.html charge.
+def modeTests():
+    return "tests" in document.location.search
 
-# On fait appel à la procédure de tests unitaires.
-tests()
\ No newline at end of file
+
+# La fonction modeMesures renvoie True si l'adresse de la page Web demande
+# d'activer les mesures (par exemple main.html?mesures).
+def modeMesures():
+    return "mesures" in document.location.search
+
+
+###############################################################################
+
+# On fait appel à la fonction init pour charger la page Web quand l'utilisateur
+# se connecte au site Web. La partie n'est créée et affichée qu'une fois: la
+# page main.html n'appelle pas init de nouveau au chargement.
+#
+# Les tests unitaires ne font pas partie de ce fichier, pour que codeBoot
+# n'ait pas à les lire et à les compiler à chaque chargement de la page. On
+# les exécute avec "python tests.py", ou dans la page Web avec l'adresse
+# main.html?tests, qui mène à la page tests.html. Avec l'adresse
+# main.html?mesures, les mesures sont actives dès la première partie.
+if dansNavigateur():
+    if modeTests():
+        document.location.replace("tests.html")
+    else:
+        if modeMesures():
+            activerMesures()
+        init()
\ No newline at end of file
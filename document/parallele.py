@@ -0,0 +1,334 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module répartit la recherche du solveur (solveur.py) entre plusieurs
+# processus. L'arbre des coups est d'abord développé en largeur jusqu'à avoir
+# quelques sous-arbres par processus. Chaque sous-arbre est une tâche: un
+# processus libre prend la prochaine tâche et la cherche avec resoudre, pour
+# au plus limiteTranche noeuds, sans revenir sur les jeux qui mènent à la
+# racine du sous-arbre. Si la tâche n'est pas terminée, ce qui reste à
+# explorer (les coups pas encore essayés de chaque jeu du chemin de la
+# recherche interrompue) devient de nouvelles tâches: le travail déjà fait
+# n'est pas refait. Les grands sous-arbres sont donc partagés entre les
+# processus au fil de la recherche.
+#
+# Le processus principal garde les tâches qui attendent dans une file de
+# priorité et n'en confie que quelques-unes à la fois à chaque processus. La
+# prochaine tâche confiée est la première dans l'ordre de la recherche en
+# profondeur de resoudre: les processus explorent à peu près les jeux que
+# resoudre explorerait seul, dans le même ordre, au lieu de s'éparpiller, et
+# la file reste petite. Un jeu ne devient une tâche qu'une seule fois.
+#
+# Les processus partagent une seule table de transposition en mémoire
+# partagée: un jeu exploré sans succès par un processus n'est plus exploré
+# par les autres. Un jeu dont le reste de l'exploration est confié à des
+# tâches y est aussi enregistré. Dès qu'un processus trouve une suite
+# gagnante, un événement partagé arrête tous les autres.
+#
+# Utilisation: python parallele.py [nombreDonnes] [limiteNoeuds]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import heapq
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+from main import brasserPartie, choisirFormat, copierPartie, creerPartie, \
+formatJeu, jouerCoup, nouvellePartie
+from solveur import chercherTable, enregistrerTable, estGagnant, hacherJeu, \
+resoudre
+
+
+###############################################################################
+
+# Nombre maximal de noeuds explorés par une tâche avant d'être redécoupée,
+# nombre de sous-arbres à préparer par processus au début de la recherche et
+# nombre de tâches confiées à la fois à chaque processus.
+limiteTranche = 20000
+tachesParProcessus = 4
+tachesEnCoursParProcessus = 2
+
+# Table de transposition, événement d'arrêt partagés et limite de noeuds des
+# tâches, installés dans chaque processus par initialiserProcessus.
+tableProcessus = None
+arretProcessus = None
+trancheProcessus = limiteTranche
+
+
+###############################################################################
+
+# La fonction tablePartagee renvoie une table de transposition (voir
+# creerTable) dont les entrées sont en mémoire partagée (un
+# multiprocessing.RawArray de 2**bits entiers de 64 bits), vues comme un
+# tableau d'entiers pour que leur accès soit aussi rapide que celui de la
+# table de creerTable.
+def tablePartagee(entrees, bits):
+    return {"entrees": memoryview(entrees).cast("B").cast("Q"),
+            "masque": (1 << bits) - 1, "consultations": 0, "succes": 0}
+
+
+# La procédure initialiserProcessus est appelée au démarrage de chaque
+# processus. Elle choisit le format du jeu de la recherche (un processus
+# démarré sans copie du processus principal ne le connaît pas) et crée la
+# table de transposition du processus sur les entrées partagées.
+def initialiserProcessus(entrees, bits, arret, tranche, couleurs, valeurs):
+    global tableProcessus
+    global arretProcessus
+    global trancheProcessus
+
+    choisirFormat(couleurs, valeurs)
+    tableProcessus = tablePartagee(entrees, bits)
+    arretProcessus = arret
+    trancheProcessus = tranche
+
+
+# La fonction explorerTache cherche une suite gagnante dans un sous-arbre.
+# Une tâche contient sa place dans l'ordre de la recherche en profondeur (le
+# tuple des rangs des coups qui mènent à la racine du sous-arbre, chacun
+# parmi les coups de son jeu), le jeu à la racine du sous-arbre, les
+# brassages restants, les coups qui y mènent depuis la racine de la
+# recherche, l'ensemble des hachages des jeux sur ce chemin (que resoudre
+# évite) et le hachage du jeu. Elle renvoie le résultat de resoudre (avec le
+# chemin complet des coups si le sous-arbre est gagnant) et, si la tâche
+# n'est pas terminée, les tâches de ce qui reste à explorer. Une tâche dont
+# le jeu a été exploré depuis qu'elle a été créée (il est dans la table)
+# n'est pas explorée de nouveau.
+#
+# Les jeux du chemin de la recherche interrompue sont alors enregistrés dans
+# la table comme s'ils avaient été explorés sans succès: ce qui reste à
+# explorer à partir d'eux est dans les nouvelles tâches, et un processus qui
+# les atteint par une autre suite de coups ne refait pas ce travail.
+def explorerTache(tache):
+    ordre, jeu, compteurBrasser, prefixe, chemin, h = tache
+    if chercherTable(tableProcessus, h):
+        return {"gagnable": False, "coups": None, "noeuds": 0,
+                "sousTaches": []}
+    partie = creerPartie(list(jeu), compteurBrasser)
+    resultat = resoudre(partie, trancheProcessus, tableProcessus,
+                        arretProcessus, chemin)
+
+    sousTaches = []
+    if resultat["gagnable"] == True:
+        resultat["coups"] = prefixe + resultat["coups"]
+    elif resultat["gagnable"] == None and not arretProcessus.is_set():
+        coupsChemin = resultat["coupsChemin"]
+        restants = resultat["restants"]
+        chemin = set(chemin)
+        for k in range(len(restants)):
+            if k > 0:
+                jouerCoup(partie, coupsChemin[k - 1])
+                ordre += (restants[k - 1][0] - 1,)
+                h = hacherJeu(partie["jeu"])
+                chemin.add(h)
+            enregistrerTable(tableProcessus, h)
+            premier, essais = restants[k]
+            sousTaches += developper(partie, ordre, prefixe +
+                                     coupsChemin[:k], chemin,
+                                     tableProcessus, essais, premier)
+    del resultat["coupsChemin"]
+    del resultat["restants"]
+    resultat["sousTaches"] = sousTaches
+    return resultat
+
+
+# La fonction developper renvoie les tâches des sous-arbres d'une partie, un
+# par coup de essais (tous les coups possibles si essais est None), sans les
+# jeux déjà sur le chemin ni ceux que la table (si elle est donnée) connaît
+# déjà comme explorés. ordre est la place de la partie dans l'ordre de la
+# recherche et premier le rang du premier coup de essais.
+def developper(partie, ordre, prefixe, chemin, table=None, essais=None,
+               premier=0):
+    if essais == None:
+        essais = partie["enVert"]
+
+    sousTaches = []
+    for k in range(len(essais)):
+        essai = copierPartie(partie)
+        jouerCoup(essai, essais[k])
+        h = hacherJeu(essai["jeu"])
+        if h in chemin or (table != None and chercherTable(table, h)):
+            continue
+        sousTaches.append((ordre + (premier + k,), essai["jeu"],
+                           essai["compteurBrasser"], prefixe + [essais[k]],
+                           chemin | {h}, h))
+    return sousTaches
+
+
+###############################################################################
+
+# La fonction decouper développe l'arbre des coups en largeur à partir de la
+# partie jusqu'à obtenir au moins nombreTaches sous-arbres (ou jusqu'à ce que
+# l'arbre ne puisse plus être développé). Un jeu atteint par plusieurs
+# suites de coups ne donne qu'une tâche. Elle renvoie les tâches, la suite
+# de coups gagnante si un jeu gagnant a été rencontré (ou None) et les
+# hachages des jeux développés, dont les sous-arbres sont dans les tâches.
+def decouper(partie, nombreTaches):
+    h = hacherJeu(partie["jeu"])
+    vus = {h}
+    developpes = []
+    taches = [((), partie["jeu"], partie["compteurBrasser"], [], {h}, h)]
+    while 0 < len(taches) < nombreTaches:
+        suivantes = []
+        for ordre, jeu, compteurBrasser, prefixe, chemin, h in taches:
+            if estGagnant(jeu):
+                return [], prefixe, developpes
+            sousPartie = creerPartie(list(jeu), compteurBrasser)
+            for sousTache in developper(sousPartie, ordre, prefixe, chemin):
+                if sousTache[5] not in vus:
+                    vus.add(sousTache[5])
+                    suivantes.append(sousTache)
+            developpes.append(h)
+        if len(suivantes) <= len(taches):
+            taches = suivantes
+            break
+        taches = suivantes
+    return taches, None, developpes
+
+
+###############################################################################
+
+# La fonction resoudreParallele cherche, comme resoudre, une suite de coups
+# gagnante sans brasser les cartes, mais avec plusieurs processus (tous les
+# processeurs par défaut). La partie n'est pas modifiée. limiteNoeuds limite
+# le nombre total de noeuds explorés par tous les processus; la table de
+# transposition partagée a 2**bits entrées et une tâche explore au plus
+# tranche noeuds avant d'être redécoupée.
+#
+# Elle renvoie un dictionnaire qui contient "gagnable", "coups",
+# "compteurBrasser", "noeuds", "duree" et "noeudsParSeconde" (voir resoudre),
+# ainsi que "processus" et "taches" (le nombre de tâches explorées).
+def resoudreParallele(partie, processus=None, limiteNoeuds=None, bits=20,
+                      tranche=limiteTranche):
+    if processus == None:
+        processus = os.cpu_count() or 1
+
+    debut = time.perf_counter()
+    gagnable = None
+    noeuds = 0
+    nombreTaches = 0
+
+    taches, coupsGagnants, developpes = decouper(partie, tachesParProcessus *
+                                                 processus)
+    if coupsGagnants != None:
+        gagnable = True
+    elif len(taches) == 0:
+        gagnable = False
+
+    else:
+        entrees = multiprocessing.RawArray("Q", 1 << bits)
+        table = tablePartagee(entrees, bits)
+        for h in developpes:
+            enregistrerTable(table, h)
+        arret = multiprocessing.Event()
+        resultats = queue.Queue()
+        couleurs, valeurs = formatJeu()
+
+        # Les tâches qui attendent, en tas (la première dans l'ordre de la
+        # recherche en tête), et les hachages des jeux qui sont déjà devenus
+        # des tâches.
+        enAttente = list(taches)
+        heapq.heapify(enAttente)
+        vus = {tache[5] for tache in taches}
+
+        with multiprocessing.Pool(processus, initialiserProcessus,
+                                  (entrees, bits, arret, tranche, couleurs,
+                                   valeurs)) as pool:
+            enCours = 0
+            while enCours > 0 or len(enAttente) > 0:
+                while len(enAttente) > 0 and \
+                enCours < tachesEnCoursParProcessus * processus:
+                    pool.apply_async(explorerTache,
+                                     (heapq.heappop(enAttente),),
+                                     callback=resultats.put,
+                                     error_callback=resultats.put)
+                    enCours += 1
+
+                # On traite les résultats dans l'ordre où les tâches se
+                # terminent. Ce qui reste d'une tâche non terminée est
+                # ajouté aux tâches qui attendent.
+                resultat = resultats.get()
+                enCours -= 1
+                if isinstance(resultat, BaseException):
+                    arret.set()
+                    raise resultat
+                noeuds += resultat["noeuds"]
+                nombreTaches += 1
+
+                if resultat["gagnable"] == True:
+                    gagnable = True
+                    coupsGagnants = resultat["coups"]
+                    break
+                if limiteNoeuds != None and noeuds >= limiteNoeuds:
+                    break
+                for tache in resultat["sousTaches"]:
+                    if tache[5] not in vus:
+                        vus.add(tache[5])
+                        heapq.heappush(enAttente, tache)
+
+            # Toutes les tâches sont terminées sans succès: aucune suite
+            # gagnante n'existe.
+            if enCours == 0 and len(enAttente) == 0 and gagnable == None \
+            and (limiteNoeuds == None or noeuds < limiteNoeuds):
+                gagnable = False
+            arret.set()
+
+    duree = time.perf_counter() - debut
+    return {"gagnable": gagnable, "coups": coupsGagnants,
+            "compteurBrasser": partie["compteurBrasser"], "noeuds": noeuds,
+            "duree": duree,
+            "noeudsParSeconde": noeuds / duree if duree > 0 else 0.0,
+            "processus": processus, "taches": nombreTaches}
+
+
+###############################################################################
+
+# La fonction partiesBanc renvoie les parties du banc d'essai: les donnes
+# tirées des graines 0 à nombreDonnes - 1, après un premier brassage (le
+# moment où le solveur peut le plus souvent conclure).
+def partiesBanc(nombreDonnes):
+    parties = []
+    for graine in range(nombreDonnes):
+        partie = nouvellePartie(graine)
+        brasserPartie(partie)
+        parties.append(partie)
+    return parties
+
+
+# La procédure principale mesure l'accélération de la recherche avec 1 à N
+# processus (N étant le nombre de processeurs) sur le banc d'essai, par
+# rapport au solveur séquentiel, avec la même limite de noeuds par partie.
+def principal(nombreDonnes=8, limiteNoeuds=300000):
+    parties = partiesBanc(nombreDonnes)
+
+    debut = time.perf_counter()
+    decidees = 0
+    noeuds = 0
+    for partie in parties:
+        resultat = resoudre(partie, limiteNoeuds)
+        decidees += resultat["gagnable"] != None
+        noeuds += resultat["noeuds"]
+    reference = time.perf_counter() - debut
+    print("séquentiel   : %7.2f s  %9d noeuds  %2d/%d décidées" % (
+          reference, noeuds, decidees, len(parties)))
+
+    for processus in range(1, (os.cpu_count() or 1) + 1):
+        debut = time.perf_counter()
+        decidees = 0
+        noeuds = 0
+        for partie in parties:
+            resultat = resoudreParallele(partie, processus, limiteNoeuds)
+            decidees += resultat["gagnable"] != None
+            noeuds += resultat["noeuds"]
+        duree = time.perf_counter() - debut
+        print("%2d processus : %7.2f s  %9d noeuds  %2d/%d décidées  "
+              "accélération %5.2fx" % (processus, duree, noeuds, decidees,
+              len(parties), reference / duree), flush=True)
+
+
+if __name__ == "__main__":
+    principal(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,193 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module offre une représentation compacte d'un jeu de cartes, le plateau,
+# pour les programmes qui gardent beaucoup de jeux en mémoire (solveur,
+# simulateur). Un plateau est un bytearray de 104 octets: les 52 premiers
+# contiennent la carte de chaque case (comme le jeu de main.py) et les 52
+# suivants la case de chaque carte (comme l'index des positions). Copier un
+# plateau revient à copier un bloc de 104 octets, et la clé d'un plateau
+# (cleJeu) est un objet bytes de 52 octets, dont le hachage est calculé par
+# Python une seule fois.
+#
+# Pour jouer, on garde avec le plateau ses masques: les cases sont vues comme
+# les bits 0 à 51 d'un entier (le bit i pour la case i), et les masques sont
+# les cases de chaque valeur (masques[0] pour les as, soit les cases vides,
+# jusqu'à masques[12] pour les rois) puis de chaque couleur (masques[13] à
+# masques[16]). Les cartes vertes, les cases vides et les rangées qui
+# commencent par un 2 se calculent avec des opérations sur ces masques, que
+# jouerPlateau met à jour avec 4 ou exclusifs. Les fonctions de conversion
+# permettent de passer d'un plateau à un jeu ou à une partie de main.py et
+# inversement.
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+from main import creerPartie, indexerPositions
+
+
+###############################################################################
+
+# Masque des cases de la première colonne.
+premiereColonne = (1 << 0) | (1 << 13) | (1 << 26) | (1 << 39)
+
+# Pour chaque couleur, les 12 cartes d'une rangée gagnante (de 2 à K) vues
+# comme un entier de 12 octets, la carte de la première colonne étant
+# l'octet de poids faible.
+rangeesGagnantes = [int.from_bytes(bytes(range(4 + couleur, 52, 4)), \
+"little") for couleur in range(4)]
+
+
+###############################################################################
+
+# La fonction creerPlateau renvoie le plateau d'un jeu de cartes. Les
+# fonctions jeuPlateau et positionsPlateau font la conversion inverse.
+def creerPlateau(jeu):
+    return bytearray(jeu) + bytearray(indexerPositions(jeu))
+
+
+def jeuPlateau(plateau):
+    return list(plateau[:52])
+
+
+def positionsPlateau(plateau):
+    return list(plateau[52:])
+
+
+# La fonction partiePlateau renvoie une partie de main.py (voir creerPartie)
+# dont le jeu est celui du plateau.
+def partiePlateau(plateau, compteurBrasser=3):
+    return creerPartie(jeuPlateau(plateau), compteurBrasser)
+
+
+# La fonction cleJeu renvoie une clé compacte et non modifiable qui identifie
+# le jeu d'un plateau ou d'une partie, pour les ensembles et les
+# dictionnaires de jeux (52 octets au lieu d'un tuple de 52 entiers).
+def cleJeu(jeu):
+    return bytes(jeu[:52])
+
+
+###############################################################################
+
+# La fonction masquesPlateau renvoie les masques d'un plateau: les cases de
+# chaque valeur, puis de chaque couleur.
+def masquesPlateau(plateau):
+    masques = [0] * 17
+    for carte in range(52):
+        bit = 1 << plateau[52 + carte]
+        masques[carte // 4] |= bit
+        masques[13 + carte % 4] |= bit
+    return masques
+
+
+# La fonction coupsPlateau renvoie le masque des cases des cartes que l'on
+# peut déplacer (voir elemVert). La fonction casesMasque renvoie les cases
+# d'un masque en ordre croissant.
+def coupsPlateau(plateau, masques):
+    trous = masques[0]
+    masque = 0
+
+    # Les cases vides hors de la première colonne dont la carte de gauche
+    # n'est ni un as ni un roi: la carte suivante de la même couleur est
+    # verte.
+    gauches = ((trous & ~premiereColonne) >> 1) & ~(trous | masques[12])
+    while gauches != 0:
+        bit = gauches & -gauches
+        gauches ^= bit
+        masque |= 1 << plateau[56 + plateau[bit.bit_length() - 1]]
+
+    # Les 2 sont verts si une rangée commence par une case vide.
+    if trous & premiereColonne != 0:
+        masque |= masques[1]
+    return masque
+
+
+def casesMasque(masque):
+    cases = []
+    while masque != 0:
+        bit = masque & -masque
+        masque ^= bit
+        cases.append(bit.bit_length() - 1)
+    return cases
+
+
+###############################################################################
+
+# La fonction prefixesPlateau renvoie le nombre de cartes bien ordonnées au
+# début de chaque rangée (voir calculerPrefixes). Le masque des 2 donne
+# d'abord les rangées qui commencent par un 2 (souvent aucune). Pour chacune,
+# on compare ses 12 premières cartes à celles de la rangée gagnante de la
+# couleur du 2: le premier octet différent est celui du premier bit non nul
+# du ou exclusif des deux.
+def prefixesPlateau(plateau, masques):
+    deux = masques[1] & premiereColonne
+    if deux == 0:
+        return [0, 0, 0, 0]
+    prefixes = []
+    for debut in range(0, 52, 13):
+        if (deux >> debut) & 1 == 0:
+            prefixes.append(0)
+            continue
+        difference = int.from_bytes(plateau[debut:debut + 12], "little") ^ \
+        rangeesGagnantes[plateau[debut] % 4]
+        if difference == 0:
+            prefixes.append(12)
+        else:
+            prefixes.append(((difference & -difference).bit_length() - 1) \
+            // 8)
+    return prefixes
+
+
+# La fonction masqueOrdonnees renvoie le masque des cases bien ordonnées,
+# soit les cases qui ne seraient pas brassées (voir cartesABrasserPartie).
+def masqueOrdonnees(plateau, masques):
+    masque = 0
+    prefixes = prefixesPlateau(plateau, masques)
+    for rangee in range(4):
+        masque |= ((1 << prefixes[rangee]) - 1) << (13 * rangee)
+    return masque
+
+
+# La fonction gagnantPlateau renvoie True si les 4 rangées sont ordonnées de
+# 2 à K (voir testerProgression). Tant qu'une rangée ne commence pas par un
+# 2, le masque des 2 suffit.
+def gagnantPlateau(plateau, masques):
+    return masques[1] & premiereColonne == premiereColonne and \
+    prefixesPlateau(plateau, masques) == [12, 12, 12, 12]
+
+
+###############################################################################
+
+# La fonction jouerPlateau déplace la carte de la case i dans la case vide
+# qui la suit (voir destinationCoup et jouerCoup), met à jour les masques et
+# renvoie l'indice de cette case. La carte doit être verte. Un 2 va dans la
+# première case vide de la première colonne; s'il y est déjà, il va dans la
+# suivante (après lui, en revenant au début).
+def jouerPlateau(plateau, masques, i):
+    carte = plateau[i]
+    if carte // 4 == 1:
+        trous = masques[0] & premiereColonne
+        if (1 << i) & premiereColonne != 0:
+            apres = trous & ~((2 << i) - 1)
+            if apres != 0:
+                trous = apres
+        j = (trous & -trous).bit_length() - 1
+        if j < 0:
+            return i
+    else:
+        j = plateau[52 + carte - 4] + 1
+    carteVide = plateau[j]
+    plateau[i] = carteVide
+    plateau[j] = carte
+    plateau[52 + carte] = j
+    plateau[52 + carteVide] = i
+
+    # La carte et l'as échangent leurs cases dans les masques de leur valeur
+    # et de leur couleur.
+    bits = (1 << i) | (1 << j)
+    masques[carte // 4] ^= bits
+    masques[13 + carte % 4] ^= bits
+    masques[0] ^= bits
+    masques[13 + carteVide % 4] ^= bits
+    return j
@@ -0,0 +1,325 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module enregistre des parties jouées dans un format binaire compact,
+# pour analyser des millions de parties. Un fichier registre commence par les
+# 4 octets "ASR1", suivis des enregistrements, un par partie:
+#
+#   longueur   entier variable (varint): nombre d'octets qui suivent;
+#   drapeaux   1 octet: bit 0 si la partie est gagnée, bit 1 si la graine
+#              est connue (voir nouvellePartie);
+#   graine     8 octets (entier non signé, petit-boutiste), 0 si inconnue;
+#   donne      52 octets: le jeu au début de la partie;
+#   événements les coups et les brassages, dans l'ordre où ils ont été joués.
+#              Un coup est un octet de 0 à 51 (la case de la carte déplacée,
+#              comme pour move). Un brassage est l'octet 52, suivi du nombre
+#              k de cases brassées et des k cartes placées dans ces cases
+#              (dans l'ordre des cases, voir brasserPartie).
+#
+# Le lecteur projette le fichier en mémoire (mmap) et parcourt les
+# enregistrements sans copier leurs octets. Un enregistrement dont la longueur
+# dépasse la fin du fichier (ou est trop courte pour la donne) termine la
+# lecture: il est produit comme un enregistrement tronqué, sans lever
+# d'exception. La fonction rejouer reconstruit la partie après n'importe quel
+# nombre d'événements avec le moteur de main.py, soit les mêmes règles que
+# move et shuffle.
+#
+# Utilisation: python registres.py [nombreParties]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import json
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from main import brasserPartie, creerPartie, jouerCoup
+
+
+###############################################################################
+
+# Signature au début d'un fichier registre, taille minimale d'un
+# enregistrement (drapeaux, graine et donne), code d'un brassage dans les
+# événements et valeurs des drapeaux.
+entete = b"ASR1"
+tailleFixe = 1 + 8 + 52
+codeBrassage = 52
+drapeauGagne = 1
+drapeauGraine = 2
+
+
+###############################################################################
+
+# La fonction encoderVarint renvoie les octets d'un entier positif, 7 bits par
+# octet en commençant par les bits de poids faible; le bit 7 indique qu'un
+# autre octet suit. La fonction lireVarint lit un entier à la position donnée
+# et renvoie cet entier et la position qui le suit.
+def encoderVarint(n):
+    octets = bytearray()
+    while n >= 0x80:
+        octets.append((n & 0x7F) | 0x80)
+        n >>= 7
+    octets.append(n)
+    return octets
+
+
+def lireVarint(donnees, position):
+    n = 0
+    decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        n |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return n, position
+        decalage += 7
+
+
+# La fonction lireLongueur lit la longueur de l'enregistrement qui commence à
+# la position donnée et renvoie la position qui suit la longueur et celle de
+# la fin de l'enregistrement, ou None si l'enregistrement dépasse la limite
+# (fichier tronqué) ou est trop court pour contenir la partie fixe.
+def lireLongueur(vue, position, limite):
+    try:
+        longueur, position = lireVarint(vue, position)
+    except IndexError:
+        return None
+    finEnregistrement = position + longueur
+    if longueur < tailleFixe or finEnregistrement > limite:
+        return None
+    return position, finEnregistrement
+
+
+###############################################################################
+
+# La fonction nouvelEnregistrement commence l'enregistrement d'une partie à
+# partir de son jeu initial (et de sa graine, si elle est connue). Les
+# procédures noterCoup et noterBrassage y ajoutent un coup (la case de la
+# carte déplacée) et un brassage (les cases brassées, telles que renvoyées
+# par brasserPartie, une fois le brassage fait).
+def nouvelEnregistrement(partie, graine=None):
+    return {"graine": graine, "donne": bytes(partie["jeu"]),
+            "evenements": bytearray()}
+
+
+def noterCoup(enregistrement, i):
+    enregistrement["evenements"].append(i)
+
+
+def noterBrassage(enregistrement, partie, cases):
+    evenements = enregistrement["evenements"]
+    evenements.append(codeBrassage)
+    evenements.append(len(cases))
+    for i in cases:
+        evenements.append(partie["jeu"][i])
+
+
+# La fonction encoderEnregistrement renvoie les octets d'un enregistrement
+# dans le format du registre. La procédure ecrireEnregistrement les écrit
+# dans un fichier ouvert par ouvrirRegistre.
+def encoderEnregistrement(enregistrement, gagne):
+    drapeaux = drapeauGagne if gagne else 0
+    graine = 0
+    if enregistrement["graine"] != None:
+        drapeaux |= drapeauGraine
+        graine = enregistrement["graine"] % 18446744073709551616
+    corps = bytes([drapeaux]) + graine.to_bytes(8, "little") + \
+    enregistrement["donne"] + enregistrement["evenements"]
+    return encoderVarint(len(corps)) + corps
+
+
+def ouvrirRegistre(chemin):
+    fichier = open(chemin, "wb")
+    fichier.write(entete)
+    return fichier
+
+
+def ecrireEnregistrement(fichier, enregistrement, gagne):
+    fichier.write(encoderEnregistrement(enregistrement, gagne))
+
+
+###############################################################################
+
+# La fonction projeterRegistre projette un fichier registre en mémoire et
+# renvoie une vue (memoryview) sur ses octets, après avoir vérifié sa
+# signature.
+def projeterRegistre(chemin):
+    with open(chemin, "rb") as fichier:
+        if os.fstat(fichier.fileno()).st_size < len(entete):
+            raise ValueError(chemin + " n'est pas un fichier registre")
+        donnees = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+    vue = memoryview(donnees)
+    if vue[:len(entete)] != entete:
+        raise ValueError(chemin + " n'est pas un fichier registre")
+    return vue
+
+
+# La fonction lireRegistre produit les enregistrements d'un fichier registre,
+# dans l'ordre. Chaque enregistrement est un dictionnaire qui contient
+# "gagne", "graine" (ou None), "donne" (52 octets), "evenements" et
+# "tronque". La donne et les événements sont des vues (memoryview) sur le
+# fichier projeté en mémoire: ils ne sont valides que pendant le parcours et
+# il faut les copier (bytes) pour les garder. On peut ne lire que les
+# enregistrements d'une tranche du fichier, de l'octet debut à l'octet fin
+# (voir decouperRegistre).
+#
+# Si la longueur d'un enregistrement est illisible ou incorrecte (voir
+# lireLongueur), le dernier enregistrement produit a "tronque" à True, une
+# donne et des événements vides, et la lecture s'arrête, puisque la position
+# de l'enregistrement suivant est inconnue.
+def lireRegistre(chemin, debut=None, fin=None):
+    vue = projeterRegistre(chemin)
+    position = len(entete) if debut == None else debut
+    limite = len(vue) if fin == None else fin
+
+    while position < limite:
+        bornes = lireLongueur(vue, position, limite)
+        if bornes == None:
+            yield {"gagne": False, "graine": None, "donne": vue[0:0],
+                   "evenements": vue[0:0], "tronque": True}
+            return
+        position, finEnregistrement = bornes
+        drapeaux = vue[position]
+        graine = None
+        if drapeaux & drapeauGraine:
+            graine = int.from_bytes(vue[position + 1:position + 9], "little")
+        yield {"gagne": drapeaux & drapeauGagne != 0, "graine": graine,
+               "donne": vue[position + 9:position + tailleFixe],
+               "evenements": vue[position + tailleFixe:finEnregistrement],
+               "tronque": False}
+        position = finEnregistrement
+
+
+# La fonction decouperRegistre renvoie les tranches (debut, fin) d'un fichier
+# registre qui contiennent chacune nombreParTranche enregistrements (moins
+# pour la dernière). Seules les longueurs des enregistrements sont lues. Un
+# enregistrement tronqué (voir lireLongueur) termine la dernière tranche à la
+# fin du fichier, pour que lireRegistre le signale.
+def decouperRegistre(chemin, nombreParTranche):
+    vue = projeterRegistre(chemin)
+    tranches = []
+    debut = len(entete)
+    position = debut
+    nombre = 0
+    while position < len(vue):
+        bornes = lireLongueur(vue, position, len(vue))
+        position = len(vue) if bornes == None else bornes[1]
+        nombre += 1
+        if nombre == nombreParTranche:
+            tranches.append((debut, position))
+            debut = position
+            nombre = 0
+    if nombre > 0:
+        tranches.append((debut, position))
+    return tranches
+
+
+# La fonction lireEvenements produit les événements d'un enregistrement:
+# ("coup", i) pour un coup et ("brassage", cartes) pour un brassage.
+def lireEvenements(enregistrement):
+    evenements = enregistrement["evenements"]
+    position = 0
+    while position < len(evenements):
+        code = evenements[position]
+        if code == codeBrassage:
+            k = evenements[position + 1]
+            yield "brassage", evenements[position + 2:position + 2 + k]
+            position += 2 + k
+        else:
+            yield "coup", code
+            position += 1
+
+
+###############################################################################
+
+# La fonction rejouer reconstruit la partie d'un enregistrement après ses n
+# premiers événements (tous par défaut), avec jouerCoup et brasserPartie.
+def rejouer(enregistrement, n=None):
+    partie = creerPartie(list(enregistrement["donne"]))
+    for evenement, valeur in lireEvenements(enregistrement):
+        if n != None and n <= 0:
+            break
+        if evenement == "coup":
+            jouerCoup(partie, valeur)
+        else:
+            brasserPartie(partie, list(valeur))
+        if n != None:
+            n -= 1
+    return partie
+
+
+###############################################################################
+
+# La procédure principale enregistre des parties jouées au hasard par le
+# simulateur, compare la taille du registre à celle des mêmes parties en JSON
+# et avec pickle, puis mesure la vitesse de lecture et de reconstruction des
+# parties.
+def principal(nombreParties=20000):
+    from simulateur import jouerPartie
+
+    debut = time.perf_counter()
+    registre = bytearray(entete)
+    resultats = []
+    for k in range(nombreParties):
+        resultats.append(jouerPartie(0, k, "aleatoire", registre))
+    dureeEcriture = time.perf_counter() - debut
+
+    chemin = os.path.join(tempfile.mkdtemp(), "parties.asr")
+    with open(chemin, "wb") as fichier:
+        fichier.write(registre)
+    taille = os.path.getsize(chemin)
+
+    # Les mêmes parties en JSON et avec pickle (graine, donne, gagne et la
+    # liste des événements).
+    objets = []
+    for enregistrement in lireRegistre(chemin):
+        objets.append({"graine": enregistrement["graine"],
+                       "donne": list(enregistrement["donne"]),
+                       "gagne": enregistrement["gagne"],
+                       "evenements": [[e, v if e == "coup" else list(v)] \
+                       for e, v in lireEvenements(enregistrement)]})
+    tailleJson = len(json.dumps(objets).encode("utf-8"))
+    taillePickle = len(pickle.dumps(objets, pickle.HIGHEST_PROTOCOL))
+
+    debut = time.perf_counter()
+    nombre = 0
+    for enregistrement in lireRegistre(chemin):
+        nombre += 1
+    dureeLecture = time.perf_counter() - debut
+
+    # On reconstruit chaque partie et on vérifie qu'elle finit comme celle
+    # qui a été jouée.
+    debut = time.perf_counter()
+    k = 0
+    for enregistrement in lireRegistre(chemin):
+        partie = rejouer(enregistrement)
+        assert partie["gagnerCondition"] == enregistrement["gagne"] == \
+        resultats[k]["gagne"]
+        assert sum(partie["prefixes"]) == resultats[k]["ordonnees"]
+        k += 1
+    dureeRejeu = time.perf_counter() - debut
+    os.remove(chemin)
+
+    print("Registre de " + str(nombreParties) + " parties")
+    print("  registre: %10d octets (%6.1f par partie)" % (taille,
+          taille / nombreParties))
+    print("  JSON    : %10d octets (%5.1fx)" % (tailleJson,
+          tailleJson / taille))
+    print("  pickle  : %10d octets (%5.1fx)" % (taillePickle,
+          taillePickle / taille))
+    print("  simulation et écriture: %10.0f parties/s" % (
+          nombreParties / dureeEcriture))
+    print("  lecture               : %10.0f parties/s" % (
+          nombre / dureeLecture))
+    print("  reconstruction        : %10.0f parties/s" % (
+          nombreParties / dureeRejeu))
+
+
+if __name__ == "__main__":
+    principal(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,413 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme est un serveur HTTP (asyncio, sans module externe) qui héberge
+# des parties d'"Addiction Solitaire" pour plusieurs joueurs à la fois. Les
+# règles sont celles du moteur de main.py. Les réponses sont en JSON:
+#
+#   POST /partie[?graine=N]         nouvelle partie: "session", "jeu" (les 52
+#                                   cartes) et l'état de la partie;
+#   POST /partie/SESSION/move/I     déplace la carte de la case I (voir move);
+#   POST /partie/SESSION/shuffle    brasse les cartes (voir shuffle);
+#   GET  /metriques                 sessions et latences des actions.
+#
+# Après un coup ou un brassage, seules les cases qui ont changé sont envoyées
+# ("cases": {case: carte}), avec les cartes vertes ("enVert"), les brassages
+# restants ("compteurBrasser") et l'état de la partie ("etat", voir
+# etatPartie). Les connexions restent ouvertes d'une requête à l'autre.
+#
+# Chaque session ne garde que l'essentiel de sa partie: les 52 cartes (52
+# octets), les brassages restants, l'état du flux aléatoire et l'heure de sa
+# dernière action. La partie est reconstruite (creerPartie) le temps d'une
+# action. Les sessions inactives depuis plus de delaiInactivite secondes sont
+# supprimées.
+#
+# Utilisation: python serveur.py [--port 8080]
+#              python serveur.py --charge [--clients 1000] [--actions 20]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+import time
+
+from main import brasserPartie, creerPartie, estCoupLegal, etatPartie, \
+fluxAleatoire, formatJeu, jouerCoup, nouvellePartie, tirerIndice
+
+
+###############################################################################
+
+# Délai (en secondes) après lequel une session inactive est supprimée, et
+# période de la recherche des sessions inactives.
+delaiInactivite = 600
+periodeEviction = 10
+
+# Nombre maximal de latences gardées par action pour les métriques.
+latencesGardees = 100000
+
+
+###############################################################################
+
+# La fonction creerServeur renvoie l'état d'un serveur: ses sessions (par
+# identifiant) et les dernières latences (en secondes) de chaque action.
+def creerServeur(delai=delaiInactivite):
+    return {"sessions": {}, "delaiInactivite": delai, "evictions": 0,
+            "latences": {"partie": [], "move": [], "shuffle": []}}
+
+
+# La fonction chargerPartie reconstruit la partie d'une session. La
+# procédure sauverPartie garde dans la session ce qui a changé.
+def chargerPartie(session):
+    return creerPartie(list(session["jeu"]), session["compteurBrasser"],
+                       session["flux"])
+
+
+def sauverPartie(session, partie):
+    session["jeu"] = bytes(partie["jeu"])
+    session["compteurBrasser"] = partie["compteurBrasser"]
+    session["vu"] = time.monotonic()
+
+
+# La fonction etatClient renvoie ce que le client doit savoir d'une partie en
+# plus de ses cartes.
+def etatClient(partie):
+    return {"enVert": partie["enVert"],
+            "compteurBrasser": partie["compteurBrasser"],
+            "etat": etatPartie(partie)}
+
+
+# La fonction casesChangees renvoie les cases dont la carte a changé entre
+# l'ancien jeu (un octet par case) et le nouveau.
+def casesChangees(ancien, jeu):
+    couleurs, valeurs = formatJeu()
+    cases = {}
+    for i in range(couleurs * valeurs):
+        if ancien[i] != jeu[i]:
+            cases[i] = jeu[i]
+    return cases
+
+
+###############################################################################
+
+# Les fonctions suivantes sont les actions du serveur. Elles renvoient le
+# code de statut HTTP et l'objet JSON de la réponse.
+
+# La fonction actionPartie crée une nouvelle session, avec une graine tirée
+# au hasard si elle n'est pas donnée.
+def actionPartie(serveur, graine=None):
+    if graine == None:
+        graine = secrets.randbits(64)
+    partie = nouvellePartie(graine)
+
+    identifiant = secrets.token_hex(8)
+    session = {"flux": partie["flux"]}
+    sauverPartie(session, partie)
+    serveur["sessions"][identifiant] = session
+
+    reponse = {"session": identifiant, "jeu": partie["jeu"]}
+    reponse.update(etatClient(partie))
+    return 200, reponse
+
+
+# La fonction actionMove déplace la carte de la case i d'une session, si elle
+# est verte.
+def actionMove(serveur, session, i):
+    partie = chargerPartie(session)
+    if not estCoupLegal(partie, i):
+        return 409, {"erreur": "coup illégal"}
+    ancien = session["jeu"]
+    jouerCoup(partie, i)
+    sauverPartie(session, partie)
+
+    reponse = {"cases": casesChangees(ancien, partie["jeu"])}
+    reponse.update(etatClient(partie))
+    return 200, reponse
+
+
+# La fonction actionShuffle brasse les cartes d'une session, s'il lui reste
+# des brassages et que la partie n'est pas gagnée.
+def actionShuffle(serveur, session):
+    partie = chargerPartie(session)
+    if partie["compteurBrasser"] == 0 or partie["gagnerCondition"]:
+        return 409, {"erreur": "brassage interdit"}
+    ancien = session["jeu"]
+    brasserPartie(partie)
+    sauverPartie(session, partie)
+
+    reponse = {"cases": casesChangees(ancien, partie["jeu"])}
+    reponse.update(etatClient(partie))
+    return 200, reponse
+
+
+###############################################################################
+
+# La fonction percentile renvoie le percentile p (de 0 à 100) d'un tableau de
+# valeurs triées.
+def percentile(valeurs, p):
+    if len(valeurs) == 0:
+        return 0.0
+    return valeurs[min(len(valeurs) - 1, len(valeurs) * p // 100)]
+
+
+# La fonction resumerLatences renvoie le nombre de mesures et les latences
+# p50, p99 et maximale (en millisecondes) de chaque action.
+def resumerLatences(latences):
+    resume = {}
+    for action in latences:
+        valeurs = sorted(latences[action])
+        resume[action] = {"nombre": len(valeurs),
+                          "p50": 1000 * percentile(valeurs, 50),
+                          "p99": 1000 * percentile(valeurs, 99),
+                          "max": 1000 * (valeurs[-1] if valeurs else 0.0)}
+    return resume
+
+
+# La procédure noterLatence ajoute une latence aux métriques d'une action, en
+# oubliant les plus anciennes au-delà de latencesGardees.
+def noterLatence(latences, action, duree):
+    valeurs = latences[action]
+    valeurs.append(duree)
+    if len(valeurs) > 2 * latencesGardees:
+        del valeurs[:latencesGardees]
+
+
+###############################################################################
+
+# La fonction estEntier renvoie True si le texte est un entier positif écrit
+# avec les chiffres 0 à 9. La méthode isdigit seule accepte aussi d'autres
+# chiffres Unicode (par exemple "²") que int refuse.
+def estEntier(texte):
+    return texte.isascii() and texte.isdigit()
+
+
+# La fonction traiterRequete exécute une requête HTTP (méthode et chemin) et
+# renvoie le code de statut et l'objet JSON de la réponse.
+def traiterRequete(serveur, methode, chemin):
+    debut = time.perf_counter()
+    chemin, _, requete = chemin.partition("?")
+    parties = chemin.strip("/").split("/")
+
+    if methode == "GET" and parties == ["metriques"]:
+        return 200, {"sessions": len(serveur["sessions"]),
+                     "evictions": serveur["evictions"],
+                     "latences": resumerLatences(serveur["latences"])}
+    if methode != "POST" or parties[0] != "partie":
+        return 404, {"erreur": "adresse inconnue"}
+
+    if len(parties) == 1:
+        action = "partie"
+        graine = None
+        for parametre in requete.split("&"):
+            cle, _, valeur = parametre.partition("=")
+            if cle == "graine" and estEntier(valeur):
+                graine = int(valeur)
+        statut, reponse = actionPartie(serveur, graine)
+    else:
+        session = serveur["sessions"].get(parties[1])
+        if session == None:
+            return 404, {"erreur": "session inconnue"}
+        couleurs, valeurs = formatJeu()
+        if len(parties) == 4 and parties[2] == "move" and \
+        estEntier(parties[3]) and int(parties[3]) < couleurs * valeurs:
+            action = "move"
+            statut, reponse = actionMove(serveur, session, int(parties[3]))
+        elif len(parties) == 3 and parties[2] == "shuffle":
+            action = "shuffle"
+            statut, reponse = actionShuffle(serveur, session)
+        else:
+            return 404, {"erreur": "action inconnue"}
+
+    noterLatence(serveur["latences"], action, time.perf_counter() - debut)
+    return statut, reponse
+
+
+# La fonction servirClient traite les requêtes d'une connexion, une à la
+# fois, jusqu'à ce que le client la ferme.
+async def servirClient(serveur, lecteur, ecrivain):
+    try:
+        while True:
+            ligne = await lecteur.readline()
+            if not ligne:
+                break
+            methode, chemin, _ = ligne.decode("latin-1").split(" ", 2)
+
+            # On lit les en-têtes; le corps de la requête n'est pas utilisé.
+            longueur = 0
+            fermer = False
+            while True:
+                entete = await lecteur.readline()
+                if entete in (b"\r\n", b"\n", b""):
+                    break
+                nom, _, valeur = entete.decode("latin-1").partition(":")
+                nom = nom.strip().lower()
+                if nom == "content-length":
+                    longueur = int(valeur)
+                elif nom == "connection" and valeur.strip().lower() == \
+                "close":
+                    fermer = True
+            if longueur > 0:
+                await lecteur.readexactly(longueur)
+
+            statut, reponse = traiterRequete(serveur, methode, chemin)
+            corps = json.dumps(reponse).encode("utf-8")
+            ecrivain.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json"
+                           b"\r\nContent-Length: %d\r\n\r\n" % (statut,
+                           b"OK" if statut == 200 else b"Error",
+                           len(corps)) + corps)
+            await ecrivain.drain()
+            if fermer:
+                break
+    except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        ecrivain.close()
+
+
+# La procédure evincer supprime périodiquement les sessions inactives.
+async def evincer(serveur, periode=periodeEviction):
+    while True:
+        await asyncio.sleep(periode)
+        limite = time.monotonic() - serveur["delaiInactivite"]
+        sessions = serveur["sessions"]
+        inactives = [identifiant for identifiant in sessions \
+        if sessions[identifiant]["vu"] < limite]
+        for identifiant in inactives:
+            del sessions[identifiant]
+        serveur["evictions"] += len(inactives)
+
+
+# La fonction demarrerServeur démarre le serveur et la recherche des sessions
+# inactives, et renvoie le serveur asyncio et la tâche d'éviction.
+async def demarrerServeur(serveur, hote="127.0.0.1", port=8080):
+    serveurHttp = await asyncio.start_server(
+        lambda lecteur, ecrivain: servirClient(serveur, lecteur, ecrivain),
+        hote, port, limit=1 << 16, backlog=4096)
+    eviction = asyncio.create_task(evincer(serveur))
+    return serveurHttp, eviction
+
+
+###############################################################################
+
+# La fonction requete envoie une requête au serveur sur une connexion ouverte
+# et renvoie le code de statut et l'objet JSON de la réponse.
+async def requete(lecteur, ecrivain, methode, chemin):
+    ecrivain.write(("%s %s HTTP/1.1\r\nHost: localhost\r\n\r\n" % (methode,
+                   chemin)).encode("latin-1"))
+    await ecrivain.drain()
+    statut = int((await lecteur.readline()).split(b" ")[1])
+    longueur = 0
+    while True:
+        entete = await lecteur.readline()
+        if entete in (b"\r\n", b""):
+            break
+        nom, _, valeur = entete.partition(b":")
+        if nom.lower() == b"content-length":
+            longueur = int(valeur)
+    return statut, json.loads(await lecteur.readexactly(longueur))
+
+
+# La procédure jouerClient est un joueur du générateur de charge: il joue des
+# parties au hasard (une carte verte au hasard, un brassage quand il est
+# bloqué) jusqu'à avoir fait nombreActions actions, et note la latence de
+# chaque action vue par le client.
+async def jouerClient(hote, port, nombreActions, latences, graine):
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    flux = fluxAleatoire(graine)
+    etat = None
+    actions = 0
+    try:
+        while actions < nombreActions:
+            debut = time.perf_counter()
+            if etat == "enCours":
+                i = enVert[tirerIndice(flux, len(enVert))]
+                action = "move"
+                statut, reponse = await requete(lecteur, ecrivain, "POST",
+                    "/partie/" + session + "/move/" + str(i))
+            elif etat == "brasser":
+                action = "shuffle"
+                statut, reponse = await requete(lecteur, ecrivain, "POST",
+                    "/partie/" + session + "/shuffle")
+            else:
+                action = "partie"
+                statut, reponse = await requete(lecteur, ecrivain, "POST",
+                                                "/partie")
+                session = reponse["session"]
+            noterLatence(latences, action, time.perf_counter() - debut)
+            assert statut == 200, reponse
+            enVert = reponse["enVert"]
+            etat = reponse["etat"]
+            actions += 1
+    finally:
+        ecrivain.close()
+
+
+# La fonction charge démarre un serveur et nombreClients joueurs simultanés
+# (chacun sur sa connexion), et renvoie les latences vues par les clients,
+# les métriques du serveur et le débit (actions par seconde).
+async def charge(nombreClients, nombreActions, port=8080):
+    serveur = creerServeur()
+    serveurHttp, eviction = await demarrerServeur(serveur, "127.0.0.1", port)
+    latences = {"partie": [], "move": [], "shuffle": []}
+
+    debut = time.perf_counter()
+    await asyncio.gather(*[jouerClient("127.0.0.1", port, nombreActions,
+                                       latences, k) \
+                           for k in range(nombreClients)])
+    duree = time.perf_counter() - debut
+
+    sessions = len(serveur["sessions"])
+    memoire = sum(sys.getsizeof(session) + sys.getsizeof(session["jeu"]) + \
+    sys.getsizeof(session["flux"]) for session in \
+    serveur["sessions"].values())
+    eviction.cancel()
+    serveurHttp.close()
+    await serveurHttp.wait_closed()
+    return {"clients": resumerLatences(latences),
+            "serveur": resumerLatences(serveur["latences"]),
+            "actionsParSeconde": nombreClients * nombreActions / duree,
+            "sessions": sessions,
+            "octetsParSession": memoire / sessions if sessions > 0 else 0}
+
+
+###############################################################################
+
+def principal():
+    analyseur = argparse.ArgumentParser(description="Serveur de parties "
+                                        "d'Addiction Solitaire.")
+    analyseur.add_argument("--hote", default="127.0.0.1")
+    analyseur.add_argument("--port", type=int, default=8080)
+    analyseur.add_argument("--charge", action="store_true",
+                           help="lancer le générateur de charge")
+    analyseur.add_argument("--clients", type=int, default=1000)
+    analyseur.add_argument("--actions", type=int, default=20)
+    arguments = analyseur.parse_args()
+
+    if not arguments.charge:
+        async def servir():
+            serveurHttp, eviction = await demarrerServeur(creerServeur(),
+                arguments.hote, arguments.port)
+            async with serveurHttp:
+                await serveurHttp.serve_forever()
+        asyncio.run(servir())
+        return
+
+    resultat = asyncio.run(charge(arguments.clients, arguments.actions,
+                                  arguments.port))
+    print("%d clients, %d actions chacun: %.0f actions/s, %d sessions "
+          "(%.0f octets par session)" % (arguments.clients,
+          arguments.actions, resultat["actionsParSeconde"],
+          resultat["sessions"], resultat["octetsParSession"]))
+    for cote in ["clients", "serveur"]:
+        for action, mesures in resultat[cote].items():
+            print("  %-7s %-7s %7d  p50 %7.2f ms  p99 %7.2f ms  "
+                  "max %7.2f ms" % (cote, action, mesures["nombre"],
+                  mesures["p50"], mesures["p99"], mesures["max"]))
+
+
+if __name__ == "__main__":
+    principal()
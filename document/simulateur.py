@@ -0,0 +1,346 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme estime le taux de victoire du jeu "Addiction Solitaire" (avec
+# 3 brassages) en jouant un grand nombre de parties avec le moteur de jeu de
+# main.py. Trois façons de jouer (politiques) sont offertes:
+#   "aleatoire": on déplace une carte verte choisie au hasard;
+#   "glouton": on déplace la carte qui allonge le plus les rangées ordonnées;
+#   "solveur": au début de chaque brassage, on cherche une suite gagnante
+#              avec le solveur et on joue comme le glouton s'il n'y en a pas.
+#
+# La partie numéro k d'une simulation utilise toujours la même graine, et les
+# parties sont regroupées en lots de taille fixe. Les statistiques ne
+# dépendent donc ni du nombre de processus ni de l'ordre dans lequel les lots
+# se terminent.
+#
+# Avec l'option --registre, chaque partie est aussi enregistrée (donne,
+# brassages et coups) dans un fichier registre (voir registres.py), dans
+# l'ordre des parties. Avec l'option --cache, les analyses du solveur sont
+# gardées dans un fichier d'analyses (voir analyses.py), partagé par les
+# processus et réutilisé d'une simulation à l'autre. Avec l'option --mesures,
+# les fonctions de main.py comptent leurs appels et mesurent leur durée (voir
+# activerMesures), et les mesures de tous les processus sont écrites en JSON.
+#
+# Utilisation: python simulateur.py --parties 1000000 --politique aleatoire
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import argparse
+import json
+import multiprocessing
+import time
+
+from analyses import ouvrirCache, resoudreAvecCache, statistiquesCache
+from main import activerMesures, brasserPartie, copierPartie, \
+desactiverMesures, etatPartie, fluxAleatoire, jouerCoup, nouvellePartie, \
+rapportMesures, reinitialiserMesures, tirerIndice
+from plateau import cleJeu
+from registres import encoderEnregistrement, noterBrassage, noterCoup, \
+nouvelEnregistrement, ouvrirRegistre
+from solveur import creerTable, resoudre
+
+
+###############################################################################
+
+# Nombre maximal de coups joués entre deux brassages. Certaines positions ne
+# permettent que de faire tourner des 2 entre les cases vides de la première
+# colonne; le joueur doit alors brasser les cartes (ou abandonner).
+limiteCoups = 1000
+
+# Nombre maximal de noeuds explorés par le solveur à chaque brassage.
+limiteNoeudsSolveur = 20000
+
+politiques = ["aleatoire", "glouton", "solveur"]
+
+# Caches d'analyses ouverts par le processus, par chemin de fichier.
+cachesOuverts = {}
+
+
+###############################################################################
+
+# La fonction graineDonne renvoie la graine de la partie numéro k d'une
+# simulation lancée avec la graine graine.
+def graineDonne(graine, k):
+    return (graine << 32) + k
+
+
+# La fonction longueurOrdonnee renvoie le nombre de cartes bien placées d'une
+# partie, soit les cartes qui ne seraient pas brassées.
+def longueurOrdonnee(partie):
+    return sum(partie["prefixes"])
+
+
+# La fonction horlogeMillisecondes renvoie l'heure en millisecondes, pour les
+# mesures des fonctions de main.py.
+def horlogeMillisecondes():
+    return time.perf_counter() * 1000
+
+
+# La fonction cacheProcessus renvoie le cache d'analyses d'un fichier, ouvert
+# une seule fois par processus.
+def cacheProcessus(chemin):
+    if chemin not in cachesOuverts:
+        cachesOuverts[chemin] = ouvrirCache(chemin)
+    return cachesOuverts[chemin]
+
+
+# La fonction ligneSolveur renvoie la suite de coups gagnante trouvée par le
+# solveur pour une partie (vide s'il n'y en a pas), en passant par le cache
+# d'analyses s'il y en a un.
+def ligneSolveur(partie, table, cache=None):
+    if cache != None:
+        resultat = resoudreAvecCache(cache, partie, limiteNoeudsSolveur, table)
+    else:
+        resultat = resoudre(partie, limiteNoeudsSolveur, table)
+    return list(resultat["coups"] or [])
+
+
+###############################################################################
+
+# La fonction coupGlouton renvoie la carte verte qui, une fois déplacée, donne
+# le plus de cartes bien placées sans revenir à un jeu déjà vu depuis le
+# dernier brassage. Elle renvoie None si tous les coups mènent à un jeu déjà
+# vu.
+def coupGlouton(partie, dejaVus):
+    meilleurCoup = None
+    meilleurScore = -1
+    for i in partie["enVert"]:
+        # On joue le coup sur une copie de la partie.
+        essai = copierPartie(partie)
+        jouerCoup(essai, i)
+        if cleJeu(essai["jeu"]) in dejaVus:
+            continue
+        score = longueurOrdonnee(essai)
+        if score > meilleurScore:
+            meilleurCoup = i
+            meilleurScore = score
+    return meilleurCoup
+
+
+###############################################################################
+
+# La fonction jouerPartie joue la partie numéro k avec une politique et
+# renvoie un dictionnaire qui contient le résultat de la partie: "gagne",
+# "coups" (le nombre de coups joués), "brassages" (le nombre de brassages
+# utilisés) et "ordonnees" (le nombre de cartes bien placées à la fin). Si un
+# registre (bytearray) est donné, l'enregistrement de la partie y est ajouté.
+# Si un cache d'analyses est donné, le solveur y cherche ses analyses.
+def jouerPartie(graine, k, politique, registre=None, cache=None):
+    partie = nouvellePartie(graineDonne(graine, k))
+    fluxPolitique = fluxAleatoire(~graineDonne(graine, k))
+    table = creerTable(16) if politique == "solveur" else None
+    enregistrement = None
+    if registre != None:
+        enregistrement = nouvelEnregistrement(partie, graineDonne(graine, k))
+
+    coups = 0
+    coupsBrassage = 0
+    dejaVus = {cleJeu(partie["jeu"])}
+    ligne = []
+    if politique == "solveur":
+        ligne = ligneSolveur(partie, table, cache)
+
+    while True:
+        etat = etatPartie(partie)
+        i = None
+        if etat == "enCours" and coupsBrassage < limiteCoups:
+            if len(ligne) > 0:
+                i = ligne.pop(0)
+            elif politique == "aleatoire":
+                enVert = partie["enVert"]
+                i = enVert[tirerIndice(fluxPolitique, len(enVert))]
+            else:
+                i = coupGlouton(partie, dejaVus)
+
+        if i != None:
+            jouerCoup(partie, i)
+            if enregistrement != None:
+                noterCoup(enregistrement, i)
+            coups += 1
+            coupsBrassage += 1
+            if politique != "aleatoire":
+                dejaVus.add(cleJeu(partie["jeu"]))
+
+        # Le joueur est bloqué: il brasse les cartes s'il le peut.
+        elif etat != "gagne" and partie["compteurBrasser"] > 0:
+            cases = brasserPartie(partie)
+            if enregistrement != None:
+                noterBrassage(enregistrement, partie, cases)
+            coupsBrassage = 0
+            dejaVus = {cleJeu(partie["jeu"])}
+            if politique == "solveur":
+                ligne = ligneSolveur(partie, table, cache)
+
+        else:
+            break
+
+    if enregistrement != None:
+        registre += encoderEnregistrement(enregistrement,
+                                          partie["gagnerCondition"])
+    return {"gagne": partie["gagnerCondition"], "coups": coups,
+            "brassages": 3 - partie["compteurBrasser"],
+            "ordonnees": longueurOrdonnee(partie)}
+
+
+###############################################################################
+
+# La fonction statistiquesVides renvoie des statistiques sans parties. La
+# procédure ajouterStatistiques ajoute les statistiques b à celles de a. Comme
+# on ne fait que des sommes, l'ordre des ajouts ne change pas le résultat.
+# Les analyses comptent les appels au solveur, dont analysesEnCache ont été
+# trouvés dans le cache d'analyses. Les mesures sont celles des fonctions de
+# main.py (voir rapportMesures), si elles sont actives.
+def statistiquesVides():
+    return {"parties": 0, "victoires": 0, "coups": 0, "ordonnees": 0,
+            "victoiresParBrassages": [0, 0, 0, 0], "analyses": 0,
+            "analysesEnCache": 0, "noeudsEconomises": 0, "mesures": {}}
+
+
+def ajouterStatistiques(a, b):
+    a["parties"] += b["parties"]
+    a["victoires"] += b["victoires"]
+    a["coups"] += b["coups"]
+    a["ordonnees"] += b["ordonnees"]
+    a["analyses"] += b["analyses"]
+    a["analysesEnCache"] += b["analysesEnCache"]
+    a["noeudsEconomises"] += b["noeudsEconomises"]
+    for n in range(4):
+        a["victoiresParBrassages"][n] += b["victoiresParBrassages"][n]
+    for nom, mesure in b["mesures"].items():
+        if nom in a["mesures"]:
+            a["mesures"][nom]["appels"] += mesure["appels"]
+            a["mesures"][nom]["ms"] += mesure["ms"]
+            a["mesures"][nom]["msMax"] = max(a["mesures"][nom]["msMax"],
+                                             mesure["msMax"])
+        else:
+            a["mesures"][nom] = dict(mesure)
+
+
+# La fonction jouerLot joue les parties debut à fin - 1 et renvoie leurs
+# statistiques, ainsi que leurs enregistrements (ou None si on ne les
+# enregistre pas). Elle est appelée par les processus de la simulation.
+def jouerLot(lot):
+    graine, debut, fin, politique, enregistrer, cheminCache, mesurer = lot
+    statistiques = statistiquesVides()
+    if mesurer:
+        activerMesures(horlogeMillisecondes)
+        reinitialiserMesures()
+    registre = bytearray() if enregistrer else None
+    cache = None
+    if cheminCache != None:
+        cache = cacheProcessus(cheminCache)
+        avant = statistiquesCache(cache)
+
+    for k in range(debut, fin):
+        resultat = jouerPartie(graine, k, politique, registre, cache)
+        statistiques["parties"] += 1
+        statistiques["coups"] += resultat["coups"]
+        statistiques["ordonnees"] += resultat["ordonnees"]
+        if resultat["gagne"]:
+            statistiques["victoires"] += 1
+            statistiques["victoiresParBrassages"][resultat["brassages"]] += 1
+
+    if cache != None:
+        apres = statistiquesCache(cache)
+        statistiques["analyses"] = apres["consultations"] - \
+        avant["consultations"]
+        statistiques["analysesEnCache"] = apres["succesMemoire"] + \
+        apres["succesDisque"] - avant["succesMemoire"] - avant["succesDisque"]
+        statistiques["noeudsEconomises"] = apres["noeudsEconomises"] - \
+        avant["noeudsEconomises"]
+    if mesurer:
+        statistiques["mesures"] = rapportMesures()["fonctions"]
+        desactiverMesures()
+    return statistiques, registre
+
+
+###############################################################################
+
+# La fonction simuler joue nombreParties parties avec une politique, réparties
+# en lots de tailleLot parties entre plusieurs processus. Elle produit les
+# statistiques cumulées après chaque lot, dans l'ordre des lots. Si un chemin
+# de registre est donné, les parties y sont enregistrées au fil des lots. Si
+# un chemin de cache est donné, le solveur y garde ses analyses. Si mesurer
+# est True, les statistiques contiennent les mesures des fonctions de main.py.
+def simuler(nombreParties, politique="aleatoire", graine=0, processus=None, \
+tailleLot=1000, registre=None, cache=None, mesurer=False):
+    lots = [(graine, debut, min(debut + tailleLot, nombreParties), politique,
+             registre != None, cache, mesurer) for debut in \
+            range(0, nombreParties, tailleLot)]
+    statistiques = statistiquesVides()
+    fichier = ouvrirRegistre(registre) if registre != None else None
+
+    pool = None
+    try:
+        if processus == 1:
+            resultats = map(jouerLot, lots)
+        else:
+            pool = multiprocessing.Pool(processus)
+            resultats = pool.imap(jouerLot, lots)
+        for resultat, octets in resultats:
+            ajouterStatistiques(statistiques, resultat)
+            if fichier != None:
+                fichier.write(octets)
+            yield statistiques
+    finally:
+        if pool != None:
+            pool.terminate()
+        if fichier != None:
+            fichier.close()
+
+
+# La fonction formaterStatistiques renvoie une ligne de texte qui résume les
+# statistiques (et celles du cache d'analyses, s'il a servi).
+def formaterStatistiques(statistiques):
+    n = max(statistiques["parties"], 1)
+    texte = "%9d parties  victoires %6.3f%%  coups/partie %6.1f  " \
+    "cartes ordonnées %5.2f  victoires par brassages %s" % (
+        statistiques["parties"], 100 * statistiques["victoires"] / n,
+        statistiques["coups"] / n, statistiques["ordonnees"] / n,
+        statistiques["victoiresParBrassages"])
+    if statistiques["analyses"] > 0:
+        texte += "  cache %d/%d analyses (%d noeuds économisés)" % (
+            statistiques["analysesEnCache"], statistiques["analyses"],
+            statistiques["noeudsEconomises"])
+    return texte
+
+
+###############################################################################
+
+def principal():
+    analyseur = argparse.ArgumentParser(description="Simulation de parties "
+                                        "d'Addiction Solitaire.")
+    analyseur.add_argument("--parties", type=int, default=10000)
+    analyseur.add_argument("--politique", choices=politiques,
+                           default="aleatoire")
+    analyseur.add_argument("--graine", type=int, default=0)
+    analyseur.add_argument("--processus", type=int, default=None)
+    analyseur.add_argument("--lot", type=int, default=1000)
+    analyseur.add_argument("--registre", default=None)
+    analyseur.add_argument("--cache", default=None,
+                           help="fichier d'analyses du solveur")
+    analyseur.add_argument("--mesures", default=None,
+                           help="fichier où écrire les mesures (JSON)")
+    arguments = analyseur.parse_args()
+
+    debut = time.perf_counter()
+    for statistiques in simuler(arguments.parties, arguments.politique,
+                                arguments.graine, arguments.processus,
+                                arguments.lot, arguments.registre,
+                                arguments.cache,
+                                arguments.mesures != None):
+        duree = time.perf_counter() - debut
+        print(formaterStatistiques(statistiques) + "  (%.0f parties/s)" %
+              (statistiques["parties"] / duree), flush=True)
+
+    if arguments.mesures != None:
+        with open(arguments.mesures, "w") as fichier:
+            json.dump({"fonctions": statistiques["mesures"]}, fichier,
+                      indent=2)
+
+
+if __name__ == "__main__":
+    principal()
@@ -0,0 +1,277 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce module contient un solveur exhaustif pour le jeu "Addiction Solitaire".
+# À partir d'une partie, il cherche une suite de coups qui ordonne toutes les
+# cartes sans brasser le jeu, soit avant le prochain brassage obligatoire. Le
+# résultat d'un brassage étant aléatoire, le solveur ne peut pas prévoir au
+# delà. Il permet de savoir si le joueur a perdu à cause de ses coups ou à
+# cause de la donne.
+#
+# Plusieurs ordres de coups mènent au même jeu. Le solveur garde donc une
+# table de transposition des jeux déjà explorés sans succès. Chaque jeu est
+# identifié par un hachage de Zobrist mis à jour à chaque coup. La table a une
+# taille fixe (une case de 8 octets par entrée) et une nouvelle entrée
+# remplace toujours l'ancienne qui occupait la même case.
+#
+# Utilisation: python solveur.py [nombreDonnes] [limiteNoeuds] [couleurs]
+#                                [valeurs]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import array
+import random
+import sys
+import time
+
+from main import calculerPrefixes, choisirFormat, destinationCoup, \
+formatJeu, listerVerts, majTrous, nouvellePartie
+
+
+###############################################################################
+
+# Clés de Zobrist: un nombre aléatoire de 64 bits pour chaque carte à chaque
+# case. Le hachage d'un jeu est le ou exclusif des clés de toutes ses cartes.
+# Les clés sont tirées d'une graine fixe pour que les hachages soient les
+# mêmes d'une exécution à l'autre. Elles sont tirées de nouveau quand le
+# nombre de cartes du jeu change (voir choisirFormat); les clés du jeu
+# standard sont toujours les mêmes.
+clesZobrist = []
+
+
+# La procédure preparerCles tire les clés de Zobrist du format actuel du jeu,
+# si ce n'est pas déjà fait.
+def preparerCles():
+    global clesZobrist
+
+    couleurs, valeurs = formatJeu()
+    nombreCartes = couleurs * valeurs
+    if len(clesZobrist) != nombreCartes:
+        generateurCles = random.Random(0x5EED)
+        clesZobrist = [[generateurCles.getrandbits(64) for case in \
+        range(nombreCartes)] for carte in range(nombreCartes)]
+
+
+preparerCles()
+
+
+# La fonction hacherJeu renvoie le hachage de Zobrist d'un jeu de carte.
+def hacherJeu(jeu):
+    preparerCles()
+    h = 0
+    for i in range(len(jeu)):
+        h ^= clesZobrist[jeu[i]][i]
+    return h
+
+
+###############################################################################
+
+# La fonction creerTable renvoie une table de transposition vide ayant
+# 2**bits entrées. La fonction chercherTable indique si un hachage est dans
+# la table et compte les consultations et les succès. La procédure
+# enregistrerTable ajoute un hachage à la table en remplaçant l'entrée qui
+# occupait sa case.
+def creerTable(bits=20):
+    return {"entrees": array.array("Q", bytes(8 << bits)),
+            "masque": (1 << bits) - 1, "consultations": 0, "succes": 0}
+
+
+def chercherTable(table, h):
+    table["consultations"] += 1
+    if table["entrees"][h & table["masque"]] == h:
+        table["succes"] += 1
+        return True
+    return False
+
+
+def enregistrerTable(table, h):
+    table["entrees"][h & table["masque"]] = h
+
+
+###############################################################################
+
+# La fonction estGagnant renvoie True si toutes les cartes du jeu sont
+# ordonnées, soit si chaque rangée est ordonnée du 2 au roi (voir
+# testerProgression).
+def estGagnant(jeu):
+    couleurs, valeurs = formatJeu()
+    return calculerPrefixes(jeu) == [valeurs - 1] * couleurs
+
+
+###############################################################################
+
+# La fonction resoudre prend une partie en paramètre et cherche une suite de
+# coups gagnante sans brasser les cartes. La partie n'est pas modifiée. On
+# peut limiter le nombre de noeuds explorés (limiteNoeuds), réutiliser une
+# table de transposition entre plusieurs recherches du même jeu et arrêter la
+# recherche de l'extérieur avec un événement (arret, par exemple un
+# multiprocessing.Event), qui est consulté tous les 1024 noeuds. chemin est
+# l'ensemble des hachages des jeux qui mènent à la partie, quand la partie
+# fait partie d'une recherche plus grande (voir parallele.py): la recherche
+# ne revient pas sur ces jeux.
+#
+# Elle renvoie un dictionnaire qui contient:
+#   "gagnable": True si une suite gagnante existe, False si aucune n'existe
+#               et None si la limite de noeuds a été atteinte ou si la
+#               recherche a été arrêtée;
+#   "coups": les index des cartes à déplacer (comme pour move), ou None;
+#   "compteurBrasser": les brassages restants de la partie;
+#   "noeuds", "duree", "noeudsParSeconde": le travail de la recherche;
+#   "consultations", "succes", "tauxSucces": l'efficacité de la table;
+#   "coupsChemin", "restants": si gagnable est None, le travail qui reste:
+#               les coups qui mènent de la partie au jeu où la recherche a
+#               été interrompue et, pour la partie et chaque jeu de ce
+#               chemin, le rang (l'indice parmi les coups du jeu) du premier
+#               coup pas encore essayé et les coups pas encore essayés.
+def resoudre(partie, limiteNoeuds=None, table=None, arret=None, chemin=None):
+    if table == None:
+        table = creerTable()
+    consultationsDebut = table["consultations"]
+    succesDebut = table["succes"]
+
+    jeu = list(partie["jeu"])
+    positions = list(partie["positions"])
+    h = hacherJeu(jeu)
+
+    debut = time.perf_counter()
+    noeuds = 0
+    gagnable = False
+    coupsGagnants = None
+
+    if estGagnant(jeu):
+        gagnable = True
+        coupsGagnants = []
+
+    # La recherche en profondeur utilise une pile explicite. Chaque élément
+    # de la pile contient les coups possibles d'un jeu, l'index du prochain
+    # coup à essayer, ainsi que la carte qui peut aller dans chaque case vide
+    # et le nombre de rangées qui commencent par une case vide (voir
+    # calculerVerts). Le tableau coupsJoues contient les coups (i, j) qui
+    # mènent de la racine au jeu courant et l'ensemble chemin contient les
+    # hachages de ces jeux, pour éviter de tourner en rond.
+    pile = [[list(partie["enVert"]), 0, list(partie["vertsTrous"]),
+             partie["trousColonne1"]]]
+    coupsJoues = []
+    if chemin == None:
+        chemin = {h}
+    else:
+        chemin = set(chemin) | {h}
+
+    while len(pile) > 0 and not gagnable:
+        cadre = pile[-1]
+        coups = cadre[0]
+
+        # Tous les coups de ce jeu ont été essayés sans succès: on enregistre
+        # le jeu dans la table et on revient au jeu précédent.
+        if cadre[1] == len(coups):
+            pile.pop()
+            chemin.discard(h)
+            enregistrerTable(table, h)
+            if len(coupsJoues) > 0:
+                i, j = coupsJoues.pop()
+                carte = jeu[j]
+                carteVide = jeu[i]
+                jeu[i] = carte
+                jeu[j] = carteVide
+                positions[carte] = i
+                positions[carteVide] = j
+                h ^= clesZobrist[carte][i] ^ clesZobrist[carte][j] ^ \
+                clesZobrist[carteVide][i] ^ clesZobrist[carteVide][j]
+            continue
+
+        if limiteNoeuds != None and noeuds >= limiteNoeuds:
+            gagnable = None
+            break
+        if arret != None and noeuds & 1023 == 0 and arret.is_set():
+            gagnable = None
+            break
+
+        # On joue le prochain coup et on met à jour le hachage.
+        i = coups[cadre[1]]
+        cadre[1] += 1
+        j = destinationCoup(jeu, positions, i)
+        carte = jeu[i]
+        carteVide = jeu[j]
+        jeu[j] = carte
+        jeu[i] = carteVide
+        positions[carte] = j
+        positions[carteVide] = i
+        cle = clesZobrist[carte][i] ^ clesZobrist[carte][j] ^ \
+        clesZobrist[carteVide][i] ^ clesZobrist[carteVide][j]
+        h ^= cle
+        noeuds += 1
+
+        # Si le jeu est déjà sur le chemin ou a déjà été exploré sans
+        # succès, on annule le coup. Sinon, on met à jour les cartes vertes
+        # à partir des deux cases qui ont changé, comme le fait jouerCoup.
+        dejaVu = h in chemin or chercherTable(table, h)
+
+        if not dejaVu:
+            vertsTrous = list(cadre[2])
+            trousColonne1 = cadre[3] + majTrous(jeu, positions, vertsTrous, \
+            i, j)
+            suivants = listerVerts(positions, vertsTrous, trousColonne1)
+            if len(suivants) > 0:
+                pile.append([suivants, 0, vertsTrous, trousColonne1])
+                coupsJoues.append((i, j))
+                chemin.add(h)
+                continue
+
+            # Plus aucun coup possible: le jeu est gagnant ou il faudrait
+            # brasser les cartes.
+            if estGagnant(jeu):
+                gagnable = True
+                coupsGagnants = [coup[0] for coup in coupsJoues] + [i]
+                break
+            enregistrerTable(table, h)
+
+        jeu[i] = carte
+        jeu[j] = carteVide
+        positions[carte] = i
+        positions[carteVide] = j
+        h ^= cle
+
+    # Les jeux du chemin ont été explorés en partie: tous leurs coups
+    # essayés l'ont été complètement (ou mènent au jeu suivant du chemin), il
+    # ne reste que ceux qui suivent.
+    coupsChemin = []
+    restants = []
+    if gagnable == None:
+        coupsChemin = [coup[0] for coup in coupsJoues]
+        restants = [(cadre[1], cadre[0][cadre[1]:]) for cadre in pile]
+
+    duree = time.perf_counter() - debut
+    consultations = table["consultations"] - consultationsDebut
+    succes = table["succes"] - succesDebut
+
+    return {"gagnable": gagnable, "coups": coupsGagnants,
+            "compteurBrasser": partie["compteurBrasser"], "noeuds": noeuds,
+            "duree": duree,
+            "noeudsParSeconde": noeuds / duree if duree > 0 else 0.0,
+            "consultations": consultations, "succes": succes,
+            "tauxSucces": succes / consultations if consultations > 0 \
+            else 0.0, "coupsChemin": coupsChemin, "restants": restants}
+
+
+###############################################################################
+
+# La procédure principale résout des donnes tirées de graines fixes, avec
+# un jeu de couleurs x valeurs cartes, et affiche le résultat et les
+# statistiques de chaque recherche.
+def principal(nombreDonnes=10, limiteNoeuds=200000, couleurs=4, valeurs=13):
+    choisirFormat(couleurs, valeurs)
+    table = creerTable()
+    for graine in range(nombreDonnes):
+        resultat = resoudre(nouvellePartie(graine), limiteNoeuds, table)
+        print("donne %3d: gagnable=%-5s coups=%4s noeuds=%8d "
+              "%9.0f noeuds/s table=%5.1f%%" % (graine,
+              resultat["gagnable"],
+              len(resultat["coups"]) if resultat["coups"] != None else "-",
+              resultat["noeuds"], resultat["noeudsParSeconde"],
+              100 * resultat["tauxSucces"]))
+
+
+if __name__ == "__main__":
+    principal(*[int(x) for x in sys.argv[1:]])
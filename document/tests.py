@@ -0,0 +1,259 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme contient les tests unitaires de main.py. Il ne fait pas partie
+# de la page Web (main.html ne le charge pas), ce qui évite à codeBoot de le
+# lire et de le compiler à chaque chargement. On l'exécute avec un
+# interpréteur Python standard, qui exécute ensuite les tests des outils
+# (voir tests_outils.py), ou dans la page tests.html (l'adresse
+# main.html?tests y mène). Cette page charge main.py puis tests.py comme
+# main.html charge main.py: main.py affiche d'abord la première grille, puis
+# tests.py exécute les tests avec les fonctions que main.py a définies.
+#
+# Utilisation: python tests.py
+
+
+###############################################################################
+
+# Importation des fonctions testées, avec un interpréteur Python standard.
+# Dans la page Web, elles sont déjà définies par main.py. Le module main est
+# aussi importé en entier pour lire mesuresActives, qui change pendant les
+# tests (voir mesuresEnCours).
+try:
+    dansNavigateur
+except NameError:
+    import main
+    from main import activerMesures, brasserPartie, calculerPrefixes, \
+    cartesABrasserPartie, chercherIndice, choisirFormat, convertirCarteHTML, \
+    convertirHTML, coupsLegaux, creerPartie, dansNavigateur, \
+    desactiverMesures, divId, elemVert, estCoupLegal, etatPartie, \
+    fluxAleatoire, formatJeu, indexerPositions, jeuAleatoire, jouerCoup, \
+    longueurPrefixe, mesures, mesuresEnJSON, noeudsParMilliseconde, \
+    nomImageCarte, nouvellePartie, rapportMesures, shuffleRangee, tabEnTexte, \
+    table, td, tirerIndice, tr, trouverIndex
+
+
+###############################################################################
+
+# La fonction mesuresEnCours renvoie True si les mesures de main.py sont
+# actives. Avec un interpréteur Python standard, il faut lire la variable du
+# module main, puisque le nom importé ne suit pas ses changements.
+def mesuresEnCours():
+    try:
+        return main.mesuresActives
+    except NameError:
+        return mesuresActives
+
+
+# Procédure de tests unitaires pour les différentes fonctions utilisées dans le
+# programme.
+def tests():
+    assert len(jeuAleatoire(None, 51, None)) == 52
+    assert len(jeuAleatoire([1,2,3],2,[1,2,3,4])) == 4
+    assert jeuAleatoire([1,2,3],2,[1,2,3,4])[0] == 1
+    assert sorted(jeuAleatoire(None, 51, None)) == list(range(52))
+    assert jeuAleatoire(None, 51, None, fluxAleatoire(7)) == \
+    jeuAleatoire(None, 51, None, fluxAleatoire(7))
+    assert jeuAleatoire(None, 51, None, fluxAleatoire(7)) != \
+    jeuAleatoire(None, 51, None, fluxAleatoire(8))
+    jeuMelange = jeuAleatoire(None, 51, None, fluxAleatoire(7))
+    positions = indexerPositions(jeuMelange)
+    jeuAleatoire([0, 20, 51], 2, jeuMelange, fluxAleatoire(1), positions)
+    assert positions == indexerPositions(jeuMelange)
+    assert 0 <= tirerIndice(fluxAleatoire(3), 5) < 5
+    assert trouverIndex([0, 1, 2, 3], 2) == 2
+    assert trouverIndex([], 2) == -1
+    assert trouverIndex([2, 3, 4], 5) == -1
+    assert trouverIndex([7, "pomme", True], "pomme") == 1
+    assert indexerPositions([2, 0, 3, 1]) == [1, 3, 0, 2]
+    assert indexerPositions([]) == []
+    assert tr('allo') == "<tr>allo</tr>"
+    assert tr('') == "<tr></tr>"
+    assert td(2, 'allo') == '<td id="case2">allo</td>'
+    assert td(0,'') == '<td id="case0"></td>'
+    assert td(3, 'allo', True) == '<td id="case3" class="vert">allo</td>'
+    assert divId('oui','non') == '<div id="oui">non</div>'
+    assert divId('','') == '<div id=""></div>'
+    assert tabEnTexte(['je','suis','gentil']) == 'jesuisgentil'
+    assert tabEnTexte(['je','','gentil']) == 'jegentil'
+    assert table(['je','suis','gentil']) == '<table>jesuisgentil</table>'
+    assert table(['je','','gentil']) == '<table>jegentil</table>'
+    assert convertirCarteHTML(21) == '<img src="cards/sprite.svg#carte-6D">'
+    assert convertirCarteHTML(38) == '<img src="cards/sprite.svg#carte-10S">'
+    assert convertirCarteHTML(0) == \
+    '<img src="cards/sprite.svg#carte-absent">'
+    assert convertirHTML([21,38,0]) == \
+    ['<img src="cards/sprite.svg#carte-6D">',\
+    '<img src="cards/sprite.svg#carte-10S">',\
+    '<img src="cards/sprite.svg#carte-absent">']
+    assert nomImageCarte(21) == '6D'
+    assert nomImageCarte(2) == 'absent'
+    assert convertirHTML([]) == []
+    assert elemVert([51, 35, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
+    21, 39, 44, 33, 2, 7, 38, 32, 46, 18, 16, 45, 31, 50, 26, 48, 10, 15, 1,\
+    13, 43, 22, 6, 14, 49, 5, 30, 4, 36, 11, 0, 12, 42, 17, 29, 25, 3]) == \
+    [32, 8, 7, 49]
+    assert elemVert([0, 35, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
+    21, 39, 44, 33, 2, 7, 38, 32, 46, 18, 16, 45, 31, 50, 26, 48, 10, 15, 1,\
+    13, 43, 22, 6, 14, 49, 5, 30, 4, 36, 11, 51, 12, 42, 17, 29, 25, 3]) == \
+    [8, 7, 49, 42, 40, 37, 20]
+    assert elemVert([51, 0, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
+    21, 39, 44, 33, 5, 7, 38, 32, 46, 18, 16, 45, 31, 50, 1, 48, 3, 15, 26,\
+    13, 43, 22, 6, 14, 49, 2, 30, 4, 36, 11, 35, 12, 42, 17, 29, 25, 10]) == []
+    assert elemVert([0, 1, 2, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 3, 9,\
+    21, 39, 44, 33, 40, 7, 38, 32, 46, 18, 16, 45, 31, 50, 26, 48, 10, 15, 35,\
+    13, 43, 22, 6, 14, 49, 5, 30, 4, 36, 11, 51, 12, 42, 17, 29, 25, 27]) == \
+    [42,40,37,20]
+
+    # Tests du moteur de jeu avec un jeu gagnant, soit les cartes de 2 à K de
+    # chaque couleur suivies de l'as, et le même jeu où le roi de coeur et
+    # l'as de coeur sont échangés.
+    jeuGagnant = []
+    for couleur in range(4):
+        jeuGagnant += list(range(4 + couleur, 52, 4)) + [couleur]
+    assert etatPartie(creerPartie(jeuGagnant)) == "gagne"
+    assert calculerPrefixes(jeuGagnant) == [12, 12, 12, 12]
+    assert longueurPrefixe([4, 8, 12, 0], 0) == 3
+    assert longueurPrefixe([4, 8, 12, 0], 0, 2) == 3
+    assert longueurPrefixe([9, 8, 12, 0], 0) == 0
+    jeuPresque = jeuGagnant[:11] + [0, 48] + jeuGagnant[13:]
+    partie = creerPartie(jeuPresque)
+    assert coupsLegaux(partie) == [12]
+    assert estCoupLegal(partie, 12) and not estCoupLegal(partie, 11)
+    assert jouerCoup(partie, 12) == 11
+    assert partie["jeu"] == jeuGagnant
+    assert partie["positions"] == indexerPositions(jeuGagnant)
+    assert etatPartie(partie) == "gagne"
+    jeuBloque = [51, 0, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
+    21, 39, 44, 33, 5, 7, 38, 32, 46, 18, 16, 45, 31, 50, 1, 48, 3, 15, 26,\
+    13, 43, 22, 6, 14, 49, 2, 30, 4, 36, 11, 35, 12, 42, 17, 29, 25, 10]
+    assert etatPartie(creerPartie(list(jeuBloque))) == "brasser"
+    assert etatPartie(creerPartie(list(jeuBloque), 0)) == "perdu"
+    partie = creerPartie(list(jeuBloque))
+    assert len(brasserPartie(partie)) == 52
+    assert sorted(partie["jeu"]) == list(range(52))
+    assert partie["compteurBrasser"] == 2
+    copie = creerPartie(list(jeuBloque))
+    brasserPartie(copie, [partie["jeu"][i] for i in \
+    cartesABrasserPartie(creerPartie(list(jeuBloque)))])
+    assert copie["jeu"] == partie["jeu"] and copie["enVert"] == \
+    partie["enVert"] and copie["positions"] == partie["positions"]
+
+    # Tests des indices: le coup gagnant d'un jeu presque gagnant, et un jeu
+    # où il reste des coups mais aucune suite gagnante.
+    jeuPresque = jeuGagnant[:11] + [0, 48] + jeuGagnant[13:]
+    resultat = chercherIndice(creerPartie(jeuPresque), 50, None, 1000)
+    assert resultat["coup"] == 12 and resultat["gagnable"]
+    jeuPerdu = [4, 8, 12, 20, 46, 27, 34, 47, 38, 33, 35, 2, 21, 5, 9, 13,\
+    17, 44, 42, 41, 48, 49, 0, 37, 26, 43, 6, 10, 14, 18, 22, 29, 50, 1, 28,\
+    3, 30, 40, 19, 7, 11, 25, 15, 31, 16, 39, 23, 45, 51, 36, 24, 32]
+    resultat = chercherIndice(creerPartie(list(jeuPerdu), 0), 50, None, 1000)
+    assert resultat["perdue"] and resultat["gagnable"] == False
+    assert resultat["coup"] in creerPartie(list(jeuPerdu))["enVert"]
+    assert not chercherIndice(creerPartie(list(jeuPerdu), 1), 50, None, \
+    1000)["perdue"]
+    assert chercherIndice(creerPartie(list(jeuPerdu), 0), 50, None, \
+    20)["gagnable"] == None
+
+    # Sans horloge qui avance, la limite de noeuds arrête la recherche après
+    # noeudsParMilliseconde noeuds par milliseconde de budget.
+    def horlogeArretee():
+        return 0
+
+    assert chercherIndice(nouvellePartie(0), 10, horlogeArretee)["noeuds"] \
+    == 10 * noeudsParMilliseconde + 1
+
+    # Tests des mesures, avec une horloge qui avance d'une milliseconde à
+    # chaque lecture. On garde les mesures déjà prises (par exemple avec
+    # tests.html?mesures) pour les remettre à la fin.
+    heure = [0]
+
+    def horlogeTest():
+        heure[0] += 1
+        return heure[0]
+
+    etaitActif = mesuresEnCours()
+    horlogeAvant = mesures["horloge"]
+    fonctionsAvant = mesures["fonctions"]
+    mesures["fonctions"] = {}
+    activerMesures(horlogeTest)
+    partie = creerPartie(jeuGagnant[:11] + [0, 48] + jeuGagnant[13:])
+    jouerCoup(partie, 12)
+    rapport = rapportMesures()["fonctions"]
+    assert rapport["jouerCoup"] == {"appels": 1, "ms": 3, "msMax": 3}
+    assert rapport["testerProgression"]["appels"] == 2
+    assert rapport["calculerVerts"]["appels"] == 1
+    assert mesuresEnJSON().startswith('{"fonctions": {"calculerVerts": ' + \
+    '{"appels": 1, "ms": 1, "msMax": 1}, "testerProgression": ')
+    desactiverMesures()
+    jouerCoup(creerPartie(jeuGagnant[:11] + [0, 48] + jeuGagnant[13:]), 12)
+    assert rapportMesures()["fonctions"]["jouerCoup"]["appels"] == 1
+    mesures["fonctions"] = fonctionsAvant
+    mesures["horloge"] = horlogeAvant
+    if etaitActif:
+        activerMesures(horlogeAvant)
+
+    # Tests d'un jeu de 8 couleurs de 26 valeurs: le jeu gagnant, puis le
+    # même jeu où le roi et l'as de la première couleur sont échangés.
+    choisirFormat(8, 26)
+    assert formatJeu() == (8, 26)
+    assert sorted(jeuAleatoire(None, 207, None, fluxAleatoire(7))) == \
+    list(range(208))
+    jeuGrand = []
+    for couleur in range(8):
+        jeuGrand += list(range(8 + couleur, 208, 8)) + [couleur]
+    assert etatPartie(creerPartie(list(jeuGrand))) == "gagne"
+    partie = creerPartie(jeuGrand[:24] + [0, 200] + jeuGrand[26:])
+    assert calculerPrefixes(partie["jeu"]) == [24, 25, 25, 25, 25, 25, 25, 25]
+    assert coupsLegaux(partie) == [25]
+    assert jouerCoup(partie, 25) == 24
+    assert etatPartie(partie) == "gagne"
+
+    # Les donnes de donnes.py (un générateur, que codeBoot ne connaît pas)
+    # suivent aussi le format.
+    if not dansNavigateur():
+        from donnes import genererDonnes
+        donnes = list(genererDonnes(3, 2))
+        assert donnes[0] == nouvellePartie(3)["jeu"]
+        assert sorted(donnes[1]) == list(range(208))
+        assert donnes[1][52:] != list(range(52, 208))
+    choisirFormat()
+
+    # Test aléatoire: après chaque coup et chaque brassage, les cartes vertes
+    # mises à jour par jouerCoup doivent être celles que donne elemVert. On
+    # joue avec le jeu standard, un petit jeu (3 couleurs de 5 valeurs) et un
+    # grand jeu (8 couleurs de 26 valeurs).
+    for couleurs, valeurs, nombreParties in [(4, 13, 5), (3, 5, 5), \
+    (8, 26, 2)]:
+        choisirFormat(couleurs, valeurs)
+        for graine in range(nombreParties):
+            partie = nouvellePartie(graine)
+            flux = fluxAleatoire(graine)
+            while etatPartie(partie) != "gagne" and etatPartie(partie) != \
+            "perdu":
+                if etatPartie(partie) == "enCours":
+                    enVert = partie["enVert"]
+                    jouerCoup(partie, enVert[tirerIndice(flux, len(enVert))])
+                else:
+                    brasserPartie(partie)
+                assert partie["enVert"] == elemVert(partie["jeu"])
+                assert partie["positions"] == indexerPositions(partie["jeu"])
+                assert partie["prefixes"] == calculerPrefixes(partie["jeu"])
+                cartesABrasser = []
+                for i in range(1, couleurs + 1):
+                    shuffleRangee(partie["jeu"], i, cartesABrasser)
+                assert cartesABrasserPartie(partie) == cartesABrasser
+    choisirFormat()
+
+
+###############################################################################
+
+if dansNavigateur():
+    tests()
+    print("Tests réussis")
+elif __name__ == "__main__":
+    from tests_outils import testsOutils
+
+    tests()
+    testsOutils()
+    print("Tests réussis")
@@ -0,0 +1,433 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme contient les tests des outils qui s'exécutent avec un
+# interpréteur Python standard (solveur, solveur parallèle, cache d'analyses,
+# registre et vérificateur, plateaux, serveur et simulateur). Chaque outil
+# est testé contre le moteur de main.py. Ces tests ne s'exécutent jamais dans codeBoot:
+# "python tests.py" les exécute après les tests unitaires de main.py.
+#
+# Utilisation: python tests_outils.py
+
+
+###############################################################################
+
+# Importation des fonctions du moteur de jeu.
+from main import brasserPartie, cartesABrasserPartie, choisirFormat, \
+creerPartie, estCoupLegal, etatPartie, fluxAleatoire, jeuAleatoire, \
+jouerCoup, nouvellePartie, tirerIndice
+
+
+###############################################################################
+
+# La fonction jeuxDeTest renvoie le jeu gagnant, le jeu presque gagnant (un
+# coup à jouer), le jeu bloqué (aucun coup possible) et le jeu perdu (des
+# coups possibles, mais aucune suite gagnante) utilisés par tests.
+def jeuxDeTest():
+    jeuGagnant = []
+    for couleur in range(4):
+        jeuGagnant += list(range(4 + couleur, 52, 4)) + [couleur]
+    jeuPresque = jeuGagnant[:11] + [0, 48] + jeuGagnant[13:]
+    jeuBloque = [51, 0, 40, 23, 41, 20, 28, 37, 19, 8, 47, 24, 34, 27, 9,\
+    21, 39, 44, 33, 5, 7, 38, 32, 46, 18, 16, 45, 31, 50, 1, 48, 3, 15, 26,\
+    13, 43, 22, 6, 14, 49, 2, 30, 4, 36, 11, 35, 12, 42, 17, 29, 25, 10]
+    jeuPerdu = [4, 8, 12, 20, 46, 27, 34, 47, 38, 33, 35, 2, 21, 5, 9, 13,\
+    17, 44, 42, 41, 48, 49, 0, 37, 26, 43, 6, 10, 14, 18, 22, 29, 50, 1, 28,\
+    3, 30, 40, 19, 7, 11, 25, 15, 31, 16, 39, 23, 45, 51, 36, 24, 32]
+    return jeuGagnant, jeuPresque, jeuBloque, jeuPerdu
+
+
+# Procédure de tests du solveur (solveur.py): la suite de coups trouvée pour
+# un jeu gagnable doit gagner la partie quand on la rejoue avec main.py.
+def testsSolveur():
+    from solveur import resoudre
+
+    jeuGagnant, jeuPresque, jeuBloque, jeuPerdu = jeuxDeTest()
+    resultat = resoudre(creerPartie(jeuGagnant))
+    assert resultat["gagnable"] and resultat["coups"] == []
+    partie = creerPartie(jeuPresque)
+    resultat = resoudre(partie)
+    assert resultat["gagnable"] and resultat["coups"] == [12]
+    assert partie["jeu"] == jeuPresque
+    for coup in resultat["coups"]:
+        assert estCoupLegal(partie, coup)
+        jouerCoup(partie, coup)
+    assert etatPartie(partie) == "gagne"
+    resultat = resoudre(creerPartie(list(jeuBloque)))
+    assert resultat["gagnable"] == False and resultat["coups"] == None
+    assert resoudre(creerPartie(list(jeuPerdu)))["gagnable"] == False
+    assert resoudre(creerPartie(list(jeuPerdu)), 5)["gagnable"] == None
+
+    # Des donnes aléatoires de 3 couleurs et 5 valeurs, que le solveur
+    # résout entièrement: chaque suite trouvée doit gagner la partie.
+    choisirFormat(3, 5)
+    gagnables = 0
+    for graine in range(10):
+        partie = nouvellePartie(graine)
+        resultat = resoudre(partie)
+        assert resultat["gagnable"] != None
+        if resultat["gagnable"]:
+            gagnables += 1
+            for coup in resultat["coups"]:
+                assert estCoupLegal(partie, coup)
+                jouerCoup(partie, coup)
+            assert etatPartie(partie) == "gagne"
+    assert 0 < gagnables < 10
+    choisirFormat()
+
+
+# Procédure de tests du solveur parallèle (parallele.py): sur des donnes de 3
+# couleurs et 5 valeurs, avec des tâches de quelques noeuds pour qu'elles
+# soient redécoupées, resoudreParallele doit conclure comme resoudre, et
+# chaque suite trouvée doit gagner la partie.
+def testsParallele():
+    from parallele import resoudreParallele
+    from solveur import resoudre
+
+    choisirFormat(3, 5)
+    verdicts = []
+    taches = 0
+    for graine in range(12):
+        partie = nouvellePartie(graine)
+        attendu = resoudre(partie)["gagnable"]
+        verdicts.append(attendu)
+        for tranche in [1, 5]:
+            resultat = resoudreParallele(partie, 2, tranche=tranche)
+            assert resultat["gagnable"] == attendu
+            taches += resultat["taches"]
+            if attendu:
+                essai = nouvellePartie(graine)
+                for coup in resultat["coups"]:
+                    assert estCoupLegal(essai, coup)
+                    jouerCoup(essai, coup)
+                assert etatPartie(essai) == "gagne"
+    assert True in verdicts and False in verdicts
+    assert taches > 24 * 2 * 4
+    choisirFormat()
+
+
+# Procédure de tests du cache d'analyses (analyses.py), dans un fichier
+# temporaire.
+def testsAnalyses():
+    import os
+    import tempfile
+    from analyses import chercherAnalyse, cleAnalyse, enregistrerAnalyse, \
+    fermerCache, ouvrirCache, resoudreAvecCache
+    from solveur import resoudre
+
+    jeuGagnant, jeuPresque, jeuBloque, jeuPerdu = jeuxDeTest()
+
+    # Deux jeux qui ne diffèrent que par les couleurs (ou par la place des
+    # as) ont la même clé, mais pas avec un autre nombre de brassages.
+    permutation = [2, 0, 3, 1]
+    jeuRenomme = [carte - carte % 4 + permutation[carte % 4] \
+                  for carte in jeuPresque]
+    assert jeuRenomme != jeuPresque
+    assert cleAnalyse(jeuRenomme, 2) == cleAnalyse(jeuPresque, 2)
+    assert cleAnalyse(jeuPresque, 1) != cleAnalyse(jeuPresque, 2)
+    assert cleAnalyse(jeuPerdu, 2) != cleAnalyse(jeuPresque, 2)
+
+    # Les clés suivent le format du jeu: un jeu de 8 couleurs de 26 valeurs
+    # renommé a la même clé, et le même tableau de 15 cartes n'a pas la même
+    # clé en 3 couleurs de 5 valeurs et en 5 couleurs de 3 valeurs.
+    choisirFormat(8, 26)
+    jeuGrand = jeuAleatoire(None, 207, None, fluxAleatoire(5))
+    permutation = [3, 7, 0, 5, 1, 6, 2, 4]
+    assert cleAnalyse([carte - carte % 8 + permutation[carte % 8] \
+                       for carte in jeuGrand], 1) == cleAnalyse(jeuGrand, 1)
+    choisirFormat(3, 5)
+    jeuPetit = jeuAleatoire(None, 14, None, fluxAleatoire(5))
+    clePetit = cleAnalyse(jeuPetit, 1)
+    choisirFormat(5, 3)
+    assert cleAnalyse(jeuPetit, 1) != clePetit
+    choisirFormat(16, 26)
+    assert len(cleAnalyse(jeuAleatoire(None, 415, None, fluxAleatoire(5)),
+                          0)) == 16
+    choisirFormat()
+
+    repertoire = tempfile.mkdtemp()
+    chemin = os.path.join(repertoire, "analyses.asa")
+    try:
+        cache = ouvrirCache(chemin)
+        resultat = resoudre(creerPartie(jeuPresque))
+        enregistrerAnalyse(cache, jeuPresque, 2, resultat)
+        enregistrerAnalyse(cache, jeuPerdu, 2, resoudre(creerPartie(jeuPerdu)))
+        enregistrerAnalyse(cache, jeuPerdu, 1,
+                           resoudre(creerPartie(list(jeuPerdu), 1), 5))
+        fermerCache(cache)
+
+        # Le fichier relu contient les mêmes analyses.
+        cache = ouvrirCache(chemin)
+        assert len(cache["index"]) == 3 and len(cache["memoire"]) == 0
+        analyse = chercherAnalyse(cache, jeuRenomme, 2)
+        assert analyse == {"gagnable": True, "coups": resultat["coups"],
+                           "noeuds": resultat["noeuds"]}
+        assert cache["succesDisque"] == 1
+        assert chercherAnalyse(cache, jeuPresque, 2) == analyse
+        assert cache["succesMemoire"] == 1
+        assert chercherAnalyse(cache, jeuPerdu, 2)["gagnable"] == False
+        assert chercherAnalyse(cache, jeuPresque, 1) == None
+        assert chercherAnalyse(cache, jeuPerdu, 1) == None
+        assert chercherAnalyse(cache, jeuPerdu, 1, 10) == None
+        assert chercherAnalyse(cache, jeuPerdu, 1, 5)["gagnable"] == None
+
+        # Une analyse ajoutée par un autre cache (un autre processus) est
+        # trouvée dans le même fichier.
+        autre = ouvrirCache(chemin)
+        partie = creerPartie(jeuGagnant, 1)
+        assert not resoudreAvecCache(autre, partie)["enCache"]
+        assert resoudreAvecCache(cache, partie)["enCache"]
+        fermerCache(autre)
+        fermerCache(cache)
+    finally:
+        os.remove(chemin)
+        os.rmdir(repertoire)
+
+
+# Procédure de tests du registre (registres.py) et du vérificateur
+# (verificateur.py): une partie valide est acceptée et chaque falsification
+# (ou erreur de format) est rejetée avec sa raison, sans arrêter la
+# vérification des autres parties.
+def testsRegistres():
+    import os
+    import tempfile
+    from registres import decouperRegistre, encoderEnregistrement, entete, \
+    lireRegistre, noterBrassage, noterCoup, nouvelEnregistrement, rejouer
+    from verificateur import verifierRegistre
+
+    # Une partie de la graine 7: un coup, un brassage, puis un autre coup.
+    partie = nouvellePartie(7)
+    enregistrement = nouvelEnregistrement(partie, 7)
+    for k in range(2):
+        i = partie["enVert"][0]
+        jouerCoup(partie, i)
+        noterCoup(enregistrement, i)
+        cases = brasserPartie(partie)
+        noterBrassage(enregistrement, partie, cases)
+    i = partie["enVert"][0]
+    jouerCoup(partie, i)
+    noterCoup(enregistrement, i)
+    valide = encoderEnregistrement(enregistrement, False)
+
+    # La fonction falsifier renvoie l'enregistrement encodé après avoir
+    # remplacé l'octet n de la donne ou des événements.
+    def falsifier(cle, n, octet, gagne=False, graine=7):
+        copie = dict(enregistrement)
+        octets = bytearray(enregistrement[cle])
+        octets[n] = octet
+        copie[cle] = bytes(octets)
+        copie["graine"] = graine
+        return encoderEnregistrement(copie, gagne)
+
+    coup = enregistrement["evenements"][0]
+    nonVerte = [j for j in range(52) if j not in \
+                nouvellePartie(7)["enVert"]][0]
+    donne = enregistrement["donne"]
+    k = enregistrement["evenements"][2]
+    cartes = enregistrement["evenements"][3:3 + k]
+    cas = [(falsifier("evenements", 0, nonVerte), 0,
+            "coup illégal (case " + str(nonVerte) + ")"),
+           (falsifier("donne", 0, donne[1]), -1,
+            "donne différente de celle de la graine"),
+           (falsifier("evenements", 3, cartes[1]), 1,
+            "brassage différent de celui de la graine"),
+           (falsifier("evenements", 0, coup, True), 5,
+            "résultat annoncé incorrect"),
+           (falsifier("evenements", 0, coup, False, None), -1,
+            "graine absente")]
+
+    repertoire = tempfile.mkdtemp()
+    chemin = os.path.join(repertoire, "parties.asr")
+
+    # La fonction verifier écrit un registre et renvoie le dernier bilan de
+    # verifierRegistre (nombre de parties, victoires et rejets).
+    def verifier(octets):
+        with open(chemin, "wb") as fichier:
+            fichier.write(entete + octets)
+        rejets = []
+        bilan = (0, 0)
+        for nombre, victoires, nouveaux in verifierRegistre(chemin, 1, \
+        False, 2):
+            bilan = (nombre, victoires)
+            rejets += nouveaux
+        return bilan[0], bilan[1], rejets
+
+    try:
+        assert verifier(valide) == (1, 0, [])
+        assert bytes(rejouer(next(lireRegistre(chemin)))["jeu"]) == \
+        bytes(partie["jeu"])
+        for falsifie, etape, raison in cas:
+            assert verifier(valide + falsifie + valide) == \
+            (3, 0, [(1, etape, raison)])
+
+        # Des octets en trop après la dernière partie ou une dernière partie
+        # tronquée d'un octet sont rejetés comme enregistrements tronqués.
+        tronque = (-1, "enregistrement tronqué")
+        assert verifier(valide + b"\x00") == (2, 0, [(1,) + tronque])
+        assert verifier(valide + b"\xff") == (2, 0, [(1,) + tronque])
+        assert verifier(valide + valide[:-1]) == (2, 0, [(1,) + tronque])
+        assert verifier(valide * 3 + valide[:20]) == (4, 0, [(3,) + tronque])
+        assert decouperRegistre(chemin, 2) == [(4, 4 + 2 * len(valide)),
+                                               (4 + 2 * len(valide),
+                                                4 + 3 * len(valide) + 20)]
+    finally:
+        os.remove(chemin)
+        os.rmdir(repertoire)
+
+
+# Procédure de tests des plateaux (plateau.py): des parties jouées au hasard
+# avec main.py sont rejouées coup par coup sur un plateau et ses masques, qui
+# doivent avoir à chaque étape le même jeu, les mêmes cartes vertes, les
+# mêmes cartes ordonnées et le même résultat que la partie. Les masques mis à
+# jour par jouerPlateau doivent être ceux du plateau.
+def testsPlateau():
+    from plateau import casesMasque, coupsPlateau, creerPlateau, \
+    gagnantPlateau, jeuPlateau, jouerPlateau, masqueOrdonnees, \
+    masquesPlateau, partiePlateau, positionsPlateau, prefixesPlateau
+
+    jeuGagnant, jeuPresque, jeuBloque, jeuPerdu = jeuxDeTest()
+    plateau = creerPlateau(jeuPresque)
+    masques = masquesPlateau(plateau)
+    assert not gagnantPlateau(plateau, masques)
+    assert jouerPlateau(plateau, masques, 12) == 11
+    assert jeuPlateau(plateau) == jeuGagnant
+    assert gagnantPlateau(plateau, masques)
+    assert masques == masquesPlateau(plateau)
+    assert masqueOrdonnees(plateau, masques) == \
+    sum((1 << 12) - 1 << 13 * rangee for rangee in range(4))
+
+    for graine in range(20):
+        partie = nouvellePartie(graine)
+        flux = fluxAleatoire(~graine)
+        plateau = creerPlateau(partie["jeu"])
+        masques = masquesPlateau(plateau)
+        while True:
+            assert jeuPlateau(plateau) == partie["jeu"]
+            assert positionsPlateau(plateau) == partie["positions"]
+            assert masques == masquesPlateau(plateau)
+            assert casesMasque(coupsPlateau(plateau, masques)) == \
+            sorted(partie["enVert"])
+            assert prefixesPlateau(plateau, masques) == partie["prefixes"]
+            assert casesMasque(masqueOrdonnees(plateau, masques)) == \
+            sorted(set(range(52)) - set(cartesABrasserPartie(partie)))
+            assert gagnantPlateau(plateau, masques) == \
+            (etatPartie(partie) == "gagne")
+            copie = partiePlateau(plateau, partie["compteurBrasser"])
+            assert copie["jeu"] == partie["jeu"] and \
+            copie["positions"] == partie["positions"] and \
+            sorted(copie["enVert"]) == sorted(partie["enVert"]) and \
+            copie["compteurBrasser"] == partie["compteurBrasser"]
+
+            # Un coup au hasard, joué dans la partie et sur le plateau, ou un
+            # brassage (que les plateaux ne font pas: on recrée le plateau).
+            etat = etatPartie(partie)
+            if etat == "enCours":
+                i = partie["enVert"][tirerIndice(flux, \
+                len(partie["enVert"]))]
+                assert jouerPlateau(plateau, masques, i) == \
+                jouerCoup(partie, i)
+            elif etat == "brasser":
+                brasserPartie(partie)
+                plateau = creerPlateau(partie["jeu"])
+                masques = masquesPlateau(plateau)
+            else:
+                break
+
+
+# Procédure de tests du serveur de parties (serveur.py), en appelant
+# directement traiterRequete, sans connexion.
+def testsServeur():
+    from serveur import creerServeur, traiterRequete
+
+    serveur = creerServeur()
+    statut, reponse = traiterRequete(serveur, "POST", "/partie?graine=5")
+    assert statut == 200 and reponse["jeu"] == nouvellePartie(5)["jeu"]
+    assert reponse["compteurBrasser"] == 3 and reponse["etat"] == "enCours"
+    session = reponse["session"]
+    partie = nouvellePartie(5)
+
+    # Un coup légal, puis un coup illégal et des cases invalides.
+    i = partie["enVert"][0]
+    j = jouerCoup(partie, i)
+    statut, reponse = traiterRequete(serveur, "POST", "/partie/" + session +
+                                     "/move/" + str(i))
+    assert statut == 200 and reponse["cases"] == {i: partie["jeu"][i],
+                                                  j: partie["jeu"][j]}
+    assert reponse["enVert"] == partie["enVert"]
+    nonVerte = [k for k in range(52) if k not in partie["enVert"]][0]
+    assert traiterRequete(serveur, "POST", "/partie/" + session + "/move/" +
+                          str(nonVerte))[0] == 409
+    for case in ["52", "²", "-1", "x", ""]:
+        assert traiterRequete(serveur, "POST", "/partie/" + session +
+                              "/move/" + case) == \
+        (404, {"erreur": "action inconnue"})
+
+    # Trois brassages, puis un brassage interdit.
+    for compteur in [2, 1, 0]:
+        statut, reponse = traiterRequete(serveur, "POST", "/partie/" +
+                                         session + "/shuffle")
+        brasserPartie(partie)
+        assert statut == 200 and reponse["compteurBrasser"] == compteur
+        assert reponse["enVert"] == partie["enVert"]
+    assert traiterRequete(serveur, "POST", "/partie/" + session +
+                          "/shuffle")[0] == 409
+
+    # Session inconnue, adresses et méthodes invalides.
+    assert traiterRequete(serveur, "POST", "/partie/0123/shuffle") == \
+    (404, {"erreur": "session inconnue"})
+    for methode, chemin in [("POST", "/"), ("GET", "/partie"),
+                            ("POST", "/partie/" + session),
+                            ("POST", "/partie/" + session + "/move"),
+                            ("POST", "/partie/" + session + "/shuffle/1"),
+                            ("POST", "/autre")]:
+        assert traiterRequete(serveur, methode, chemin)[0] == 404
+    assert traiterRequete(serveur, "POST", "/partie?graine=²")[0] == 200
+    statut, reponse = traiterRequete(serveur, "GET", "/metriques")
+    assert statut == 200 and reponse["sessions"] == 2
+
+
+# Procédure de tests du simulateur (simulateur.py): les statistiques, lot
+# par lot, et le registre des parties ne dépendent pas du nombre de
+# processus.
+def testsSimulateur():
+    import copy
+    import os
+    import tempfile
+    from simulateur import simuler
+
+    repertoire = tempfile.mkdtemp()
+    resultats = []
+    registres = []
+    try:
+        for processus in [1, 2]:
+            chemin = os.path.join(repertoire, str(processus) + ".asr")
+            resultats.append([copy.deepcopy(statistiques) for statistiques \
+                              in simuler(60, "glouton", 11, processus, 8,
+                                         chemin)])
+            with open(chemin, "rb") as fichier:
+                registres.append(fichier.read())
+            os.remove(chemin)
+    finally:
+        os.rmdir(repertoire)
+    assert len(resultats[0]) == 8 and resultats[0][-1]["parties"] == 60
+    assert resultats[0] == resultats[1]
+    assert registres[0] == registres[1]
+
+
+# Procédure de tests des outils qui ne s'exécutent qu'avec un interpréteur
+# Python standard (pas dans codeBoot).
+def testsOutils():
+    testsSolveur()
+    testsParallele()
+    testsAnalyses()
+    testsRegistres()
+    testsPlateau()
+    testsServeur()
+    testsSimulateur()
+
+
+###############################################################################
+
+if __name__ == "__main__":
+    testsOutils()
+    print("Tests réussis")
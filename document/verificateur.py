@@ -0,0 +1,179 @@
+# Auteurs: Samuel Pellerin
+# Date: 18 octobre 2026.
+#
+# Ce programme vérifie des parties soumises (par exemple pour un tableau des
+# meilleurs joueurs), enregistrées dans un fichier registre (voir
+# registres.py). Chaque partie est rejouée avec le moteur de main.py:
+#   - la donne doit être celle de la graine enregistrée (nouvellePartie);
+#   - chaque coup doit déplacer une carte verte (estCoupLegal), ce qui se
+#     vérifie en temps constant puisque la partie garde ses cartes vertes;
+#   - chaque brassage doit être permis (il reste des brassages et la partie
+#     n'est pas gagnée) et donner exactement les cartes que donne
+#     brasserPartie avec le flux aléatoire de la graine;
+#   - le résultat annoncé (gagnée ou non) doit être celui de la partie
+#     rejouée (testerProgression).
+# Une partie est rejetée dès la première étape illégale.
+#
+# Le fichier est découpé en tranches d'enregistrements, vérifiées par tous
+# les processeurs. Chaque processus projette lui-même le fichier en mémoire:
+# seules les bornes des tranches et les verdicts des parties rejetées passent
+# d'un processus à l'autre.
+#
+# Utilisation: python verificateur.py registre [--processus N] [--gagnees]
+
+
+###############################################################################
+
+# Importation des modules utilisés dans le programme.
+import argparse
+import multiprocessing
+import time
+
+from main import brasserPartie, cartesABrasserPartie, estCoupLegal, \
+jouerCoup, nouvellePartie
+from registres import codeBrassage, decouperRegistre, lireRegistre
+
+
+###############################################################################
+
+# La fonction verifierPartie rejoue un enregistrement et renvoie None si la
+# partie est valide, ou un tuple (etape, raison) qui indique le numéro de
+# l'événement illégal (-1 pour la donne et le nombre d'événements pour le
+# résultat) et la raison du rejet. Si gagnees est True, seules les parties
+# gagnées sont acceptées.
+def verifierPartie(enregistrement, gagnees=False):
+    if enregistrement["tronque"] or len(enregistrement["donne"]) != 52:
+        return -1, "enregistrement tronqué"
+    if enregistrement["graine"] == None:
+        return -1, "graine absente"
+    if gagnees and not enregistrement["gagne"]:
+        return -1, "partie annoncée perdue"
+
+    # La donne doit être celle que jeuAleatoire tire de la graine.
+    partie = nouvellePartie(enregistrement["graine"])
+    if enregistrement["donne"] != bytes(partie["jeu"]):
+        return -1, "donne différente de celle de la graine"
+
+    evenements = enregistrement["evenements"]
+    position = 0
+    etape = 0
+    while position < len(evenements):
+        code = evenements[position]
+
+        if code == codeBrassage:
+            if partie["compteurBrasser"] == 0 or partie["gagnerCondition"]:
+                return etape, "brassage interdit"
+            if position + 1 >= len(evenements):
+                return etape, "enregistrement tronqué"
+            k = evenements[position + 1]
+            cartes = evenements[position + 2:position + 2 + k]
+            if len(cartes) != k or k != len(cartesABrasserPartie(partie)):
+                return etape, "nombre de cartes brassées incorrect"
+
+            # On brasse avec le flux de la graine et on compare le résultat
+            # à celui qui a été enregistré.
+            cases = brasserPartie(partie)
+            for n in range(k):
+                if partie["jeu"][cases[n]] != cartes[n]:
+                    return etape, "brassage différent de celui de la graine"
+            position += 2 + k
+
+        else:
+            if code > 51 or not estCoupLegal(partie, code):
+                return etape, "coup illégal (case " + str(code) + ")"
+            jouerCoup(partie, code)
+            position += 1
+
+        etape += 1
+
+    if partie["gagnerCondition"] != enregistrement["gagne"]:
+        return etape, "résultat annoncé incorrect"
+    return None
+
+
+###############################################################################
+
+# La fonction verifierTranche vérifie les enregistrements d'une tranche d'un
+# fichier registre. Elle renvoie le nombre de parties vérifiées, le nombre de
+# parties gagnées valides et les rejets, soit des tuples (numéro de la partie
+# dans la tranche, étape, raison). Elle est appelée par les processus de la
+# vérification.
+def verifierTranche(tranche):
+    chemin, debut, fin, gagnees = tranche
+    nombre = 0
+    victoires = 0
+    rejets = []
+    for enregistrement in lireRegistre(chemin, debut, fin):
+        verdict = verifierPartie(enregistrement, gagnees)
+        if verdict == None:
+            victoires += enregistrement["gagne"]
+        else:
+            rejets.append((nombre, verdict[0], verdict[1]))
+        nombre += 1
+    return nombre, victoires, rejets
+
+
+# La fonction verifierRegistre vérifie toutes les parties d'un fichier
+# registre avec plusieurs processus (tous les processeurs par défaut). Elle
+# produit, après chaque tranche et dans l'ordre du fichier, le nombre de
+# parties vérifiées, le nombre de parties gagnées valides et les nouveaux
+# rejets, soit des tuples (numéro de la partie, étape, raison).
+def verifierRegistre(chemin, processus=None, gagnees=False, \
+tailleTranche=1000):
+    tranches = [(chemin, debut, fin, gagnees) for debut, fin in \
+    decouperRegistre(chemin, tailleTranche)]
+    nombre = 0
+    victoires = 0
+
+    pool = None
+    try:
+        if processus == 1:
+            resultats = map(verifierTranche, tranches)
+        else:
+            pool = multiprocessing.Pool(processus)
+            resultats = pool.imap(verifierTranche, tranches)
+        for nombreTranche, victoiresTranche, rejets in resultats:
+            rejets = [(nombre + k, etape, raison) for k, etape, raison in \
+            rejets]
+            nombre += nombreTranche
+            victoires += victoiresTranche
+            yield nombre, victoires, rejets
+    finally:
+        if pool != None:
+            pool.terminate()
+
+
+###############################################################################
+
+def principal():
+    analyseur = argparse.ArgumentParser(description="Vérification de "
+                                        "parties d'Addiction Solitaire "
+                                        "enregistrées.")
+    analyseur.add_argument("registre")
+    analyseur.add_argument("--processus", type=int, default=None)
+    analyseur.add_argument("--gagnees", action="store_true",
+                           help="n'accepter que les parties gagnées")
+    analyseur.add_argument("--tranche", type=int, default=1000)
+    arguments = analyseur.parse_args()
+
+    debut = time.perf_counter()
+    nombre = 0
+    victoires = 0
+    rejetees = 0
+    for nombre, victoires, rejets in verifierRegistre(arguments.registre,
+                                                      arguments.processus,
+                                                      arguments.gagnees,
+                                                      arguments.tranche):
+        for partie, etape, raison in rejets:
+            print("partie %d rejetée à l'étape %d: %s" % (partie, etape,
+                  raison))
+        rejetees += len(rejets)
+    duree = time.perf_counter() - debut
+
+    print("%d parties vérifiées, %d valides (%d gagnées), %d rejetées "
+          "(%.0f parties/s)" % (nombre, nombre - rejetees, victoires,
+          rejetees, nombre / duree if duree > 0 else 0.0))
+
+
+if __name__ == "__main__":
+    principal()